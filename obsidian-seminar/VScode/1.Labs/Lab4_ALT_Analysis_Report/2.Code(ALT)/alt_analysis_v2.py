@@ -15,6 +15,13 @@ import logging
 import os
 from IPython.display import display, Markdown
 
+from excel_cache import read_excel_cached
+from mle_fitters import fit_groups, summary_table
+from dist_registry import fit_everything_alt_exclude
+
+# 스트레스 수준별 최적 수명 분포 후보
+CANDIDATE_DISTRIBUTIONS = ['Weibull_2P', 'Lognormal_2P', 'Normal_2P', 'Exponential_1P']
+
 # --- 분석 환경 설정 ---
 
 # 1. 결과물을 저장할 폴더 생성
@@ -68,7 +75,7 @@ def load_and_preprocess_data(filepath, time_col, stress_col, censor_col, failure
         if filepath.lower().endswith('.csv'):
             df = pd.read_csv(filepath)
         elif filepath.lower().endswith('.xlsx'):
-            df = pd.read_excel(filepath)
+            df = read_excel_cached(filepath)
         else:
             logging.error("지원되지 않는 파일 형식입니다. CSV 또는 XLSX 파일을 사용해주세요.")
             return None
@@ -109,14 +116,16 @@ def load_and_preprocess_data(filepath, time_col, stress_col, censor_col, failure
     return failures, right_censored, failure_stresses, right_censored_stresses, df
 
 
-def find_best_life_distribution(failures, right_censored, failure_stresses):
+def find_best_life_distribution(failures, right_censored, failure_stresses, right_censored_stresses):
     """
     각 스트레스 수준별로 최적의 수명 분포를 찾습니다.
+    모든 스트레스 수준을 후보 분포마다 한 번의 벡터화 계산(mle_fitters.fit_groups)으로 적합합니다.
 
     Args:
         failures (np.array): 고장 데이터.
         right_censored (np.array): 관측 중단 데이터.
         failure_stresses (np.array): 고장 데이터의 스트레스 수준.
+        right_censored_stresses (np.array): 관측 중단 데이터의 스트레스 수준.
 
     Returns:
         tuple: 전체 스트레스 수준에서 가장 빈번하게 최적합으로 선정된 분포 이름과
@@ -128,35 +137,35 @@ def find_best_life_distribution(failures, right_censored, failure_stresses):
 
     logging.info("각 스트레스 수준별 최적 수명 분포 분석을 시작합니다.")
 
+    groups = {
+        stress: {
+            'failures': failures[failure_stresses == stress],
+            'right_censored': right_censored[right_censored_stresses == stress],
+        }
+        for stress in unique_stresses
+    }
+    fits_by_stress = fit_groups(groups, CANDIDATE_DISTRIBUTIONS)
+
     for stress in unique_stresses:
         display(Markdown(f"--- \n### 스트레스 수준: {stress} 분석"))
-        f_stress = failures[failure_stresses == stress]
-        rc_stress = right_censored[right_censored_stresses == stress]
+        if not fits_by_stress[stress]:
+            logging.warning(f"스트레스 {stress}는 고장 데이터가 부족하여 분포를 적합할 수 없습니다.")
+            continue
 
-        # Fit_Everything을 사용하여 모든 지정된 분포를 적합
-        fit = reliability.Fitters.Fit_Everything(
-            failures=f_stress,
-            right_censored=rc_stress,
-            sort_by='BIC',
-            exclude=['Beta_2P', 'Weibull_3P', 'Lognormal_3P', 'Gamma_2P', 'Gamma_3P', 'Loglogistic_2P', 'Loglogistic_3P', 'Gumbel_2P', 'Exponential_2P', 'Weibull_Mixture', 'Weibull_CR', 'Weibull_DS'],
-            show_probability_plot=False,
-            show_histogram_plot=False,
-            show_PP_plot=False,
-            show_best_distribution_probability_plot=False,
-            print_results=False
-        )
-
-        # 결과 저장
-        results_df = fit.results
+        # 결과 저장 (BIC 오름차순)
+        results_df = summary_table(fits_by_stress[stress])
         results_df['stress'] = stress
         all_results.append(results_df)
 
-        best_dist_name = fit.best_distribution_name
+        best_dist_name = results_df['Distribution'].iloc[0]
         best_dist_votes.append(best_dist_name)
-        logging.info(f"스트레스 {stress}의 최적 분포: {best_dist_name} (BIC: {fit.best_distribution_BIC:.2f})")
+        logging.info(f"스트레스 {stress}의 최적 분포: {best_dist_name} (BIC: {results_df['BIC'].iloc[0]:.2f})")
         display(results_df)
 
-    combined_results = pd.concat(all_results).reset_index().rename(columns={'index': 'Distribution'})
+    if not all_results:
+        raise ValueError("분포를 적합할 수 있는 스트레스 수준이 없습니다. 각 스트레스 수준의 고장 데이터 수를 확인해주세요.")
+
+    combined_results = pd.concat(all_results).reset_index(drop=True)
     combined_results.to_csv(os.path.join('results', 'step2_distribution_fitting_results.csv'), index=False)
     logging.info("모든 스트레스 수준의 분포 적합 결과가 'results/step2_distribution_fitting_results.csv'에 저장되었습니다.")
 
@@ -249,8 +258,6 @@ def build_alt_model(failures, failure_stresses, right_censored, right_censored_s
         tuple: 최적 ALT 모델 객체와 모델 이름.
     """
     logging.info(f"최적 가속 수명 모델 수립을 시작합니다 (기준 분포: {best_dist_name}).")
-    dist_name_for_alt = best_dist_name.replace('_1P','').replace('_2P','')
-
     fit_alt = reliability.ALT_fitters.Fit_Everything_ALT(
         failures=failures,
         failure_stress_1=failure_stresses,
@@ -258,7 +265,8 @@ def build_alt_model(failures, failure_stresses, right_censored, right_censored_s
         right_censored_stress_1=right_censored_stresses,
         sort_by='BIC',
         # 최적 분포 외 다른 분포 기반 모델은 제외하여 분석 시간 단축
-        exclude=[d for d in ['Weibull','Lognormal','Normal','Exponential'] if d != dist_name_for_alt],
+        # (Fit_Everything_ALT의 exclude는 'Weibull' 같은 분포 이름이 아니라 모델 이름을 받습니다)
+        exclude=fit_everything_alt_exclude([best_dist_name]),
         print_results=False,
         show_probability_plot=False,
         show_best_distribution_probability_plot=False
@@ -0,0 +1,81 @@
+"""
+수명 분포 레지스트리
+
+reliability의 Fit_Everything / Fit_Everything_ALT는 exclude에 지정하지 않은 분포(모델)를 모두 적합합니다.
+분석에 필요한 분포만 요청 목록으로 받고, 나머지를 exclude 목록으로 계산해 두면
+Weibull_Mixture, Weibull_DS, Gamma_3P 등 사용하지 않는 모델을 적합하는 시간을 없앨 수 있습니다.
+
+- canonical_name: 'weibull', 'Weibull_2P' 같은 다양한 표기를 reliability 분포 이름으로 통일합니다.
+- fit_everything_exclude: 요청된 분포를 제외한 Fit_Everything exclude 목록을 만듭니다.
+- fit_everything_alt_exclude: 요청된 수명 분포 기반이 아닌 Fit_Everything_ALT exclude 목록을 만듭니다.
+"""
+from typing import Iterable, List
+
+# reliability.Fitters.Fit_Everything이 적합하는 분포
+FIT_EVERYTHING_DISTRIBUTIONS = [
+    'Weibull_2P', 'Weibull_3P', 'Normal_2P', 'Gamma_2P', 'Loglogistic_2P', 'Gamma_3P',
+    'Lognormal_2P', 'Lognormal_3P', 'Loglogistic_3P', 'Gumbel_2P', 'Exponential_2P',
+    'Exponential_1P', 'Beta_2P', 'Weibull_Mixture', 'Weibull_CR', 'Weibull_DS',
+]
+
+# reliability.ALT_fitters.Fit_Everything_ALT의 수명 분포와 수명-스트레스 모델
+ALT_LIFE_DISTRIBUTIONS = ['Weibull', 'Lognormal', 'Normal', 'Exponential']
+ALT_LIFE_STRESS_MODELS = [
+    'Exponential', 'Eyring', 'Power',
+    'Dual_Exponential', 'Power_Exponential', 'Dual_Power',
+]
+ALT_MODELS = [f'{dist}_{model}' for dist in ALT_LIFE_DISTRIBUTIONS for model in ALT_LIFE_STRESS_MODELS]
+
+# 소문자 표기 -> reliability 분포 이름 (모수 개수를 생략하면 가장 일반적인 모형을 사용합니다)
+_ALIASES = {name.lower(): name for name in FIT_EVERYTHING_DISTRIBUTIONS}
+_ALIASES.update({
+    'weibull': 'Weibull_2P',
+    'lognormal': 'Lognormal_2P',
+    'normal': 'Normal_2P',
+    'exponential': 'Exponential_1P',
+    'gamma': 'Gamma_2P',
+    'loglogistic': 'Loglogistic_2P',
+    'gumbel': 'Gumbel_2P',
+    'beta': 'Beta_2P',
+})
+
+
+def canonical_name(dist_name: str) -> str:
+    """분포 이름을 reliability 분포 이름으로 바꿉니다. (대소문자 무시, 예: 'weibull' -> 'Weibull_2P')"""
+    canonical = _ALIASES.get(str(dist_name).strip().lower())
+    if canonical is None:
+        raise ValueError(f"지원하지 않는 분포입니다: {dist_name} (지원: {FIT_EVERYTHING_DISTRIBUTIONS})")
+    return canonical
+
+
+def resolve_distributions(dist_names: Iterable[str]) -> List[str]:
+    """요청된 분포 이름 목록을 중복 없이 reliability 분포 이름 목록으로 바꿉니다. (요청 순서 유지)"""
+    resolved = []
+    for dist_name in dist_names:
+        canonical = canonical_name(dist_name)
+        if canonical not in resolved:
+            resolved.append(canonical)
+    return resolved
+
+
+def fit_everything_exclude(dist_names: Iterable[str]) -> List[str]:
+    """Fit_Everything이 요청된 분포만 적합하도록 전달할 exclude 목록을 반환합니다."""
+    requested = resolve_distributions(dist_names)
+    if not requested:
+        raise ValueError("적합할 분포가 지정되지 않았습니다.")
+    return [name for name in FIT_EVERYTHING_DISTRIBUTIONS if name not in requested]
+
+
+def fit_everything_alt_exclude(dist_names: Iterable[str]) -> List[str]:
+    """
+    Fit_Everything_ALT가 요청된 수명 분포 기반의 모델만 적합하도록 전달할 exclude 목록을 반환합니다.
+    (예: ['Weibull_2P'] -> Weibull_Exponential, Weibull_Eyring 등 Weibull 기반 모델만 적합)
+    Fit_Everything_ALT의 exclude는 'Weibull' 같은 분포 이름을 인식하지 못하므로 모델 이름으로 나열해야 합니다.
+    """
+    requested = {canonical_name(dist_name).split('_')[0] for dist_name in dist_names}
+    unsupported = sorted(requested - set(ALT_LIFE_DISTRIBUTIONS))
+    if unsupported:
+        raise ValueError(f"가속 수명 모델을 지원하지 않는 분포입니다: {unsupported} (지원: {ALT_LIFE_DISTRIBUTIONS})")
+    if not requested:
+        raise ValueError("적합할 분포가 지정되지 않았습니다.")
+    return [model for model in ALT_MODELS if model.split('_')[0] not in requested]
@@ -0,0 +1,653 @@
+"""
+수명 분포 MLE 적합 엔진 (우측 관측중단 지원)
+
+reliability.Fitters의 Fit_Weibull_2P / Fit_Lognormal_2P / Fit_Normal_2P / Fit_Exponential_1P는
+적합할 때마다 옵티마이저 설정, 자동 미분 헤시안, 결과 DataFrame, Anderson-Darling 통계량을 모두 준비하므로
+호출당 수십 ms가 걸립니다. 이 모듈은 같은 MLE를 NumPy로 직접 계산합니다.
+
+- Exponential_1P: 닫힌 형태 (Lambda = 고장 수 / 총 시간)
+- Normal_2P / Lognormal_2P: 관측중단이 없으면 닫힌 형태, 있으면 (mu, sigma)에 대한 뉴턴 반복
+- Weibull_2P: 형상모수 beta의 프로파일 우도 방정식을 뉴턴 반복으로 풀고, alpha는 닫힌 형태로 계산
+
+모든 계산은 (그룹, 관측값) 2차원 배열과 마스크로 벡터화되어 있어, fit_groups로 여러 그룹(스트레스 수준 등)을
+분포마다 한 번의 계산으로 적합할 수 있습니다.
+이미 추정한 모수와 공분산은 restore_fit으로 다시 적합하지 않고 적합 결과 객체로 되돌릴 수 있습니다.
+신뢰구간은 reliability와 같이 관측 피셔 정보행렬의 역행렬(공분산)로 계산하며,
+양수 모수(alpha, beta, sigma, Lambda)에는 로그 변환 신뢰구간을 사용합니다.
+
+적합 결과 객체의 quantile / CDF / SF는 배열을 받아 점추정치와 신뢰구간을 한 번에 계산합니다.
+(reliability 분포 객체와 같은 델타 방법을 사용하며, 값마다 분포 객체를 호출하지 않습니다)
+
+적합 결과 객체는 점추정치, 표준오차, 공분산, 신뢰구간, loglik, AICc, BIC만 바로 계산하고,
+reliability 분포 객체(distribution), 결과 표(results), 적합도 표(goodness_of_fit)는 처음 사용할 때 만듭니다.
+속성 이름과 생성자 인자는 reliability 피터와 같으므로 기존 코드에서 그대로 바꿔 쓸 수 있습니다.
+"""
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.special import log_ndtr, ndtr, ndtri
+
+logger = logging.getLogger(__name__)
+
+_MAX_ITER = 100
+_MAX_HALVINGS = 30
+_TOL = 1e-10
+_LOG_SQRT_2PI = 0.5 * np.log(2 * np.pi)
+
+
+# --- 입력 정리 ---
+
+def _clean_inputs(dist_name: str, failures, right_censored):
+    failures = np.asarray(failures, dtype=float).ravel()
+    right_censored = np.asarray([] if right_censored is None else right_censored, dtype=float).ravel()
+    if np.isnan(failures).any() or np.isnan(right_censored).any():
+        raise ValueError("failures와 right_censored에 결측값(NaN)이 포함되어 있습니다.")
+
+    if dist_name != 'Normal_2P':
+        if (failures < 0).any() or (right_censored < 0).any():
+            raise ValueError("All failure and censoring times must be greater than zero.")
+        # reliability 피터와 같이 0은 적합할 수 없으므로 제외합니다.
+        if (failures == 0).any() or (right_censored == 0).any():
+            logger.warning(f"{dist_name} 적합: 0인 데이터는 제외합니다.")
+            failures = failures[failures != 0]
+            right_censored = right_censored[right_censored != 0]
+
+    min_failures = _SPECS[dist_name]['k']
+    if len(failures) < min_failures:
+        raise ValueError(f"{dist_name} 분포를 적합하려면 고장 데이터가 최소 {min_failures}개 필요합니다. (현재 {len(failures)}개)")
+    # 고장 시간이 모두 같으면 척도 모수가 0(또는 형상모수가 무한대)으로 발산해 loglik / BIC가 inf, NaN이 되므로
+    # reliability 피터와 같이 서로 다른 고장 시간의 수를 확인합니다.
+    if len(np.unique(failures)) < min_failures:
+        raise ValueError(f"{dist_name} 분포를 적합하려면 서로 다른 고장 데이터가 최소 {min_failures}개 필요합니다.")
+    return failures, right_censored
+
+
+def _stack_groups(groups):
+    """
+    [(failures, right_censored), ...]를 (그룹 수, 최대 관측 수) 크기의 배열과 마스크로 만듭니다.
+
+    Returns:
+        t: 관측 시간 (빈 칸은 1.0), failed: 고장 여부, present: 실제 관측값 여부
+    """
+    width = max(len(f) + len(rc) for f, rc in groups)
+    t = np.ones((len(groups), width))
+    failed = np.zeros((len(groups), width), dtype=bool)
+    present = np.zeros((len(groups), width), dtype=bool)
+    for i, (f, rc) in enumerate(groups):
+        n_f, n = len(f), len(f) + len(rc)
+        t[i, :n_f] = f
+        t[i, n_f:n] = rc
+        failed[i, :n_f] = True
+        present[i, :n] = True
+    return t, failed, present
+
+
+# --- 위치-척도 분포족 (로그 시간의 최소극값 분포 = Weibull, 정규분포 = Normal/Lognormal) ---
+
+def _ls_terms(family: str, z, failed):
+    """표준화 변수 z에 대한 관측값별 로그우도 항과 1, 2차 도함수 (고장: log pdf, 관측중단: log SF)"""
+    if family == 'sev':
+        ez = np.exp(z)
+        value = np.where(failed, z - ez, -ez)
+        d1 = np.where(failed, 1 - ez, -ez)
+        d2 = -ez
+    else:
+        log_sf = log_ndtr(-z)
+        # 관측중단 항의 도함수에 쓰는 역 밀스 비율 phi(z) / (1 - Phi(z))
+        mills = np.exp(-0.5 * z ** 2 - _LOG_SQRT_2PI - log_sf)
+        value = np.where(failed, -0.5 * z ** 2 - _LOG_SQRT_2PI, log_sf)
+        d1 = np.where(failed, -z, -mills)
+        d2 = np.where(failed, -1.0, -mills * (mills - z))
+    return value, d1, d2
+
+
+def _ls_evaluate(family: str, y, failed, present, mu, sigma):
+    """
+    (mu, sigma)에서 y(시간 또는 로그 시간)의 로그우도와, (mu, sigma)에 대한 그래디언트 및 헤시안 성분 (그룹별)
+    """
+    z = np.where(present, (y - mu[:, None]) / sigma[:, None], 0)
+    value, d1, d2 = _ls_terms(family, z, failed)
+    value = np.where(present, value, 0)
+    d1 = np.where(present, d1, 0)
+    d2 = np.where(present, d2, 0)
+    r = failed.sum(axis=1)
+    loglik = value.sum(axis=1) - r * np.log(sigma)
+    grad = (-d1.sum(axis=1) / sigma, -((z * d1).sum(axis=1) + r) / sigma)
+    hess = (
+        d2.sum(axis=1) / sigma ** 2,
+        (d1 + z * d2).sum(axis=1) / sigma ** 2,
+        (2 * z * d1 + z ** 2 * d2).sum(axis=1) / sigma ** 2 + r / sigma ** 2,
+    )
+    return loglik, grad, hess
+
+
+def _invert_information(hess):
+    """
+    헤시안 (H_mm, H_ms, H_ss)로 공분산 (V_mm, V_ms, V_ss)를 계산합니다.
+    관측 정보행렬(-H)이 양의 정부호가 아니면 해당 그룹은 NaN을 반환합니다.
+    """
+    h_mm, h_ms, h_ss = hess
+    det = h_mm * h_ss - h_ms ** 2
+    valid = (h_mm < 0) & (det > 0)
+    det = np.where(valid, det, np.nan)
+    return -h_ss / det, h_ms / det, -h_mm / det
+
+
+def _normal_family_mle(y, failed, present):
+    """
+    정규분포 (Normal: y = t, Lognormal: y = log t)의 MLE.
+    관측중단이 없으면 고장 데이터의 평균/표준편차(ddof=0)가 MLE이고,
+    관측중단이 있으면 관측중단값을 고장으로 본 평균/표준편차에서 시작해 스텝 반감 뉴턴 반복으로 구합니다.
+    """
+    censored = present & ~failed
+    active = censored.any(axis=1)
+    start = np.where(active[:, None], present, failed)
+    count = start.sum(axis=1)
+    mu = np.where(start, y, 0).sum(axis=1) / count
+    sigma = np.sqrt(np.where(start, (y - mu[:, None]) ** 2, 0).sum(axis=1) / count)
+    if not active.any():
+        return mu, sigma
+
+    loglik, (g_m, g_s), (h_mm, h_ms, h_ss) = _ls_evaluate('normal', y, failed, present, mu, sigma)
+    for _ in range(_MAX_ITER):
+        det = h_mm * h_ss - h_ms ** 2
+        newton = (h_mm < 0) & (det > 0)
+        safe_det = np.where(newton, det, 1.0)
+        # 헤시안이 음의 정부호가 아니면 그래디언트 방향으로 이동합니다.
+        scale = sigma ** 2 / failed.sum(axis=1)
+        d_mu = np.where(active, np.where(newton, -(h_ss * g_m - h_ms * g_s) / safe_det, g_m * scale), 0)
+        d_sigma = np.where(active, np.where(newton, -(h_mm * g_s - h_ms * g_m) / safe_det, g_s * scale), 0)
+
+        step = np.ones_like(mu)
+        for _ in range(_MAX_HALVINGS):
+            new_sigma = sigma + step * d_sigma
+            positive = new_sigma > 0
+            new_mu = mu + step * d_mu
+            new_sigma = np.where(positive, new_sigma, sigma)
+            new_loglik, new_grad, new_hess = _ls_evaluate('normal', y, failed, present, new_mu, new_sigma)
+            accepted = positive & (new_loglik >= loglik - 1e-12 * np.abs(loglik))
+            if accepted.all():
+                break
+            step = np.where(accepted, step, step / 2)
+        step = np.where(accepted, step, 0)
+
+        done = (np.abs(step * d_mu) <= _TOL * (np.abs(mu) + sigma)) & (np.abs(step * d_sigma) <= _TOL * sigma)
+        mu, sigma = np.where(accepted, new_mu, mu), np.where(accepted, new_sigma, sigma)
+        loglik = np.where(accepted, new_loglik, loglik)
+        g_m, g_s = (np.where(accepted, new, old) for new, old in zip(new_grad, (g_m, g_s)))
+        h_mm, h_ms, h_ss = (np.where(accepted, new, old) for new, old in zip(new_hess, (h_mm, h_ms, h_ss)))
+        active &= ~done
+        if not active.any():
+            break
+    return mu, sigma
+
+
+def _weibull_mle(t, failed, present):
+    """
+    Weibull MLE. beta의 프로파일 우도 방정식
+        sum(t^b ln t) / sum(t^b) - 1/b - mean(ln t_failures) = 0
+    은 b에 대해 단조 증가하므로, 구간을 좁혀 가며(구간을 벗어나면 이분법) 뉴턴 반복으로 풉니다.
+    alpha = (sum(t^b) / r)^(1/b) 입니다.
+    """
+    log_t = np.where(present, np.log(t), 0)
+    # t^b가 넘치지 않도록 그룹별 최대 로그 시간을 빼서 계산합니다. (방정식은 이동에 대해 불변)
+    shift = np.where(present, log_t, -np.inf).max(axis=1)
+    x = np.where(present, log_t - shift[:, None], 0)
+    r = failed.sum(axis=1)
+    mean_failure_x = np.where(failed, x, 0).sum(axis=1) / r
+    spread = np.sqrt(np.where(failed, (x - mean_failure_x[:, None]) ** 2, 0).sum(axis=1) / r)
+    beta = np.where(spread > 0, np.pi / (np.sqrt(6) * np.where(spread > 0, spread, 1)), 1.0)
+
+    lower = np.zeros_like(beta)
+    upper = np.full_like(beta, np.inf)
+    for _ in range(_MAX_ITER):
+        w = np.where(present, np.exp(beta[:, None] * x), 0)
+        s0 = w.sum(axis=1)
+        m1 = (w * x).sum(axis=1) / s0
+        m2 = (w * x ** 2).sum(axis=1) / s0
+        f = m1 - 1 / beta - mean_failure_x
+        lower = np.where(f < 0, beta, lower)
+        upper = np.where(f > 0, beta, upper)
+
+        new_beta = beta - f / (m2 - m1 ** 2 + 1 / beta ** 2)
+        outside = ~((new_beta > lower) & (new_beta < upper))
+        new_beta = np.where(outside, np.where(np.isfinite(upper), (lower + upper) / 2, 2 * beta), new_beta)
+        done = np.abs(new_beta - beta) <= _TOL * beta
+        beta = new_beta
+        if done.all():
+            break
+
+    s0 = np.where(present, np.exp(beta[:, None] * x), 0).sum(axis=1)
+    alpha = np.exp(shift + np.log(s0 / r) / beta)
+    return alpha, beta
+
+
+# --- 분포별 적합 (그룹 단위로 벡터화) ---
+
+def _fit_weibull(t, failed, present):
+    alpha, beta = _weibull_mle(t, failed, present)
+    log_t = np.where(present, np.log(t), 0)
+    # 공분산은 로그 시간의 최소극값 분포 (mu = ln alpha, sigma = 1/beta)에서 계산한 뒤 변환합니다.
+    _, _, hess = _ls_evaluate('sev', log_t, failed, present, np.log(alpha), 1 / beta)
+    v_mm, v_ms, v_ss = _invert_information(hess)
+    z = (t / alpha[:, None]) ** beta[:, None]
+    loglik = np.where(present, np.where(
+        failed, np.log(beta / alpha)[:, None] + (beta[:, None] - 1) * np.log(t / alpha[:, None]) - z, -z), 0).sum(axis=1)
+    return {
+        'params': (alpha, beta),
+        'cov': (alpha ** 2 * v_mm, -alpha * beta ** 2 * v_ms, beta ** 4 * v_ss),
+        'loglik': loglik,
+    }
+
+
+def _fit_normal_family(y, failed, present, log_scale: bool):
+    mu, sigma = _normal_family_mle(y, failed, present)
+    loglik, _, hess = _ls_evaluate('normal', y, failed, present, mu, sigma)
+    if log_scale:
+        # 로그 시간의 밀도를 시간의 밀도로 바꾸는 야코비안 항 (-ln t)
+        loglik = loglik - np.where(failed, y, 0).sum(axis=1)
+    return {'params': (mu, sigma), 'cov': _invert_information(hess), 'loglik': loglik}
+
+
+def _fit_lognormal(t, failed, present):
+    return _fit_normal_family(np.where(present, np.log(t), 0), failed, present, log_scale=True)
+
+
+def _fit_normal(t, failed, present):
+    return _fit_normal_family(t, failed, present, log_scale=False)
+
+
+def _fit_exponential(t, failed, present):
+    r = failed.sum(axis=1)
+    total_time = np.where(present, t, 0).sum(axis=1)
+    Lambda = r / total_time
+    return {
+        'params': (Lambda,),
+        'cov': (Lambda ** 2 / r,),
+        'loglik': r * np.log(Lambda) - Lambda * total_time,
+    }
+
+
+_SPECS = {
+    'Weibull_2P': {'fit': _fit_weibull, 'params': ('alpha', 'beta'), 'labels': ('Alpha', 'Beta'),
+                   'positive': (True, True), 'k': 2},
+    'Lognormal_2P': {'fit': _fit_lognormal, 'params': ('mu', 'sigma'), 'labels': ('Mu', 'Sigma'),
+                     'positive': (False, True), 'k': 2},
+    'Normal_2P': {'fit': _fit_normal, 'params': ('mu', 'sigma'), 'labels': ('Mu', 'Sigma'),
+                  'positive': (False, True), 'k': 2},
+    'Exponential_1P': {'fit': _fit_exponential, 'params': ('Lambda',), 'labels': ('Lambda',),
+                       'positive': (True,), 'k': 1},
+}
+
+SUPPORTED_DISTRIBUTIONS = list(_SPECS)
+
+
+# --- 적합 결과 객체 ---
+
+class LifeFit:
+    """
+    한 데이터셋에 대한 분포 적합 결과.
+
+    reliability 피터와 같은 인자(failures, right_censored, CI, quantiles, show_probability_plot, print_results)를 받고,
+    같은 이름의 속성(alpha/beta 또는 mu/sigma 또는 Lambda와 *_SE, *_lower, *_upper, Cov_*, loglik, loglik2, AICc, BIC)을 가집니다.
+    적합 결과는 pickle로 전달할 수 있으며, 확률도는 show_probability_plot=True일 때만 그립니다.
+    """
+    distribution_name = None
+
+    def __init__(self, failures, right_censored=None, CI: float = 0.95, quantiles=None, CI_type: str = 'time',
+                 show_probability_plot: bool = False, print_results: bool = False, **kwargs):
+        failures, right_censored = _clean_inputs(self.distribution_name, failures, right_censored)
+        estimates = _SPECS[self.distribution_name]['fit'](*_stack_groups([(failures, right_censored)]))
+        self._populate(estimates, 0, failures, right_censored, CI, CI_type, quantiles)
+        if print_results:
+            self.print_results()
+        if show_probability_plot:
+            self.plot_probability(**kwargs)
+
+    def _populate(self, estimates: dict, index: int, failures, right_censored, CI: float, CI_type: str, quantiles=None):
+        """벡터화된 적합 결과(estimates)의 index번째 그룹 값으로 속성을 채웁니다."""
+        spec = _SPECS[self.distribution_name]
+        names = spec['params']
+        self.failures = failures
+        self.right_censored = right_censored
+        self.CI = CI
+        self.CI_type = CI_type
+        self.method = 'MLE'
+        self.gamma = 0
+        self._distribution = None
+        self._goodness_of_fit = None
+
+        params = [float(p[index]) for p in estimates['params']]
+        variances = [estimates['cov'][0][index], estimates['cov'][-1][index]][:len(names)]
+        covariance = float(estimates['cov'][1][index]) if len(names) == 2 else 0.0
+        if not all(np.isfinite(v) for v in variances):
+            logger.warning(f"{self.distribution_name}: 정보행렬의 역행렬을 구할 수 없어 모수의 신뢰구간을 계산하지 못했습니다.")
+            variances, covariance = [0.0] * len(names), 0.0
+
+        Z = -ndtri((1 - CI) / 2)
+        for name, value, variance, positive in zip(names, params, variances, spec['positive']):
+            SE = abs(float(variance)) ** 0.5
+            setattr(self, name, value)
+            setattr(self, f'{name}_SE', SE)
+            if positive:
+                setattr(self, f'{name}_lower', value * np.exp(-Z * SE / value))
+                setattr(self, f'{name}_upper', value * np.exp(Z * SE / value))
+            else:
+                setattr(self, f'{name}_lower', value - Z * SE)
+                setattr(self, f'{name}_upper', value + Z * SE)
+        if len(names) == 2:
+            setattr(self, f'Cov_{names[0]}_{names[1]}', covariance)
+
+        n = len(failures) + len(right_censored)
+        k = spec['k']
+        self.loglik = float(estimates['loglik'][index])
+        self.loglik2 = -2 * self.loglik
+        self.AICc = 2 * k + self.loglik2 + (2 * k ** 2 + 2 * k) / (n - k - 1) if n - k - 1 > 0 else 'Insufficient data'
+        self.BIC = np.log(n) * k + self.loglik2
+
+        if quantiles is not None:
+            quantiles = np.asarray(quantiles, dtype=float)
+            lower, point, upper = self.quantile(quantiles, bounds=True)
+            self.quantiles = pd.DataFrame({
+                'Quantile': quantiles,
+                'Lower Estimate': np.atleast_1d(lower),
+                'Point Estimate': np.atleast_1d(point),
+                'Upper Estimate': np.atleast_1d(upper),
+            })
+
+    def _Lambda_bounds(self, Z: float):
+        """신뢰수준 Z에서 Lambda의 (하한, 상한) - 로그 변환 신뢰구간"""
+        ratio = np.exp(Z * self.Lambda_SE / self.Lambda)
+        return self.Lambda / ratio, self.Lambda * ratio
+
+    def _delta_sd(self, d_first, d_second):
+        """델타 방법: 두 모수에 대한 편미분 배열로 변환값의 표준편차를 계산합니다."""
+        first, second = _SPECS[self.distribution_name]['params']
+        var = (d_first ** 2 * getattr(self, f'{first}_SE') ** 2 + d_second ** 2 * getattr(self, f'{second}_SE') ** 2
+               + 2 * d_first * d_second * getattr(self, f'Cov_{first}_{second}'))
+        return np.sqrt(np.maximum(var, 0))
+
+    def quantile(self, q, bounds: bool = False, CI: float = None):
+        """
+        누적 고장 확률 q(배열 가능)에 도달하는 시간 (B-수명은 q = B/100).
+
+        bounds=True이면 시간 기준 신뢰구간을 포함해 (하한, 점추정, 상한)을 반환합니다.
+        reliability 분포 객체의 CDF(CI_type='time', CI_y=q)와 같은 값이며, CI를 생략하면 적합할 때의 신뢰수준을 사용합니다.
+        """
+        q = np.asarray(q, dtype=float)
+        Z = -ndtri((1 - (CI or self.CI)) / 2)
+        if self.distribution_name == 'Exponential_1P':
+            H = -np.log1p(-q)
+            point = H / self.Lambda
+            if not bounds:
+                return point
+            Lambda_lower, Lambda_upper = self._Lambda_bounds(Z)
+            return H / Lambda_upper, point, H / Lambda_lower
+
+        # 선형화된 시간 v = ln(t) (Weibull, Lognormal) 또는 t (Normal)에 델타 방법을 적용합니다.
+        if self.distribution_name == 'Weibull_2P':
+            w = np.log(-np.log1p(-q))
+            v = w / self.beta + np.log(self.alpha)
+            sd = self._delta_sd(1 / self.alpha, -w / self.beta ** 2) if bounds else None
+        else:
+            z = ndtri(q)
+            v = self.mu + self.sigma * z
+            sd = self._delta_sd(np.ones_like(z), z) if bounds else None
+        transform = (lambda x: x) if self.distribution_name == 'Normal_2P' else np.exp
+        point = transform(v)
+        return (transform(v - Z * sd), point, transform(v + Z * sd)) if bounds else point
+
+    def SF(self, t, bounds: bool = False, CI: float = None):
+        """
+        시간 t(배열 가능)에서의 신뢰도.
+
+        bounds=True이면 신뢰도 기준 신뢰구간을 포함해 (하한, 점추정, 상한)을 반환합니다.
+        reliability 분포 객체의 SF(CI_type='reliability', CI_x=t)와 같은 값입니다.
+        """
+        t = np.asarray(t, dtype=float)
+        Z = -ndtri((1 - (CI or self.CI)) / 2)
+        if self.distribution_name == 'Exponential_1P':
+            t = np.maximum(t, 0)
+            point = np.exp(-self.Lambda * t)
+            if not bounds:
+                return point
+            Lambda_lower, Lambda_upper = self._Lambda_bounds(Z)
+            return np.exp(-Lambda_upper * t), point, np.exp(-Lambda_lower * t)
+
+        if self.distribution_name == 'Normal_2P':
+            u = (self.mu - t) / self.sigma
+            point = ndtr(u)
+            if not bounds:
+                return point
+            sd = self._delta_sd(np.full_like(u, 1 / self.sigma), -u / self.sigma)
+            return ndtr(u - Z * sd), point, ndtr(u + Z * sd)
+
+        # Weibull, Lognormal은 t <= 0에서 신뢰도가 1입니다.
+        positive = t > 0
+        log_t = np.log(np.where(positive, t, 1.0))
+        if self.distribution_name == 'Weibull_2P':
+            u = self.beta * (log_t - np.log(self.alpha))
+            to_sf = lambda x: np.where(positive, np.exp(-np.exp(x)), 1.0)
+            point = to_sf(u)
+            if not bounds:
+                return point
+            sd = self._delta_sd(np.full_like(u, -self.beta / self.alpha), log_t - np.log(self.alpha))
+            return to_sf(u + Z * sd), point, to_sf(u - Z * sd)
+
+        u = (self.mu - log_t) / self.sigma
+        to_sf = lambda x: np.where(positive, ndtr(x), 1.0)
+        point = to_sf(u)
+        if not bounds:
+            return point
+        sd = self._delta_sd(np.full_like(u, 1 / self.sigma), -u / self.sigma)
+        return to_sf(u - Z * sd), point, to_sf(u + Z * sd)
+
+    def CDF(self, t, bounds: bool = False, CI: float = None):
+        """시간 t(배열 가능)에서의 누적 고장 확률. bounds=True이면 (하한, 점추정, 상한)을 반환합니다. (1 - SF)"""
+        if not bounds:
+            return 1 - self.SF(t, CI=CI)
+        lower, point, upper = self.SF(t, bounds=True, CI=CI)
+        return 1 - upper, 1 - point, 1 - lower
+
+    @property
+    def parameters(self) -> dict:
+        return {name: getattr(self, name) for name in _SPECS[self.distribution_name]['params']}
+
+    @property
+    def results(self) -> pd.DataFrame:
+        """reliability 피터의 results와 같은 형식의 모수 추정 표"""
+        rows = []
+        for name, label in zip(_SPECS[self.distribution_name]['params'], _SPECS[self.distribution_name]['labels']):
+            rows.append([label, getattr(self, name), getattr(self, f'{name}_SE'),
+                         getattr(self, f'{name}_lower'), getattr(self, f'{name}_upper')])
+        if self.distribution_name == 'Exponential_1P':
+            # reliability와 같이 평균 수명(1/Lambda)도 함께 표시합니다.
+            Z = -ndtri((1 - self.CI) / 2)
+            SE_inv = abs(1 / self.Lambda * np.log(self.Lambda / self.Lambda_upper) / Z)
+            rows.append(['1/Lambda', 1 / self.Lambda, SE_inv, 1 / self.Lambda_upper, 1 / self.Lambda_lower])
+        return pd.DataFrame(rows, columns=['Parameter', 'Point Estimate', 'Standard Error', 'Lower CI', 'Upper CI'])
+
+    @property
+    def distribution(self):
+        """신뢰구간 정보를 포함한 reliability 분포 객체 (CDF, SF, quantile 등을 사용할 때 생성)"""
+        if self._distribution is None:
+            from reliability import Distributions
+            if self.distribution_name == 'Weibull_2P':
+                self._distribution = Distributions.Weibull_Distribution(
+                    alpha=self.alpha, beta=self.beta, alpha_SE=self.alpha_SE, beta_SE=self.beta_SE,
+                    Cov_alpha_beta=self.Cov_alpha_beta, CI=self.CI, CI_type=self.CI_type)
+            elif self.distribution_name == 'Exponential_1P':
+                self._distribution = Distributions.Exponential_Distribution(
+                    Lambda=self.Lambda, Lambda_SE=self.Lambda_SE, CI=self.CI)
+            else:
+                dist_class = (Distributions.Lognormal_Distribution if self.distribution_name == 'Lognormal_2P'
+                              else Distributions.Normal_Distribution)
+                self._distribution = dist_class(
+                    mu=self.mu, sigma=self.sigma, mu_SE=self.mu_SE, sigma_SE=self.sigma_SE,
+                    Cov_mu_sigma=self.Cov_mu_sigma, CI=self.CI, CI_type=self.CI_type)
+        return self._distribution
+
+    @property
+    def AD(self) -> float:
+        """Anderson-Darling 통계량 (reliability 피터와 같은 방식으로 계산)"""
+        from reliability.Probability_plotting import plotting_positions
+        from reliability.Utils import anderson_darling
+        x, y = plotting_positions(failures=self.failures, right_censored=self.right_censored)
+        return anderson_darling(fitted_cdf=self.distribution.CDF(xvals=x, show_plot=False), empirical_cdf=y)
+
+    @property
+    def goodness_of_fit(self) -> pd.DataFrame:
+        if self._goodness_of_fit is None:
+            self._goodness_of_fit = pd.DataFrame({
+                'Goodness of fit': ['Log-likelihood', 'AICc', 'BIC', 'AD'],
+                'Value': [self.loglik, self.AICc, self.BIC, self.AD],
+            })
+        return self._goodness_of_fit
+
+    def print_results(self):
+        n = len(self.failures) + len(self.right_censored)
+        print(f"Results from Fit_{self.distribution_name} ({self.CI * 100:g}% CI):")
+        print(f"Failures / Right censored: {len(self.failures)}/{len(self.right_censored)} "
+              f"({len(self.right_censored) / n * 100:g}% right censored)\n")
+        print(self.results.to_string(index=False), "\n")
+        print(self.goodness_of_fit.to_string(index=False), "\n")
+        if hasattr(self, 'quantiles'):
+            print(self.quantiles.to_string(index=False), "\n")
+
+    def plot_probability(self, **kwargs):
+        """reliability 피터가 show_probability_plot=True일 때 그리는 것과 같은 확률도를 현재 figure에 그립니다."""
+        import matplotlib.pyplot as plt
+        from reliability import Probability_plotting
+
+        plot_func = {
+            'Weibull_2P': Probability_plotting.Weibull_probability_plot,
+            'Lognormal_2P': Probability_plotting.Lognormal_probability_plot,
+            'Normal_2P': Probability_plotting.Normal_probability_plot,
+            'Exponential_1P': Probability_plotting.Exponential_probability_plot_Weibull_Scale,
+        }[self.distribution_name]
+        if self.distribution_name != 'Exponential_1P':
+            kwargs.setdefault('CI_type', self.CI_type)
+        # 이미 적합한 모수를 넘겨 확률도 함수가 다시 적합하지 않도록 합니다.
+        kwargs['__fitted_dist_params'] = self
+        plot_func(
+            failures=self.failures,
+            right_censored=self.right_censored if len(self.right_censored) else None,
+            CI=self.CI,
+            **kwargs,
+        )
+        self.probability_plot = plt.gca()
+        return self.probability_plot
+
+    def __getstate__(self):
+        # matplotlib Axes는 pickle로 전달하지 않습니다.
+        state = self.__dict__.copy()
+        state.pop('probability_plot', None)
+        return state
+
+
+class Fit_Weibull_2P(LifeFit):
+    distribution_name = 'Weibull_2P'
+
+
+class Fit_Lognormal_2P(LifeFit):
+    distribution_name = 'Lognormal_2P'
+
+
+class Fit_Normal_2P(LifeFit):
+    distribution_name = 'Normal_2P'
+
+
+class Fit_Exponential_1P(LifeFit):
+    distribution_name = 'Exponential_1P'
+
+
+FITTERS = {
+    'Weibull_2P': Fit_Weibull_2P,
+    'Lognormal_2P': Fit_Lognormal_2P,
+    'Normal_2P': Fit_Normal_2P,
+    'Exponential_1P': Fit_Exponential_1P,
+}
+
+
+def fit_distribution(dist_name: str, failures, right_censored=None, CI: float = 0.95, **kwargs) -> LifeFit:
+    """분포 이름으로 적합합니다. (지원: Weibull_2P, Lognormal_2P, Normal_2P, Exponential_1P)"""
+    if dist_name not in FITTERS:
+        raise ValueError(f"지원하지 않는 분포입니다: {dist_name} (지원: {SUPPORTED_DISTRIBUTIONS})")
+    return FITTERS[dist_name](failures=failures, right_censored=right_censored, CI=CI, **kwargs)
+
+
+def fit_groups(groups: Dict, distributions: List[str], CI: float = 0.95) -> Dict:
+    """
+    여러 그룹을 분포마다 한 번의 벡터화 계산으로 적합합니다.
+    그룹 데이터는 (그룹 수, 최대 관측 수) 배열과 고장/관측값 마스크로 묶어 모든 그룹의 우도를 동시에 계산합니다.
+
+    Args:
+        groups: {그룹 이름: {'failures': [...], 'right_censored': [...]}}
+        distributions: 적합할 분포 이름 목록 (지원: Weibull_2P, Lognormal_2P, Normal_2P, Exponential_1P)
+        CI: 신뢰수준
+
+    Returns:
+        {그룹 이름: {분포 이름: 적합 결과}}. 고장 데이터가 부족한 등 적합할 수 없는 (그룹, 분포)는 제외됩니다.
+    """
+    unsupported = [name for name in distributions if name not in FITTERS]
+    if unsupported:
+        raise ValueError(f"지원하지 않는 분포입니다: {unsupported} (지원: {SUPPORTED_DISTRIBUTIONS})")
+
+    results = {group: {} for group in groups}
+    for dist_name in distributions:
+        cleaned = {}
+        for group, data in groups.items():
+            try:
+                cleaned[group] = _clean_inputs(dist_name, data['failures'], data.get('right_censored'))
+            except ValueError as e:
+                logger.warning(f"그룹 '{group}' {dist_name} 적합 제외: {e}")
+        if not cleaned:
+            continue
+
+        estimates = _SPECS[dist_name]['fit'](*_stack_groups(list(cleaned.values())))
+        for index, (group, (failures, right_censored)) in enumerate(cleaned.items()):
+            fit = FITTERS[dist_name].__new__(FITTERS[dist_name])
+            fit._populate(estimates, index, failures, right_censored, CI, 'time')
+            results[group][dist_name] = fit
+    return results
+
+
+def restore_fit(dist_name: str, estimates: Dict[str, float], failures, right_censored=None, CI: float = 0.95,
+                CI_type: str = 'time') -> LifeFit:
+    """
+    이미 추정한 값으로 적합 결과 객체를 다시 만듭니다. 최적화는 다시 하지 않습니다.
+
+    Args:
+        estimates: 적합 결과와 같은 이름의 모수, 표준오차(*_SE), 공분산(Cov_*), loglik
+        CI: 모수 신뢰구간과 quantile / CDF / SF의 기본 신뢰수준 (적합할 때와 달라도 됩니다)
+    """
+    if dist_name not in FITTERS:
+        raise ValueError(f"지원하지 않는 분포입니다: {dist_name} (지원: {SUPPORTED_DISTRIBUTIONS})")
+    failures, right_censored = _clean_inputs(dist_name, failures, right_censored)
+    names = _SPECS[dist_name]['params']
+    variances = [estimates[f'{name}_SE'] ** 2 for name in names]
+    cov = (variances[0], estimates[f'Cov_{names[0]}_{names[1]}'], variances[1]) if len(names) == 2 else (variances[0],)
+    packed = {
+        'params': tuple(np.array([estimates[name]], dtype=float) for name in names),
+        'cov': tuple(np.array([value], dtype=float) for value in cov),
+        'loglik': np.array([estimates['loglik']], dtype=float),
+    }
+    fit = FITTERS[dist_name].__new__(FITTERS[dist_name])
+    fit._populate(packed, 0, failures, right_censored, CI, CI_type)
+    return fit
+
+
+def summary_table(fits: Dict[str, LifeFit]) -> pd.DataFrame:
+    """분포별 적합 결과를 reliability Fit_Everything의 results와 같은 열 이름의 표로 만듭니다. (BIC 오름차순)"""
+    rows = []
+    for dist_name, fit in fits.items():
+        row = {'Distribution': dist_name}
+        for name, label in zip(_SPECS[dist_name]['params'], _SPECS[dist_name]['labels']):
+            row[label] = getattr(fit, name)
+        row.update({'Log-likelihood': fit.loglik, 'AICc': fit.AICc, 'BIC': fit.BIC})
+        rows.append(row)
+    columns = ['Distribution', 'Alpha', 'Beta', 'Mu', 'Sigma', 'Lambda', 'Log-likelihood', 'AICc', 'BIC']
+    table = pd.DataFrame(rows, columns=columns)
+    return table.sort_values(by='BIC').reset_index(drop=True)
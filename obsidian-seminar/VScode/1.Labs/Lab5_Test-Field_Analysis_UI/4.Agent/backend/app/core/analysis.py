@@ -1,12 +1,29 @@
 import pandas as pd
 import numpy as np
-import reliability.Fitters as Fitters
-import matplotlib.pyplot as plt
+import io
 import logging
-from .config import Config
+from typing import Callable, Optional
+from .config import Config, EXCEL_CACHE_DIR
+from .excel_cache import read_excel_cached
+from .mle_fitters import FITTERS
+from .plots import probability_plot_spec, shape_comparison_spec, save_plot_specs
 
 logger = logging.getLogger(__name__)
 
+# 최적 분포 탐색 대상 분포
+CANDIDATE_DISTRIBUTIONS = ['Weibull_2P', 'Lognormal_2P', 'Normal_2P', 'Exponential_1P']
+
+def _fit_candidate(failures, dist_name: str, CI: float, dataset_name: str):
+    """
+    후보 분포 하나를 신뢰구간과 함께 적합합니다. 적합에 실패하면 None을 반환합니다. 적합은 reliability 피터와 같은 결과를 내는 NumPy MLE 엔진(mle_fitters)을 사용합니다.
+    """
+    fitter_func = FITTERS[dist_name]
+    try:
+        return fitter_func(failures=failures, CI=CI, show_probability_plot=False, print_results=False)
+    except Exception as e:
+        logger.warning(f"'{dataset_name}' {dist_name} 분포 적합 실패: {e}")
+        return None
+
 class LifeDataAnalysis:
     """
     수명 데이터를 분석하고, 최적 분포를 찾으며, 가속 계수를 계산하는 클래스
@@ -14,8 +31,7 @@ class LifeDataAnalysis:
     def __init__(self, config: Config):
         self.config = config
         self.df = self._load_data()
-        self.test_data = self.df[self.df[self.config.type_column] == self.config.test_type_value][self.config.lifetime_column].dropna().tolist()
-        self.field_data = self.df[self.df[self.config.type_column] == self.config.field_type_value][self.config.lifetime_column].dropna().tolist()
+        self.test_data, self.field_data = self._split_data(self.df)
 
         if len(self.test_data) < 2 or len(self.field_data) < 2:
             raise ValueError("분석을 위해 각 데이터셋(test, field)에 최소 2개 이상의 데이터가 필요합니다.")
@@ -23,64 +39,86 @@ class LifeDataAnalysis:
         self.test_fit = None
         self.field_fit = None
         self.results = {}
+        # 결과 파일 이름 -> 플롯 사양. 플롯 이미지는 분석 중에 그리지 않고, 처음 요청될 때 사양으로 그립니다.
+        self.plot_specs = {}
 
     def _load_data(self) -> pd.DataFrame:
+        """
+        분석에 필요한 두 컬럼(수명, 구분)만 읽습니다. 수명은 float64, 구분은 category 타입으로 파싱하며,
+        CSV는 config.csv_engine(기본값: pyarrow가 설치되어 있으면 'pyarrow')으로 읽습니다.
+        """
         logger.info(f"데이터 로드 시작: {self.config.data_path}")
+        # 업로드 내용이 메모리로 전달된 경우 디스크를 거치지 않고 바로 파싱합니다.
+        data = self.config.data
+        required_cols = [self.config.lifetime_column, self.config.type_column]
+        dtypes = {self.config.lifetime_column: 'float64', self.config.type_column: 'category'}
         try:
             if self.config.data_path.suffix.lower() == '.xlsx':
-                df = pd.read_excel(self.config.data_path)
+                # Excel은 Parquet 사이드카 캐시를 거쳐 필요한 컬럼만 읽습니다.
+                source = data if data is not None else self.config.data_path
+                df = read_excel_cached(source, columns=required_cols, cache_dir=EXCEL_CACHE_DIR).astype(dtypes)
             else:
-                df = pd.read_csv(self.config.data_path)
-            required_cols = [self.config.lifetime_column, self.config.type_column]
-            if not all(col in df.columns for col in required_cols):
-                raise ValueError(f"필수 컬럼이 누락되었습니다: {required_cols}")
-            logger.info("데이터 로드 완료.")
-            return df
+                source = io.BytesIO(data) if data is not None else self.config.data_path
+                df = pd.read_csv(source, usecols=required_cols, dtype=dtypes, engine=self.config.csv_engine)
+        except (ValueError, KeyError) as e:
+            # 필수 컬럼이 없거나 수명 컬럼을 숫자로 변환할 수 없는 경우 (pyarrow 엔진은 KeyError 계열 예외 발생)
+            logger.error(f"데이터 로드 중 오류 발생: {e}")
+            raise ValueError(f"필수 컬럼이 누락되었거나 형식이 올바르지 않습니다: {required_cols} ({e})") from e
         except Exception as e:
             logger.error(f"데이터 로드 중 오류 발생: {e}")
             raise
+        logger.info(f"데이터 로드 완료 ({len(df)}행).")
+        return df
 
-    def _analyze_dataset(self, failures, dataset_name: str, plot_path: str):
-        logger.info(f"'{dataset_name}' 데이터셋 개별 분석 시작.")
-        # 사용자가 요청한 4개 분포 외의 모든 분포를 제외 리스트에 추가
-        all_distributions = [
-            'Weibull_2P', 'Weibull_3P', 'Weibull_Mixture', 'Weibull_CR', 'Weibull_DS',
-            'Lognormal_2P', 'Lognormal_3P', 'Loglogistic_2P', 'Loglogistic_3P',
-            'Normal_2P', 'Gamma_2P', 'Gamma_3P', 'Gumbel_2P',
-            'Exponential_1P', 'Exponential_2P', 'Beta_2P'
-        ]
-        included = ['Weibull_2P', 'Lognormal_2P', 'Normal_2P', 'Exponential_1P']
-        excluded = [dist for dist in all_distributions if dist not in included]
-
-        fit_results = Fitters.Fit_Everything(
-            failures=failures,
-            sort_by='BIC',
-            exclude=excluded,  # 수정된 exclude 리스트 사용
-            show_probability_plot=False,
-            show_histogram_plot=False,
-            show_PP_plot=False,
-            show_best_distribution_probability_plot=False
-        )
-        best_dist_name = fit_results.best_distribution_name
-        logger.info(f"'{dataset_name}' 최적 분포 (BIC 기준): {best_dist_name}")
+    def _split_data(self, df: pd.DataFrame):
+        """구분 컬럼 값으로 수명 데이터를 test/field float64 배열로 나눕니다. (결측값 제외)"""
+        lifetimes = df[self.config.lifetime_column].to_numpy(dtype=np.float64)
+        types = df[self.config.type_column]
+        valid = ~np.isnan(lifetimes)
+        test_mask = (types == self.config.test_type_value).to_numpy() & valid
+        field_mask = (types == self.config.field_type_value).to_numpy() & valid
+        return lifetimes[test_mask], lifetimes[field_mask]
 
-        fitter_func = getattr(Fitters, f'Fit_{best_dist_name}', None)
-        if not fitter_func:
-            raise ValueError(f"'{best_dist_name}'에 해당하는 Fitter를 찾을 수 없습니다.")
-        
-        detailed_fit = fitter_func(
-            failures=failures, CI=self.config.confidence_level,
-            show_probability_plot=True, print_results=False
-        )
-        plt.title(f'Best Fit Distribution Probability Plot\n({dataset_name} Data)')
-        plt.savefig(plot_path)
-        plt.close()
-        logger.info(f"'{dataset_name}' 최적 분포 확률도를 '{plot_path}'에 저장했습니다.")
-        return detailed_fit
+    def _select_best_fit(self, fits: dict, dataset_name: str):
+        """후보 분포 적합 결과 중 BIC가 가장 작은 분포의 적합 결과를 반환합니다."""
+        fits = {name: fit for name, fit in fits.items() if fit is not None and np.isfinite(fit.BIC)}
+        if not fits:
+            raise ValueError(f"'{dataset_name}' 데이터셋에 적합 가능한 분포가 없습니다.")
+
+        best_dist_name = min(fits, key=lambda name: fits[name].BIC)
+        logger.info(f"'{dataset_name}' 최적 분포 (BIC 기준): {best_dist_name}")
+        return fits[best_dist_name]
 
     def fit(self):
-        self.test_fit = self._analyze_dataset(self.test_data, 'Durability_Test', self.config.test_fit_plot_path)
-        self.field_fit = self._analyze_dataset(self.field_data, 'Field', self.config.field_fit_plot_path)
+        """
+        두 데이터셋의 후보 분포를 각각 신뢰구간과 함께 한 번씩 적합하고 BIC 기준 최적 분포를 선택합니다.
+        적합 8건은 NumPy MLE 엔진으로 합쳐서 수 ms면 끝나므로 현재 프로세스에서 순차 실행합니다.
+        (분석 자체가 작업 큐의 프로세스 풀에서 실행되므로, 적합을 다시 프로세스로 나누면 워커 기동 비용만 늘어납니다)
+        """
+        datasets = {'Durability_Test': self.test_data, 'Field': self.field_data}
+        tasks = [(dataset_name, dist_name) for dataset_name in datasets for dist_name in CANDIDATE_DISTRIBUTIONS]
+        CI = self.config.confidence_level
+        logger.info(f"분포 적합 시작 (적합 {len(tasks)}건).")
+        results = [_fit_candidate(datasets[name], dist, CI, name) for name, dist in tasks]
+
+        fits = {dataset_name: {} for dataset_name in datasets}
+        for (dataset_name, dist_name), fit in zip(tasks, results):
+            fits[dataset_name][dist_name] = fit
+        self.test_fit = self._select_best_fit(fits['Durability_Test'], 'Durability_Test')
+        self.field_fit = self._select_best_fit(fits['Field'], 'Field')
+        self.results['test_best_distribution'] = self.test_fit.distribution.name2
+        self.results['field_best_distribution'] = self.field_fit.distribution.name2
+        if self.config.include_plots:
+            self._add_probability_plot_specs()
+
+    def _add_probability_plot_specs(self):
+        datasets = [
+            (self.test_fit, self.test_data, 'Durability_Test', self.config.test_fit_plot_path),
+            (self.field_fit, self.field_data, 'Field', self.config.field_fit_plot_path),
+        ]
+        for fit, failures, dataset_name, plot_path in datasets:
+            title = f'Best Fit Distribution Probability Plot\n({dataset_name} Data)'
+            self.plot_specs[plot_path.name] = probability_plot_spec(fit, failures, title)
 
     def compare_shape_parameters(self):
         logger.info("공통 형상모수 가정 검정 시작.")
@@ -113,17 +151,12 @@ class LifeDataAnalysis:
 
         is_overlapping = (p1_lower <= p2_upper) and (p2_lower <= p1_upper)
 
-        plt.figure(figsize=(8, 6))
-        plt.errorbar(x=[1], y=[p1_est], yerr=[[p1_est - p1_lower], [p1_upper - p1_est]], fmt='o', capsize=5, label='Durability Test')
-        plt.errorbar(x=[2], y=[p2_est], yerr=[[p2_est - p2_lower], [p2_upper - p2_est]], fmt='o', capsize=5, label='Field')
-        plt.xticks([1, 2], ['Durability Test', 'Field'])
-        plt.ylabel(f'Shape Parameter ({shape_name})')
-        plt.title('Shape Parameter Confidence Interval Comparison')
-        plt.legend()
-        plt.grid(True, axis='y', linestyle='--')
-        plt.savefig(self.config.shape_compare_plot_path)
-        plt.close()
-        logger.info(f"형상모수 신뢰구간 비교 플롯을 '{self.config.shape_compare_plot_path}'에 저장했습니다.")
+        if self.config.include_plots:
+            self.plot_specs[self.config.shape_compare_plot_path.name] = shape_comparison_spec(
+                shape_name,
+                {'Durability Test': (p1_est, p1_lower, p1_upper), 'Field': (p2_est, p2_lower, p2_upper)},
+                'Shape Parameter Confidence Interval Comparison'
+            )
 
         if is_overlapping:
             interp = "두 데이터셋의 형상모수 신뢰구간이 겹치므로, 공통 형상모수 가정은 통계적으로 타당하다고 볼 수 있습니다."
@@ -180,28 +213,29 @@ class LifeDataAnalysis:
         af_str = f"{af_val:.4f}" if af_val is not None else "계산 불가"
         af_interp = self.results.get('AF_interpretation', '해석 불가')
 
+        def plot_image(plot_path, alt: str) -> str:
+            # 플롯 사양이 없는 경우(플롯 생략 모드 등) 이미지 링크를 넣지 않습니다.
+            return f"\n  ![{alt}]({plot_path.name})" if plot_path.name in self.plot_specs else " 생략"
+
         report = f"""
 # 브레이크 패드 수명 데이터 분석 및 가속계수 산출 보고서
 ## 1. 분석 개요
 - **분석 목적:** 내구시험과 필드에서 수집된 브레이크 패드 수명 데이터를 비교하여, 내구시험의 가속성을 정량적으로 평가하고 가속계수를 산출합니다.
 - **분석 데이터:** 내구시험 데이터 (n={len(self.test_data)}), 필드 데이터 (n={len(self.field_data)}). 
-- **분석 도구:** Python `reliability` 패키지.
+- **분석 도구:** Python `reliability` 패키지 (분포 적합은 같은 MLE를 계산하는 NumPy 엔진 사용).
 ## 2. 개별 수명 분포 분석
 ### 2.1. 내구시험 데이터 분석
 - **최적 분포:** {dur_dist}
 - **파라미터 추정치 ({self.config.confidence_level*100}% 신뢰구간 포함):**\n```\n{dur_params}\n```
 - **BIC 값:** {dur_bic}
-- **확률도:**
-  ![내구시험 최적분포 확률도](Durability_Test_best_fit_probplot.png)
+- **확률도:**{plot_image(self.config.test_fit_plot_path, '내구시험 최적분포 확률도')}
 ### 2.2. 필드 데이터 분석
 - **최적 분포:** {field_dist}
 - **파라미터 추정치 ({self.config.confidence_level*100}% 신뢰구간 포함):**\n```\n{field_params}\n```
 - **BIC 값:** {field_bic}
-- **확률도:**
-  ![필드 최적분포 확률도](Field_best_fit_probplot.png)
+- **확률도:**{plot_image(self.config.field_fit_plot_path, '필드 최적분포 확률도')}
 ## 3. 공통 형상모수 검정
-- **신뢰구간 비교 플롯:**
-  ![Shape Parameter Comparison Plot](shape_parameter_comparison_plot.png)
+- **신뢰구간 비교 플롯:**{plot_image(self.config.shape_compare_plot_path, 'Shape Parameter Comparison Plot')}
 - **검정 결과:** {shape_interp}
 ## 4. 가속 계수 분석
 - **계산된 가속 계수(AF):** {af_str}
@@ -214,23 +248,32 @@ class LifeDataAnalysis:
             f.write(report)
         logger.info(f"최종 보고서를 '{self.config.report_path}'에 저장했습니다.")
 
-def run_analysis(config: Config) -> dict:
-    """ 전체 분석 파이프라인을 실행합니다. """
+def run_analysis(config: Config, progress_callback: Optional[Callable[[str], None]] = None) -> dict:
+    """ 전체 분석 파이프라인을 실행합니다.
+
+    progress_callback이 주어지면 각 단계('fit', 'shape_compare', 'acceleration_factor', 'report')에
+    진입할 때 단계 이름을 인자로 호출합니다. (작업 큐에서 진행 상황을 보고하는 데 사용)
+    """
+    def report_stage(stage: str):
+        if progress_callback:
+            progress_callback(stage)
+
     try:
         logger.info("수명 데이터 분석을 시작합니다.")
+        report_stage('fit')
         analysis = LifeDataAnalysis(config)
         analysis.fit()
+        report_stage('shape_compare')
         analysis.compare_shape_parameters()
+        report_stage('acceleration_factor')
         analysis.calculate_acceleration_factor()
+        report_stage('report')
         analysis.generate_report()
+        save_plot_specs(config.results_path, analysis.plot_specs)
         logger.info("수명 데이터 분석을 성공적으로 완료했습니다.")
-        
-        plot_paths = [
-            str(config.test_fit_plot_path),
-            str(config.field_fit_plot_path),
-            str(config.shape_compare_plot_path)
-        ]
-        
+
+        plot_paths = [str(config.results_path / name) for name in analysis.plot_specs]
+
         return {
             "report_path": str(config.report_path),
             "plot_paths": plot_paths,
@@ -0,0 +1,99 @@
+import hashlib
+import io
+import logging
+import zipfile
+from pathlib import Path
+from typing import List, Tuple
+
+import pandas as pd
+
+from .config import BATCH_MAX_PARTS, EXCEL_CACHE_DIR, UPLOAD_MAX_BYTES
+from .excel_cache import read_excel_cached
+
+logger = logging.getLogger(__name__)
+
+_SUPPORTED_SUFFIXES = ('.csv', '.xlsx')
+
+
+class BatchPart:
+    """배치 분석에서 하나의 LifeDataAnalysis 파이프라인으로 분석할 부품(파트) 데이터"""
+    def __init__(self, part_id: str, filename: str, data: bytes):
+        self.part_id = part_id
+        self.filename = filename
+        self.data = data
+        self.sha256 = hashlib.sha256(data).hexdigest()
+
+
+def _read_columns(filename: str, data: bytes) -> List[str]:
+    if filename.lower().endswith('.xlsx'):
+        return list(read_excel_cached(data, cache_dir=EXCEL_CACHE_DIR).columns)
+    return list(pd.read_csv(io.BytesIO(data), nrows=0).columns)
+
+
+def _read_table(filename: str, data: bytes, columns: List[str]) -> pd.DataFrame:
+    try:
+        if filename.lower().endswith('.xlsx'):
+            return read_excel_cached(data, columns=columns, cache_dir=EXCEL_CACHE_DIR)
+        return pd.read_csv(io.BytesIO(data), usecols=columns)
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"필수 컬럼이 누락되었습니다: {filename} {columns}") from e
+
+
+def _extract_zip(filename: str, data: bytes) -> List[Tuple[str, bytes]]:
+    """zip 파일 안의 CSV/Excel 파일을 (파일 이름, 내용) 목록으로 꺼냅니다."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"zip 파일을 열 수 없습니다: {filename} ({e})") from e
+
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and Path(info.filename).suffix.lower() in _SUPPORTED_SUFFIXES
+        and not Path(info.filename).name.startswith(('.', '~$'))
+    ]
+    # 압축 해제 후 크기로 한도를 확인합니다. (압축 폭탄 방지)
+    if sum(info.file_size for info in members) > UPLOAD_MAX_BYTES:
+        raise ValueError(f"zip 파일의 압축 해제 크기가 너무 큽니다: {filename}")
+    return [(Path(info.filename).name, archive.read(info)) for info in members]
+
+
+def split_batch_uploads(uploads: List[Tuple[str, bytes]], part_column: str,
+                        lifetime_column: str, type_column: str) -> List[BatchPart]:
+    """
+    업로드된 파일들을 부품 단위로 나눕니다.
+
+    - zip 파일은 안에 들어 있는 CSV/Excel 파일을 각각 하나의 업로드로 취급합니다.
+    - part_column 컬럼이 있는 파일은 부품 ID별로 나눠 수명/구분 컬럼만 담은 CSV로 만듭니다.
+    - part_column이 없는 파일은 파일 하나가 부품 하나이며, 파일 이름(확장자 제외)을 부품 ID로 사용합니다.
+    """
+    files = []
+    for filename, data in uploads:
+        if filename.lower().endswith('.zip'):
+            files.extend(_extract_zip(filename, data))
+        elif filename.lower().endswith(_SUPPORTED_SUFFIXES):
+            files.append((filename, data))
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다 (.csv, .xlsx, .zip만 가능): {filename}")
+
+    parts = []
+    for filename, data in files:
+        if part_column not in _read_columns(filename, data):
+            parts.append(BatchPart(Path(filename).stem, filename, data))
+            continue
+
+        df = _read_table(filename, data, columns=[part_column, lifetime_column, type_column])
+        for part_id, group in df.groupby(part_column, sort=True):
+            csv_bytes = group[[lifetime_column, type_column]].to_csv(index=False).encode('utf-8')
+            parts.append(BatchPart(str(part_id), f'{part_id}.csv', csv_bytes))
+
+    if not parts:
+        raise ValueError("분석할 데이터 파일이 없습니다.")
+    if len(parts) > BATCH_MAX_PARTS:
+        raise ValueError(f"한 번에 분석할 수 있는 부품 수를 초과했습니다 ({len(parts)}개, 최대 {BATCH_MAX_PARTS}개).")
+    part_ids = [part.part_id for part in parts]
+    duplicates = sorted({part_id for part_id in part_ids if part_ids.count(part_id) > 1})
+    if duplicates:
+        raise ValueError(f"부품 ID가 중복되었습니다: {duplicates}")
+
+    logger.info(f"배치 업로드를 부품 {len(parts)}개로 나눴습니다.")
+    return parts
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .config import Config, CACHE_DIR, CACHE_MAX_BYTES
+from .plots import PLOT_SPECS_FILE
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_FILE = 'result.json'
+
+
+def make_cache_key(file_hash: str, config: Config) -> str:
+    """업로드 파일 해시와 분석 결과에 영향을 주는 설정 값으로 캐시 키를 만듭니다."""
+    params = {
+        'lifetime_column': config.lifetime_column,
+        'type_column': config.type_column,
+        'test_type_value': config.test_type_value,
+        'field_type_value': config.field_type_value,
+        'confidence_level': config.confidence_level,
+        'include_plots': config.include_plots,
+    }
+    payload = file_hash + json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    run_analysis 결과(분석 요약, 보고서, 플롯 사양)를 디스크에 저장하는 LRU 캐시
+
+    항목은 `{root}/{key}/`에 저장되며, 조회될 때마다 수정 시각을 갱신하여
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, results_dir: Path) -> Optional[dict]:
+        """
+        캐시된 결과 파일을 results_dir로 복사하고 run_analysis와 같은 형식의 결과를 반환합니다.
+        캐시에 없으면 None을 반환합니다.
+        """
+        entry_dir = self.root / key
+        try:
+            with open(entry_dir / _ENTRY_FILE, encoding='utf-8') as f:
+                entry = json.load(f)
+            results_dir = Path(results_dir)
+            # 플롯 이미지는 캐시하지 않고, 플롯 사양만 복사해 두었다가 처음 요청될 때 그립니다.
+            for name in [entry['report'], PLOT_SPECS_FILE]:
+                shutil.copy2(entry_dir / name, results_dir / name)
+            os.utime(entry_dir)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"분석 결과 캐시 적중: {key}")
+        return {
+            "report_path": str(results_dir / entry['report']),
+            "plot_paths": [str(results_dir / name) for name in entry['plots']],
+            "analysis_summary": entry['analysis_summary'],
+        }
+
+    def put(self, key: str, analysis_results: dict):
+        """run_analysis 결과와 결과 파일을 캐시에 저장합니다."""
+        entry_dir = self.root / key
+        if entry_dir.exists():
+            return
+
+        # 다른 프로세스와 동시에 저장하더라도 불완전한 항목이 보이지 않도록 임시 디렉토리에 쓴 뒤 이름을 바꿉니다.
+        tmp_dir = self.root / f'.tmp-{uuid.uuid4().hex}'
+        try:
+            tmp_dir.mkdir(parents=True)
+            report_path = Path(analysis_results['report_path'])
+            plot_paths = [Path(p) for p in analysis_results['plot_paths']]
+            for path in [report_path, report_path.with_name(PLOT_SPECS_FILE)]:
+                shutil.copy2(path, tmp_dir / path.name)
+            entry = {
+                'report': report_path.name,
+                'plots': [p.name for p in plot_paths],
+                'analysis_summary': analysis_results['analysis_summary'],
+            }
+            with open(tmp_dir / _ENTRY_FILE, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_dir, entry_dir)
+            logger.info(f"분석 결과를 캐시에 저장했습니다: {key}")
+        except OSError as e:
+            logger.warning(f"분석 결과 캐시 저장 실패: {key} - {e}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._evict()
+
+    def _entries(self):
+        """(마지막 사용 시각, 크기, 경로) 목록을 반환합니다."""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.iterdir():
+            if not path.is_dir() or path.name.startswith('.tmp-'):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in path.iterdir())
+                entries.append((path.stat().st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logger.info(f"캐시 용량 초과로 항목을 삭제했습니다: {path.name}")
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'entries': len(entries),
+            'size_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+result_cache = ResultCache()
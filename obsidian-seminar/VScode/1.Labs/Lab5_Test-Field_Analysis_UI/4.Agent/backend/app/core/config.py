@@ -1,21 +1,69 @@
+import importlib.util
 import logging
+import os
 from pathlib import Path
+from typing import Optional
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# --- 작업 큐(Job Queue) 설정 ---
+# 분석 파이프라인을 실행할 프로세스 풀의 최대 워커 수와, 동시에 대기/실행할 수 있는 최대 작업 수입니다.
+# 환경 변수로 재정의할 수 있습니다.
+ANALYSIS_MAX_WORKERS = int(os.getenv('ANALYSIS_MAX_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+ANALYSIS_MAX_PENDING_JOBS = int(os.getenv('ANALYSIS_MAX_PENDING_JOBS', 64))
+
+# --- 작업 공간(Workspace) 설정 ---
+# 분석 작업마다 `{WORKSPACES_DIR}/{job_id}/` 아래에 업로드 파일과 결과물을 저장하고,
+# 생성 후 WORKSPACE_TTL_SECONDS가 지난 작업 공간은 WORKSPACE_GC_INTERVAL_SECONDS 주기로 삭제합니다.
+WORKSPACES_DIR = Path(os.getenv('WORKSPACES_DIR', 'workspaces'))
+WORKSPACE_TTL_SECONDS = int(os.getenv('WORKSPACE_TTL_SECONDS', 24 * 60 * 60))
+WORKSPACE_GC_INTERVAL_SECONDS = int(os.getenv('WORKSPACE_GC_INTERVAL_SECONDS', 10 * 60))
+
+# --- 분석 결과 캐시 설정 ---
+# 같은 파일을 같은 설정으로 다시 분석하면 CACHE_DIR에 저장된 결과를 재사용합니다.
+# 캐시 전체 크기가 CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+CACHE_DIR = Path(os.getenv('CACHE_DIR', 'cache'))
+CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# --- 업로드 설정 ---
+# UPLOAD_MAX_BYTES를 넘는 업로드는 거부합니다. UPLOAD_IN_MEMORY_MAX_BYTES 이하의 파일은 디스크에 저장하지 않고
+# 메모리에서 바로 파싱하며, 그보다 큰 파일만 작업 공간에 저장합니다.
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 50 * 1024 * 1024))
+UPLOAD_IN_MEMORY_MAX_BYTES = int(os.getenv('UPLOAD_IN_MEMORY_MAX_BYTES', 8 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# --- 데이터 로드 설정 ---
+# CSV 파싱 엔진입니다. pyarrow가 설치되어 있으면 멀티스레드 pyarrow 엔진을, 없으면 pandas 기본 C 엔진을 사용합니다.
+CSV_ENGINE = os.getenv('CSV_ENGINE', 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c')
+# Excel 파일을 처음 읽을 때 변환해 두는 Parquet 사이드카 파일의 저장 위치입니다. (같은 파일을 다시 읽을 때 재사용)
+# 생성 후 WORKSPACE_TTL_SECONDS가 지난 사이드카는 작업 공간 정리 주기마다 삭제합니다.
+EXCEL_CACHE_DIR = Path(os.getenv('EXCEL_CACHE_DIR', 'excel_cache'))
+
+# --- 배치 분석 설정 ---
+# /analyze/batch 요청 하나에서 분석할 수 있는 최대 부품 수입니다.
+BATCH_MAX_PARTS = int(os.getenv('BATCH_MAX_PARTS', 100))
+
 class Config:
     def __init__(self, data_path: str, lifetime_column: str, type_column: str,
                  test_type_value: str = 'test', field_type_value: str = 'field',
                  confidence_level: float = 0.95,
-                 results_dir: str = 'results'):
+                 results_dir: str = 'results',
+                 include_plots: bool = True,
+                 data: Optional[bytes] = None,
+                 csv_engine: str = CSV_ENGINE):
         
         self.data_path = Path(data_path)
+        # data가 주어지면 data_path 파일을 읽지 않고 메모리의 내용을 파싱합니다. (data_path는 파일 형식 판단에만 사용)
+        self.data = data
+        self.csv_engine = csv_engine
         self.lifetime_column = lifetime_column
         self.type_column = type_column
         self.test_type_value = test_type_value
         self.field_type_value = field_type_value
         self.confidence_level = confidence_level
+        # False이면 플롯 사양을 만들지 않고 분석 요약과 보고서만 생성합니다.
+        self.include_plots = include_plots
 
         self.results_path = Path(results_dir)
         self.results_path.mkdir(parents=True, exist_ok=True)
@@ -28,7 +76,7 @@ class Config:
         self.validate()
 
     def validate(self):
-        if not self.data_path.exists():
+        if self.data is None and not self.data_path.exists():
             raise FileNotFoundError(f"데이터 파일을 찾을 수 없습니다: {self.data_path}")
         if not (0 < self.confidence_level < 1):
             raise ValueError(f"신뢰수준은 0과 1 사이의 값이어야 합니다: {self.confidence_level}")
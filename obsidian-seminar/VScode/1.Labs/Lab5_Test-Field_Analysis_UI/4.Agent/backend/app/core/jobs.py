@@ -0,0 +1,165 @@
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .analysis import run_analysis
+from .cache import result_cache
+from .config import Config, ANALYSIS_MAX_WORKERS, ANALYSIS_MAX_PENDING_JOBS
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태 값
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+
+class JobQueueFullError(RuntimeError):
+    """대기 중인 작업 수가 허용 한도를 초과했을 때 발생하는 예외"""
+
+
+def _run_job(job_id: str, config: Config, progress, cache_key: Optional[str] = None) -> dict:
+    """
+    워커 프로세스에서 실행되는 진입점입니다.
+    진행 단계는 프로세스 간에 공유되는 progress 딕셔너리에 기록되며,
+    cache_key가 주어지면 분석 결과를 결과 캐시에 저장합니다.
+    """
+    def report_stage(stage: str):
+        progress[job_id] = stage
+
+    analysis_results = run_analysis(config, progress_callback=report_stage)
+    if cache_key:
+        result_cache.put(cache_key, analysis_results)
+    return analysis_results
+
+
+class JobManager:
+    """
+    분석 작업을 프로세스 풀에 제출하고 상태를 추적하는 클래스
+
+    matplotlib과 reliability는 스레드 환경에서 안전하지 않으므로 ThreadPool 대신 ProcessPool을 사용합니다.
+    """
+    def __init__(self, max_workers: int = ANALYSIS_MAX_WORKERS, max_pending: int = ANALYSIS_MAX_PENDING_JOBS):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress = None
+        self._jobs: Dict[str, dict] = {}
+        # 배치 ID -> [(부품 ID, 작업 ID), ...]
+        self._batches: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._executor is not None:
+            return
+        self._manager = multiprocessing.Manager()
+        self._progress = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        logger.info(f"작업 큐 시작 (워커 수: {self.max_workers}, 최대 대기 작업 수: {self.max_pending})")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._progress = None
+        logger.info("작업 큐를 종료했습니다.")
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job['status'] in (JOB_QUEUED, JOB_RUNNING))
+
+    def submit(self, config: Config, job_id: Optional[str] = None, cache_key: Optional[str] = None) -> str:
+        """분석 작업을 제출하고 작업 ID를 즉시 반환합니다. job_id를 생략하면 새로 생성합니다."""
+        job_id = job_id or uuid.uuid4().hex
+        self.submit_many([(config, job_id, cache_key)])
+        return job_id
+
+    def submit_many(self, submissions: List[Tuple[Config, str, Optional[str]]]):
+        """
+        (설정, 작업 ID, 캐시 키) 목록을 한 번에 제출합니다.
+        대기 작업 한도를 넘으면 어떤 작업도 제출하지 않고 JobQueueFullError를 발생시킵니다.
+        """
+        self.start()
+        with self._lock:
+            if self._pending_count() + len(submissions) > self.max_pending:
+                raise JobQueueFullError(f"대기 중인 분석 작업이 너무 많습니다 (최대 {self.max_pending}개).")
+            for _, job_id, _ in submissions:
+                self._jobs[job_id] = {'status': JOB_QUEUED, 'stage': None, 'result': None, 'error': None}
+
+        for config, job_id, cache_key in submissions:
+            future = self._executor.submit(_run_job, job_id, config, self._progress, cache_key)
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+            logger.info(f"분석 작업 제출: {job_id}")
+
+    def record_completed(self, job_id: str, analysis_results: dict):
+        """캐시 적중 등으로 실행 없이 얻은 결과를 완료된 작업으로 등록합니다."""
+        with self._lock:
+            self._jobs[job_id] = {'status': JOB_COMPLETED, 'stage': None, 'result': analysis_results, 'error': None}
+
+    def _on_done(self, job_id: str, future: Future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            try:
+                job['result'] = future.result()
+                job['status'] = JOB_COMPLETED
+                logger.info(f"분석 작업 완료: {job_id}")
+            except Exception as e:
+                job['error'] = str(e)
+                job['status'] = JOB_FAILED
+                logger.error(f"분석 작업 실패: {job_id} - {e}")
+            try:
+                if self._progress is not None:
+                    job['stage'] = self._progress.pop(job_id, job['stage'])
+            except (OSError, EOFError):
+                # 서버 종료 중 공유 딕셔너리 관리 프로세스가 먼저 종료된 경우
+                pass
+
+    def active_job_ids(self) -> List[str]:
+        """대기 중이거나 실행 중인 작업의 ID 목록을 반환합니다."""
+        with self._lock:
+            return [job_id for job_id, job in self._jobs.items() if job['status'] in (JOB_QUEUED, JOB_RUNNING)]
+
+    def discard(self, job_ids: List[str]):
+        """작업 공간이 정리된 작업의 기록을 삭제합니다. 모든 작업이 삭제된 배치 기록도 함께 삭제합니다."""
+        with self._lock:
+            for job_id in job_ids:
+                self._jobs.pop(job_id, None)
+            for batch_id, parts in list(self._batches.items()):
+                if not any(job_id in self._jobs for _, job_id in parts):
+                    del self._batches[batch_id]
+
+    def register_batch(self, batch_id: str, parts: List[Tuple[str, str]]):
+        """배치에 속한 (부품 ID, 작업 ID) 목록을 등록합니다."""
+        with self._lock:
+            self._batches[batch_id] = list(parts)
+
+    def get_batch(self, batch_id: str) -> Optional[List[Tuple[str, str]]]:
+        """배치의 (부품 ID, 작업 ID) 목록을 반환합니다. 없는 배치이면 None을 반환합니다."""
+        with self._lock:
+            parts = self._batches.get(batch_id)
+            return list(parts) if parts is not None else None
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """작업의 현재 상태(status, stage, result, error)를 반환합니다. 없는 작업이면 None을 반환합니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+        if job['status'] == JOB_QUEUED and self._progress is not None:
+            stage = self._progress.get(job_id)
+            if stage is not None:
+                job['status'], job['stage'] = JOB_RUNNING, stage
+        return job
+
+
+job_manager = JobManager()
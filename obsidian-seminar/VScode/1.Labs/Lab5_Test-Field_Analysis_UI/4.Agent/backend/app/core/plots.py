@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from reliability.Probability_plotting import plotting_positions
+from reliability.Utils import axes_transforms
+
+logger = logging.getLogger(__name__)
+
+# 결과 디렉토리에 저장되는 플롯 사양 파일 (파일 이름 -> 플롯을 그리는 데 필요한 값)
+PLOT_SPECS_FILE = 'plot_specs.json'
+
+# 분포별 확률도 축 (x축 스케일, y축 변환 함수, y축 역변환 함수) - reliability 확률도와 동일한 축을 사용합니다.
+_PROBABILITY_AXES = {
+    'Weibull_2P': ('log', axes_transforms.weibull_forward, axes_transforms.weibull_inverse),
+    'Exponential_1P': ('log', axes_transforms.weibull_forward, axes_transforms.weibull_inverse),
+    'Lognormal_2P': ('log', axes_transforms.normal_forward, axes_transforms.normal_inverse),
+    'Normal_2P': ('linear', axes_transforms.normal_forward, axes_transforms.normal_inverse),
+}
+_PROBABILITY_TICKS = [0.001, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9, 0.95, 0.99, 0.999]
+_CURVE_POINTS = 200
+
+
+def _to_list(values) -> List[Optional[float]]:
+    """NumPy 배열을 JSON으로 저장할 수 있도록 리스트로 변환합니다. (NaN/inf는 None)"""
+    return [float(v) if np.isfinite(v) else None for v in np.asarray(values, dtype=float)]
+
+
+def _to_array(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def probability_plot_spec(fit, failures, title: str) -> dict:
+    """
+    적합 결과(fit)로 확률도를 그리는 데 필요한 값(플로팅 위치, 적합 CDF 곡선, 시간 기준 신뢰구간)을 계산합니다.
+    반환값은 JSON으로 저장할 수 있으며, 렌더링할 때 다시 적합하지 않습니다.
+    """
+    dist_name = fit.distribution.name2
+    _, forward, inverse = _PROBABILITY_AXES[dist_name]
+    x, y = plotting_positions(failures=failures)
+
+    F_min = min(0.01, y.min() / 2)
+    F_max = max(0.99, 1 - (1 - y.max()) / 2)
+    F = inverse(np.linspace(forward(F_min), forward(F_max), _CURVE_POINTS))
+    try:
+        time_lower, time, time_upper = fit.distribution.CDF(CI_y=F, show_plot=False)
+    except Exception as e:
+        logger.warning(f"확률도 신뢰구간 계산 실패: {e}")
+        time = fit.distribution.quantile(F)
+        time_lower = time_upper = np.full_like(F, np.nan)
+
+    return {
+        'type': 'probability',
+        'distribution': dist_name,
+        'title': title,
+        'label': f"Fitted {fit.distribution.param_title_long}",
+        'points': {'x': _to_list(x), 'y': _to_list(y)},
+        'F': _to_list(F),
+        'time': _to_list(time),
+        'time_lower': _to_list(time_lower),
+        'time_upper': _to_list(time_upper),
+    }
+
+
+def shape_comparison_spec(shape_name: str, intervals: Dict[str, tuple], title: str) -> dict:
+    """데이터셋별 형상모수 (추정치, 하한, 상한)으로 신뢰구간 비교 플롯 사양을 만듭니다."""
+    return {
+        'type': 'shape_comparison',
+        'shape_name': shape_name,
+        'title': title,
+        'intervals': {label: [float(v) for v in interval] for label, interval in intervals.items()},
+    }
+
+
+def _draw_probability_plot(fig: Figure, spec: dict):
+    ax = fig.add_subplot()
+    xscale, forward, inverse = _PROBABILITY_AXES[spec['distribution']]
+    F = _to_array(spec['F'])
+    x, y = _to_array(spec['points']['x']), _to_array(spec['points']['y'])
+
+    ax.set_xscale(xscale)
+    ax.set_yscale('function', functions=(forward, inverse))
+    ax.scatter(x, y, marker='.', linewidth=2, c='k')
+    line, = ax.plot(_to_array(spec['time']), F, label=spec['label'])
+    ax.fill_betweenx(F, _to_array(spec['time_lower']), _to_array(spec['time_upper']),
+                     color=line.get_color(), alpha=0.3, linewidth=0)
+
+    ax.set_ylim(F[0], F[-1])
+    ticks = [t for t in _PROBABILITY_TICKS if np.round(F[0], 9) <= t <= np.round(F[-1], 9)]
+    ax.set_yticks(ticks, [f'{t * 100:g}%' for t in ticks])
+    if xscale == 'log':
+        ax.set_xlim(x.min() / 2, x.max() * 2)
+    else:
+        margin = (x.max() - x.min()) * 0.3
+        ax.set_xlim(x.min() - margin, x.max() + margin)
+
+    ax.grid(visible=True, which='major', color='k', alpha=0.3, linestyle='-')
+    ax.grid(visible=True, which='minor', color='k', alpha=0.08, linestyle='-')
+    ax.set_title(spec['title'])
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Fraction failing')
+    ax.legend(loc='upper left')
+
+
+def _draw_shape_comparison(fig: Figure, spec: dict):
+    ax = fig.add_subplot()
+    labels = list(spec['intervals'])
+    for i, label in enumerate(labels, start=1):
+        est, lower, upper = spec['intervals'][label]
+        ax.errorbar(x=[i], y=[est], yerr=[[est - lower], [upper - est]], fmt='o', capsize=5, label=label)
+    ax.set_xticks(range(1, len(labels) + 1), labels)
+    ax.set_ylabel(f"Shape Parameter ({spec['shape_name']})")
+    ax.set_title(spec['title'])
+    ax.legend()
+    ax.grid(True, axis='y', linestyle='--')
+
+
+_DRAW_FUNCS = {
+    'probability': (_draw_probability_plot, (9, 9)),
+    'shape_comparison': (_draw_shape_comparison, (8, 6)),
+}
+
+
+def render_plot(spec: dict, path: Path):
+    """
+    pyplot 전역 상태를 사용하지 않고 Figure/Agg 캔버스로 플롯을 그려 저장합니다.
+    figure는 pyplot에 등록되지 않으므로 별도로 닫을 필요가 없고, 스레드에서 호출해도 안전합니다.
+    다른 요청이 같은 파일을 동시에 그리더라도 불완전한 파일이 보이지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+    """
+    draw_func, figsize = _DRAW_FUNCS[spec['type']]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw_func(fig, spec)
+
+    path = Path(path)
+    tmp_path = path.with_name(f'.tmp-{uuid.uuid4().hex}{path.suffix}')
+    try:
+        fig.savefig(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    logger.info(f"플롯을 '{path}'에 저장했습니다.")
+
+
+def save_plot_specs(results_dir: Path, specs: Dict[str, dict]) -> Path:
+    """플롯 사양을 결과 디렉토리에 저장합니다. 플롯 이미지는 처음 요청될 때 render_pending_plot으로 그립니다."""
+    specs_path = Path(results_dir) / PLOT_SPECS_FILE
+    with open(specs_path, 'w', encoding='utf-8') as f:
+        json.dump(specs, f, ensure_ascii=False)
+    return specs_path
+
+
+def render_pending_plot(results_dir: Path, filename: str) -> Optional[Path]:
+    """
+    아직 그려지지 않은 플롯을 저장된 사양으로 그려 경로를 반환합니다.
+    해당 파일의 플롯 사양이 없으면 None을 반환합니다.
+    """
+    try:
+        with open(Path(results_dir) / PLOT_SPECS_FILE, encoding='utf-8') as f:
+            spec = json.load(f).get(filename)
+    except (OSError, ValueError):
+        return None
+    if spec is None:
+        return None
+
+    path = Path(results_dir) / filename
+    render_plot(spec, path)
+    return path
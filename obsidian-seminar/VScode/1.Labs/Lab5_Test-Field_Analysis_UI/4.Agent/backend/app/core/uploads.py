@@ -0,0 +1,62 @@
+import hashlib
+import logging
+import shutil
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from .config import UPLOAD_MAX_BYTES, UPLOAD_IN_MEMORY_MAX_BYTES, UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLargeError(ValueError):
+    """업로드 파일 크기가 허용 한도를 초과했을 때 발생하는 예외"""
+
+
+class ReceivedUpload:
+    """
+    해시와 크기를 확인한 업로드 파일
+
+    업로드 본문은 Starlette가 이미 SpooledTemporaryFile로 받아 두므로, 그 버퍼를 그대로 사용합니다.
+    크기가 UPLOAD_IN_MEMORY_MAX_BYTES 이하이면 디스크에 저장하지 않고 바이트로 분석 작업에 전달하고,
+    그보다 크거나 실제로 분석을 실행해야 할 때만 save()로 작업 공간에 저장합니다.
+    """
+    def __init__(self, upload: UploadFile, sha256: str, size: int):
+        self.filename = upload.filename
+        self.sha256 = sha256
+        self.size = size
+        self._buffer = upload.file
+
+    @property
+    def fits_in_memory(self) -> bool:
+        return self.size <= UPLOAD_IN_MEMORY_MAX_BYTES
+
+    def read_bytes(self) -> bytes:
+        self._buffer.seek(0)
+        return self._buffer.read()
+
+    def save(self, path: Path) -> Path:
+        self._buffer.seek(0)
+        with Path(path).open('wb') as f:
+            shutil.copyfileobj(self._buffer, f, UPLOAD_CHUNK_SIZE)
+        return Path(path)
+
+
+async def receive_upload(upload: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> ReceivedUpload:
+    """
+    업로드 본문을 청크 단위로 읽으며 SHA-256 해시와 크기를 계산합니다.
+    max_bytes를 넘으면 UploadTooLargeError를 발생시킵니다.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLargeError(f"업로드 파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB).")
+        digest.update(chunk)
+
+    if size == 0:
+        raise ValueError("업로드된 파일이 비어 있습니다.")
+    logger.info(f"업로드 수신 완료: {upload.filename} ({size} bytes)")
+    return ReceivedUpload(upload, digest.hexdigest(), size)
@@ -0,0 +1,108 @@
+import logging
+import re
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class Workspace:
+    """
+    분석 작업 하나에 할당되는 독립된 작업 공간
+
+    업로드 파일, 플롯 이미지, 보고서를 `{root}/{job_id}/` 아래에 저장하므로
+    동시에 실행되는 분석끼리 서로의 결과 파일을 덮어쓰지 않습니다.
+    """
+    def __init__(self, root: Path, job_id: str):
+        self.job_id = job_id
+        self.path = Path(root) / job_id
+        self.uploads_dir = self.path / 'uploads'
+        self.results_dir = self.path / 'results'
+
+    @classmethod
+    def create(cls, root: Path) -> 'Workspace':
+        workspace = cls(root, uuid.uuid4().hex)
+        workspace.uploads_dir.mkdir(parents=True, exist_ok=True)
+        workspace.results_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"작업 공간 생성: {workspace.path}")
+        return workspace
+
+    def upload_path(self, filename: str) -> Path:
+        # 경로 조작(Path Traversal)을 막기 위해 파일 이름 부분만 사용합니다.
+        return self.uploads_dir / Path(filename).name
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def resolve_results_dir(root: Path, job_id: str) -> Optional[Path]:
+    """작업 공간의 결과 디렉토리 경로를 반환합니다. 잘못된 작업 ID이거나 디렉토리가 없으면 None을 반환합니다."""
+    if not _JOB_ID_PATTERN.match(job_id):
+        return None
+    results_dir = Workspace(root, job_id).results_dir
+    return results_dir if results_dir.is_dir() else None
+
+
+def resolve_result_file(root: Path, job_id: str, filename: str) -> Optional[Path]:
+    """작업 공간의 결과 파일 경로를 반환합니다. 잘못된 요청이거나 파일이 없으면 None을 반환합니다."""
+    results_dir = resolve_results_dir(root, job_id)
+    if results_dir is None or Path(filename).name != filename:
+        return None
+    file_path = results_dir / filename
+    return file_path if file_path.is_file() else None
+
+
+def cleanup_expired_workspaces(root: Path, ttl_seconds: float, keep: Iterable[str] = ()) -> List[str]:
+    """
+    생성 후 TTL이 지난 작업 공간을 삭제하고, 삭제된 작업 ID 목록을 반환합니다.
+    keep에 포함된 작업(예: 아직 실행 중인 작업)의 작업 공간은 삭제하지 않습니다.
+    """
+    root = Path(root)
+    keep = set(keep)
+    if not root.exists():
+        return []
+
+    expires_before = time.time() - ttl_seconds
+    removed = []
+    for path in root.iterdir():
+        if not path.is_dir() or not _JOB_ID_PATTERN.match(path.name) or path.name in keep:
+            continue
+        try:
+            if path.stat().st_mtime < expires_before:
+                shutil.rmtree(path)
+                removed.append(path.name)
+        except OSError as e:
+            logger.warning(f"작업 공간 삭제 실패: {path} - {e}")
+
+    if removed:
+        logger.info(f"만료된 작업 공간 {len(removed)}개를 삭제했습니다.")
+    return removed
+
+
+def cleanup_expired_files(root: Path, ttl_seconds: float) -> int:
+    """
+    root 바로 아래의 파일 중 마지막 수정 후 TTL이 지난 파일을 삭제하고, 삭제한 파일 수를 반환합니다.
+    (예: 업로드마다 하나씩 생기는 Excel Parquet 사이드카)
+    """
+    root = Path(root)
+    if not root.exists():
+        return 0
+
+    expires_before = time.time() - ttl_seconds
+    removed = 0
+    for path in root.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < expires_before:
+                path.unlink()
+                removed += 1
+        except OSError as e:
+            logger.warning(f"만료된 파일 삭제 실패: {path} - {e}")
+
+    if removed:
+        logger.info(f"{root}에서 만료된 파일 {removed}개를 삭제했습니다.")
+    return removed
@@ -1,15 +1,29 @@
+import asyncio
 import logging
-import shutil
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import List, Optional
 
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, status
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from starlette.requests import Request
 from fastapi.middleware.cors import CORSMiddleware  # CORS 미들웨어 임포트
 
-from .core.config import Config
-from .core.analysis import run_analysis
-from .models.schemas import AnalysisResult
+from .core.batch import split_batch_uploads
+from .core.cache import result_cache, make_cache_key
+from .core.config import (
+    Config, EXCEL_CACHE_DIR, UPLOAD_MAX_BYTES, WORKSPACES_DIR, WORKSPACE_TTL_SECONDS, WORKSPACE_GC_INTERVAL_SECONDS
+)
+from .core.jobs import job_manager, JobQueueFullError, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+from .core.plots import render_pending_plot
+from .core.uploads import receive_upload, UploadTooLargeError
+from .core.workspace import (
+    Workspace, resolve_results_dir, resolve_result_file, cleanup_expired_workspaces, cleanup_expired_files
+)
+from .models.schemas import (
+    AnalysisResult, JobSubmission, JobStatus, CacheStats, BatchPartStatus, BatchSubmission, BatchStatus
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,12 +32,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _collect_expired_workspaces():
+    """TTL이 지난 작업 공간과 해당 작업 기록, Excel Parquet 사이드카를 주기적으로 정리합니다."""
+    while True:
+        removed = await asyncio.to_thread(
+            cleanup_expired_workspaces, WORKSPACES_DIR, WORKSPACE_TTL_SECONDS, job_manager.active_job_ids()
+        )
+        job_manager.discard(removed)
+        # 사이드카는 업로드 내용마다 하나씩 생기므로 작업 공간과 같은 TTL로 삭제합니다.
+        await asyncio.to_thread(cleanup_expired_files, EXCEL_CACHE_DIR, WORKSPACE_TTL_SECONDS)
+        await asyncio.sleep(WORKSPACE_GC_INTERVAL_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 분석 작업을 처리할 프로세스 풀과 작업 공간 정리 작업을 서버 시작 시 준비하고, 종료 시 정리합니다.
+    job_manager.start()
+    gc_task = asyncio.create_task(_collect_expired_workspaces())
+    yield
+    gc_task.cancel()
+    job_manager.shutdown()
+
 app = FastAPI(
     title="Life Data Analysis Agent",
     description="브레이크 패드 내구-필드 수명 분석 및 가속계수 산출 AI 에이전트",
-    version="1.2.0"
+    version="1.5.0",
+    lifespan=lifespan
 )
 
+# --- 업로드 크기 제한 ---
+# multipart 본문을 받기 전에 Content-Length로 너무 큰 요청을 먼저 거부합니다. (폼 필드 여유분 1MB 포함)
+# CORS 응답 헤더가 붙도록 CORS 미들웨어보다 먼저 등록합니다.
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > UPLOAD_MAX_BYTES + 1024 * 1024:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"업로드 파일이 너무 큽니다 (최대 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB)."}
+        )
+    return await call_next(request)
+
 # --- CORS 미들웨어 설정 ---
 # React 개발 서버(localhost:3000)에서의 요청을 허용합니다.
 origins = [
@@ -40,20 +88,41 @@ app.add_middleware(
 # -------------------------
 
 
-UPLOADS_DIR = Path("uploads")
-UPLOADS_DIR.mkdir(exist_ok=True)
-RESULTS_DIR = Path("results")
-RESULTS_DIR.mkdir(exist_ok=True)
+WORKSPACES_DIR.mkdir(parents=True, exist_ok=True)
 
-@app.get("/results/{filename}", tags=["Results"])
-async def get_result_file(filename: str):
-    """결과 디렉토리에서 분석 결과 파일(이미지, 마크다운)을 제공합니다."""
-    file_path = RESULTS_DIR / filename
-    if not file_path.exists():
+@app.get("/results/{job_id}/{filename}", tags=["Results"])
+async def get_result_file(job_id: str, filename: str):
+    """
+    작업 공간에서 분석 결과 파일(이미지, 마크다운)을 제공합니다.
+    플롯 이미지는 분석 중에 그리지 않고, 처음 요청될 때 저장된 플롯 사양으로 그립니다.
+    """
+    file_path = resolve_result_file(WORKSPACES_DIR, job_id, filename)
+    if file_path is None:
+        results_dir = resolve_results_dir(WORKSPACES_DIR, job_id)
+        if results_dir is not None and Path(filename).name == filename:
+            file_path = await asyncio.to_thread(render_pending_plot, results_dir, filename)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="File not found")
     return FileResponse(file_path)
 
-@app.post("/analyze/", response_model=AnalysisResult, tags=["Analysis"])
+def _build_analysis_result(base_url: str, job_id: str, analysis_results: dict) -> AnalysisResult:
+    """run_analysis 결과(파일 경로)를 클라이언트가 접근할 수 있는 URL로 변환합니다."""
+    results_url = f"{base_url}results/{job_id}"
+    report_path = analysis_results.get("report_path")
+    report_url = f"{results_url}/{Path(report_path).name}" if report_path else None
+
+    plot_urls = []
+    for p_path in analysis_results.get("plot_paths", []):
+        plot_urls.append(f"{results_url}/{Path(p_path).name}")
+
+    return AnalysisResult(
+        message="분석이 성공적으로 완료되었습니다.",
+        report_url=report_url,
+        plot_urls=plot_urls,
+        analysis_summary=analysis_results.get("analysis_summary")
+    )
+
+@app.post("/analyze/", response_model=JobSubmission, status_code=status.HTTP_202_ACCEPTED, tags=["Analysis"])
 async def create_analysis(
     request: Request,
     file: UploadFile = File(..., description="분석할 Excel 또는 CSV 파일"),
@@ -61,18 +130,36 @@ async def create_analysis(
     type_column: str = Form('type', description="데이터 구분 컬럼명 ('test', 'field')"),
     test_type_value: str = Form('test', description="내구시험 데이터 구분 값"),
     field_type_value: str = Form('field', description="필드 데이터 구분 값"),
-    confidence_level: float = Form(0.95, description="신뢰수준 (0.0 ~ 1.0)")
+    confidence_level: float = Form(0.95, description="신뢰수준 (0.0 ~ 1.0)"),
+    include_plots: bool = Form(True, description="False이면 플롯 없이 분석 요약과 보고서만 생성")
 ):
+    """
+    분석 작업을 작업 큐에 제출하고 작업 ID를 즉시 반환합니다.
+    진행 상황과 최종 결과는 `GET /jobs/{job_id}`로 조회합니다.
+    """
     logger.info(f"파일 수신: {file.filename}")
-    
-    file_location = UPLOADS_DIR / file.filename
+
+    try:
+        upload = await receive_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # 작은 파일은 디스크에 저장하지 않고 메모리에서 바로 파싱하도록 내용을 작업에 전달하고, 큰 파일만 작업 공간에 저장합니다.
+    workspace = Workspace.create(WORKSPACES_DIR)
+    file_location = workspace.upload_path(file.filename)
+    data = None
     try:
-        with file_location.open("wb+") as file_object:
-            shutil.copyfileobj(file.file, file_object)
-    except Exception as e:
+        if upload.fits_in_memory:
+            data = upload.read_bytes()
+        else:
+            await asyncio.to_thread(upload.save, file_location)
+    except OSError as e:
+        workspace.remove()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"파일 저장 실패: {e}")
     finally:
-        file.file.close()
+        await file.close()
 
     try:
         config = Config(
@@ -82,28 +169,162 @@ async def create_analysis(
             test_type_value=test_type_value,
             field_type_value=field_type_value,
             confidence_level=confidence_level,
-            results_dir=str(RESULTS_DIR)
+            results_dir=str(workspace.results_dir),
+            include_plots=include_plots,
+            data=data
         )
+    except (FileNotFoundError, ValueError) as e:
+        workspace.remove()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-        analysis_results = run_analysis(config)
-
-        base_url = str(request.base_url)
-        report_path = analysis_results.get("report_path")
-        report_url = f"{base_url}results/{Path(report_path).name}" if report_path else None
-        
-        plot_urls = []
-        for p_path in analysis_results.get("plot_paths", []):
-            plot_urls.append(f"{base_url}results/{Path(p_path).name}")
-
-        return AnalysisResult(
-            message="분석이 성공적으로 완료되었습니다.",
-            report_url=report_url,
-            plot_urls=plot_urls,
-            analysis_summary=analysis_results.get("analysis_summary")
+    # 같은 파일을 같은 설정으로 분석한 결과가 캐시에 있으면 분석을 실행하지 않고 재사용합니다.
+    cache_key = make_cache_key(upload.sha256, config)
+    cached_results = result_cache.get(cache_key, workspace.results_dir)
+    if cached_results is not None:
+        job_manager.record_completed(workspace.job_id, cached_results)
+        return JobSubmission(
+            job_id=workspace.job_id,
+            status=JOB_COMPLETED,
+            status_url=f"{request.base_url}jobs/{workspace.job_id}"
         )
-    except Exception as e:
-        logger.error(f"분석 파이프라인 실행 중 오류 발생: {e}", exc_info=True)
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content=AnalysisResult(message="분석 중 오류가 발생했습니다.", error=str(e)).dict()
-        )
\ No newline at end of file
+
+    try:
+        job_id = job_manager.submit(config, job_id=workspace.job_id, cache_key=cache_key)
+    except JobQueueFullError as e:
+        workspace.remove()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return JobSubmission(
+        job_id=job_id,
+        status=JOB_QUEUED,
+        status_url=f"{request.base_url}jobs/{job_id}"
+    )
+
+@app.get("/jobs/{job_id}", response_model=JobStatus, tags=["Analysis"])
+async def get_job_status(request: Request, job_id: str):
+    """분석 작업의 상태, 진행 단계, (완료 시) 최종 분석 결과를 반환합니다."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    result = None
+    if job["status"] == JOB_COMPLETED:
+        result = _build_analysis_result(str(request.base_url), job_id, job["result"])
+    elif job["status"] == JOB_FAILED:
+        result = AnalysisResult(message="분석 중 오류가 발생했습니다.", error=job["error"])
+
+    return JobStatus(job_id=job_id, status=job["status"], stage=job["stage"], result=result)
+
+def _build_batch_part(base_url: str, part_id: str, job_id: str, job: Optional[dict]) -> BatchPartStatus:
+    """배치 통합 표의 한 행(부품별 최적 분포, 형상모수 검정 결과, 가속계수)을 만듭니다."""
+    if job is None:
+        return BatchPartStatus(part_id=part_id, job_id=job_id, status='expired')
+
+    part = BatchPartStatus(part_id=part_id, job_id=job_id, status=job["status"], error=job["error"])
+    if job["status"] == JOB_COMPLETED:
+        summary = job["result"].get("analysis_summary", {})
+        part.test_best_distribution = summary.get("test_best_distribution")
+        part.field_best_distribution = summary.get("field_best_distribution")
+        part.common_shape_plausible = summary.get("common_shape_plausible")
+        part.AF = summary.get("AF")
+        part.report_url = _build_analysis_result(base_url, job_id, job["result"]).report_url
+    return part
+
+@app.post("/analyze/batch", response_model=BatchSubmission, status_code=status.HTTP_202_ACCEPTED, tags=["Analysis"])
+async def create_batch_analysis(
+    request: Request,
+    files: List[UploadFile] = File(..., description="분석할 CSV/Excel 파일 여러 개, 또는 이 파일들을 묶은 zip 파일"),
+    part_column: str = Form('part_id', description="한 파일에 여러 부품이 있을 때 부품을 구분하는 컬럼명"),
+    lifetime_column: str = Form('distance(km)', description="수명 데이터 컬럼명"),
+    type_column: str = Form('type', description="데이터 구분 컬럼명 ('test', 'field')"),
+    test_type_value: str = Form('test', description="내구시험 데이터 구분 값"),
+    field_type_value: str = Form('field', description="필드 데이터 구분 값"),
+    confidence_level: float = Form(0.95, description="신뢰수준 (0.0 ~ 1.0)"),
+    include_plots: bool = Form(True, description="False이면 플롯 없이 분석 요약과 보고서만 생성")
+):
+    """
+    여러 부품의 데이터를 한 번에 받아 부품마다 분석 작업을 작업 큐에 제출하고 배치 ID를 즉시 반환합니다.
+    부품은 zip 안의 파일, 업로드된 각 파일, 또는 파일 안의 part_column 값으로 구분합니다.
+    부품별 결과를 모은 통합 표는 `GET /batches/{batch_id}`로 조회합니다.
+    """
+    uploads = []
+    try:
+        for file in files:
+            upload = await receive_upload(file)
+            uploads.append((file.filename, upload.read_bytes()))
+            await file.close()
+        parts = await asyncio.to_thread(split_batch_uploads, uploads, part_column, lifetime_column, type_column)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    base_url = str(request.base_url)
+    workspaces, part_jobs, submissions, cached_job_ids = [], [], [], []
+    try:
+        for part in parts:
+            workspace = Workspace.create(WORKSPACES_DIR)
+            workspaces.append(workspace)
+            config = Config(
+                data_path=str(workspace.upload_path(part.filename)),
+                lifetime_column=lifetime_column,
+                type_column=type_column,
+                test_type_value=test_type_value,
+                field_type_value=field_type_value,
+                confidence_level=confidence_level,
+                results_dir=str(workspace.results_dir),
+                include_plots=include_plots,
+                data=part.data
+            )
+            cache_key = make_cache_key(part.sha256, config)
+            cached_results = result_cache.get(cache_key, workspace.results_dir)
+            if cached_results is not None:
+                job_manager.record_completed(workspace.job_id, cached_results)
+                cached_job_ids.append(workspace.job_id)
+            else:
+                submissions.append((config, workspace.job_id, cache_key))
+            part_jobs.append((part.part_id, workspace.job_id))
+
+        # 모든 부품 작업을 한 번에 제출하여 작업 큐가 워커 수에 맞춰 병렬로 실행하도록 합니다.
+        job_manager.submit_many(submissions)
+    except (ValueError, JobQueueFullError) as e:
+        for workspace in workspaces:
+            workspace.remove()
+        job_manager.discard(cached_job_ids)
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE if isinstance(e, JobQueueFullError) else status.HTTP_400_BAD_REQUEST
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    batch_id = uuid.uuid4().hex
+    job_manager.register_batch(batch_id, part_jobs)
+    logger.info(f"배치 분석 제출: {batch_id} (부품 {len(part_jobs)}개, 캐시 적중 {len(cached_job_ids)}개)")
+    return BatchSubmission(
+        batch_id=batch_id,
+        status_url=f"{base_url}batches/{batch_id}",
+        parts=[_build_batch_part(base_url, part_id, job_id, job_manager.get(job_id)) for part_id, job_id in part_jobs]
+    )
+
+@app.get("/batches/{batch_id}", response_model=BatchStatus, tags=["Analysis"])
+async def get_batch_status(request: Request, batch_id: str):
+    """배치 분석의 진행 상황과 부품별 결과 통합 표를 반환합니다."""
+    part_jobs = job_manager.get_batch(batch_id)
+    if part_jobs is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    base_url = str(request.base_url)
+    parts = [_build_batch_part(base_url, part_id, job_id, job_manager.get(job_id)) for part_id, job_id in part_jobs]
+    completed = sum(1 for part in parts if part.status == JOB_COMPLETED)
+    failed = sum(1 for part in parts if part.status == JOB_FAILED)
+    finished = all(part.status not in (JOB_QUEUED, JOB_RUNNING) for part in parts)
+    return BatchStatus(
+        batch_id=batch_id,
+        status=JOB_COMPLETED if finished else JOB_RUNNING,
+        completed=completed,
+        failed=failed,
+        total=len(parts),
+        parts=parts
+    )
+
+@app.get("/cache/stats", response_model=CacheStats, tags=["Cache"])
+async def get_cache_stats():
+    """분석 결과 캐시의 적중/미스 횟수와 현재 사용량을 반환합니다."""
+    return CacheStats(**result_cache.stats())
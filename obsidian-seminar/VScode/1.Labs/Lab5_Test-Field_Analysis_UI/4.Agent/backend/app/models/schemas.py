@@ -14,3 +14,45 @@ class AnalysisResult(BaseModel):
     plot_urls: Optional[List[str]] = None
     analysis_summary: Optional[Dict] = None
     error: Optional[str] = None
+
+class JobSubmission(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str  # 'queued', 'running', 'completed', 'failed'
+    stage: Optional[str] = None  # 'fit', 'shape_compare', 'acceleration_factor', 'report'
+    result: Optional[AnalysisResult] = None
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+class BatchPartStatus(BaseModel):
+    part_id: str
+    job_id: str
+    status: str
+    test_best_distribution: Optional[str] = None
+    field_best_distribution: Optional[str] = None
+    common_shape_plausible: Optional[bool] = None
+    AF: Optional[float] = None
+    report_url: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchSubmission(BaseModel):
+    batch_id: str
+    status_url: str
+    parts: List[BatchPartStatus]
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    status: str  # 'running', 'completed'
+    completed: int
+    failed: int
+    total: int
+    parts: List[BatchPartStatus]  # 부품별 최적 분포, 형상모수 검정 결과, 가속계수 통합 표
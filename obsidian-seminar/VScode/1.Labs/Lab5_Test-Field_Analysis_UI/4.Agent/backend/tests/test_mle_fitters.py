@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+import reliability.Fitters as reliability_fitters
+
+from app.core.mle_fitters import FITTERS, _SPECS, fit_distribution, fit_groups
+
+CENSOR_TIME = 120.0
+
+DISTRIBUTIONS = list(FITTERS)
+
+
+@pytest.fixture
+def uncensored_sample():
+    """시드를 고정한 Weibull(alpha=100, beta=1.8) 고장 데이터 30개를 생성한다."""
+    rng = np.random.default_rng(0)
+    return rng.weibull(1.8, 30) * 100, None
+
+
+@pytest.fixture
+def censored_sample():
+    """같은 데이터를 CENSOR_TIME에서 정시 중단한 (고장, 우측 관측중단) 데이터를 생성한다."""
+    rng = np.random.default_rng(0)
+    times = rng.weibull(1.8, 30) * 100
+    failures = times[times < CENSOR_TIME]
+    right_censored = np.full((times >= CENSOR_TIME).sum(), CENSOR_TIME)
+    return failures, right_censored
+
+
+def reliability_fit(dist_name, failures, right_censored):
+    fitter = getattr(reliability_fitters, f"Fit_{dist_name}")
+    return fitter(failures=failures, right_censored=right_censored, show_probability_plot=False, print_results=False)
+
+
+def assert_matches_reliability(dist_name, failures, right_censored):
+    fit = fit_distribution(dist_name, failures, right_censored)
+    expected = reliability_fit(dist_name, failures, right_censored)
+    names = _SPECS[dist_name]['params']
+    for name in names:
+        for suffix in ('', '_SE', '_lower', '_upper'):
+            attr = f"{name}{suffix}"
+            assert getattr(fit, attr) == pytest.approx(getattr(expected, attr), rel=1e-5), attr
+    if len(names) == 2:
+        attr = f"Cov_{names[0]}_{names[1]}"
+        assert getattr(fit, attr) == pytest.approx(getattr(expected, attr), rel=1e-4, abs=1e-10), attr
+    assert fit.loglik == pytest.approx(expected.loglik, rel=1e-9)
+    assert fit.AICc == pytest.approx(expected.AICc, rel=1e-9)
+    assert fit.BIC == pytest.approx(expected.BIC, rel=1e-9)
+
+
+class TestAgainstReliability:
+    """mle_fitters 적합 결과를 reliability Fit_* 결과와 비교한다."""
+
+    @pytest.mark.parametrize("dist_name", ['Weibull_2P', 'Lognormal_2P', 'Normal_2P'])
+    def test_uncensored(self, dist_name, uncensored_sample):
+        assert_matches_reliability(dist_name, *uncensored_sample)
+
+    def test_uncensored_exponential(self, uncensored_sample):
+        """
+        관측중단이 없는 Exponential_1P는 닫힌 형태(고장 수 / 총 시간)와 같은지 확인한다.
+        이 표본에서는 reliability의 L-BFGS-B가 최적점 전에 멈추므로, 로그우도가 reliability보다 작지 않은지도 확인한다.
+        """
+        failures, _ = uncensored_sample
+        fit = fit_distribution('Exponential_1P', failures)
+        expected = reliability_fit('Exponential_1P', failures, None)
+        assert fit.Lambda == pytest.approx(len(failures) / failures.sum(), rel=1e-12)
+        assert fit.Lambda_SE == pytest.approx(fit.Lambda / np.sqrt(len(failures)), rel=1e-9)
+        assert fit.loglik >= expected.loglik
+        assert fit.BIC <= expected.BIC
+
+    @pytest.mark.parametrize("dist_name", DISTRIBUTIONS)
+    def test_right_censored(self, dist_name, censored_sample):
+        assert_matches_reliability(dist_name, *censored_sample)
+
+    @pytest.mark.parametrize("dist_name", DISTRIBUTIONS)
+    def test_quantile_bounds(self, dist_name, censored_sample):
+        """B10 수명의 점추정치와 신뢰구간이 reliability 분포 객체의 값과 같은지 확인한다."""
+        failures, right_censored = censored_sample
+        lower, point, upper = fit_distribution(dist_name, failures, right_censored).quantile(0.1, bounds=True)
+        expected = reliability_fit(dist_name, failures, right_censored).distribution.CDF(
+            CI_y=0.1, show_plot=False, CI=0.95)
+        if dist_name == 'Exponential_1P':
+            expected_lower, expected_point, expected_upper = expected[0], expected[1], expected[2]
+        else:
+            expected_lower, expected_point, expected_upper = expected
+        assert point == pytest.approx(float(np.squeeze(expected_point)), rel=1e-5)
+        assert lower == pytest.approx(float(np.squeeze(expected_lower)), rel=1e-4)
+        assert upper == pytest.approx(float(np.squeeze(expected_upper)), rel=1e-4)
+
+
+class TestFitGroups:
+    """fit_groups() 벡터화 적합 테스트."""
+
+    def test_matches_individual_fits(self, uncensored_sample, censored_sample):
+        groups = {
+            'uncensored': {'failures': uncensored_sample[0], 'right_censored': []},
+            'censored': {'failures': censored_sample[0], 'right_censored': censored_sample[1]},
+        }
+        results = fit_groups(groups, DISTRIBUTIONS)
+        for group, data in groups.items():
+            for dist_name in DISTRIBUTIONS:
+                fit = fit_distribution(dist_name, data['failures'], data['right_censored'])
+                assert results[group][dist_name].BIC == pytest.approx(fit.BIC, rel=1e-9)
+                for name in _SPECS[dist_name]['params']:
+                    assert getattr(results[group][dist_name], name) == pytest.approx(getattr(fit, name), rel=1e-9)
+
+
+class TestDegenerateData:
+    """고장 시간이 모두 같은 데이터처럼 모수가 발산하는 경우를 확인한다."""
+
+    @pytest.mark.parametrize("dist_name", ['Weibull_2P', 'Lognormal_2P', 'Normal_2P'])
+    def test_identical_failures_raise(self, dist_name):
+        """reliability와 같이 inf / NaN BIC를 반환하지 않고 에러가 발생한다."""
+        with pytest.raises(ValueError):
+            reliability_fit(dist_name, [50.0] * 5, None)
+        with pytest.raises(ValueError):
+            fit_distribution(dist_name, [50.0] * 5)
+
+    def test_identical_failures_exponential(self):
+        """모수가 하나인 Exponential_1P는 같은 값만으로도 적합할 수 있다."""
+        fit = fit_distribution('Exponential_1P', [50.0] * 5)
+        expected = reliability_fit('Exponential_1P', [50.0] * 5, None)
+        assert fit.Lambda == pytest.approx(expected.Lambda)
+        assert np.isfinite(fit.BIC)
+        assert fit.BIC == pytest.approx(expected.BIC)
+
+    def test_fit_groups_excludes_degenerate_group(self, uncensored_sample):
+        """적합할 수 없는 그룹은 inf / NaN BIC 없이 결과에서 제외된다."""
+        groups = {
+            'normal': {'failures': uncensored_sample[0]},
+            'identical': {'failures': [50.0] * 5, 'right_censored': [60.0]},
+        }
+        results = fit_groups(groups, DISTRIBUTIONS)
+        assert set(results['normal']) == set(DISTRIBUTIONS)
+        assert set(results['identical']) == {'Exponential_1P'}
+        for fits in results.values():
+            assert all(np.isfinite(fit.BIC) for fit in fits.values())
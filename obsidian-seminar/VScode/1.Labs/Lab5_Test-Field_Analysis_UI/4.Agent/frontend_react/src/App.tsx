@@ -3,15 +3,28 @@ import axios from 'axios';
 import FileUpload from './components/FileUpload';
 import AnalysisForm from './components/AnalysisForm';
 import ResultsDisplay from './components/ResultsDisplay';
-import { AnalysisResult } from './types';
+import { AnalysisResult, JobStatus, JobSubmission } from './types';
 import './App.css';
 
+const POLL_INTERVAL_MS = 1000;
+
+// 작업 진행 단계별 표시 문구
+const STAGE_LABELS: { [stage: string]: string } = {
+  fit: '수명 분포 적합 중...',
+  shape_compare: '공통 형상모수 검정 중...',
+  acceleration_factor: '가속계수 계산 중...',
+  report: '보고서 생성 중...',
+};
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
 const App: React.FC = () => {
   const [file, setFile] = useState<File | null>(null);
   const [lifetimeColumn, setLifetimeColumn] = useState('distance(km)');
   const [typeColumn, setTypeColumn] = useState('type');
   const [results, setResults] = useState<AnalysisResult | null>(null);
   const [loading, setLoading] = useState(false);
+  const [stage, setStage] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   const handleSubmit = async () => {
@@ -30,20 +43,35 @@ const App: React.FC = () => {
     formData.append('type_column', typeColumn);
 
     try {
-      const response = await axios.post<AnalysisResult>('http://127.0.0.1:8000/analyze/', formData, {
+      const response = await axios.post<JobSubmission>('http://127.0.0.1:8000/analyze/', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
-      setResults(response.data);
+
+      // 분석은 백엔드 작업 큐에서 실행되므로, 완료될 때까지 작업 상태를 주기적으로 조회합니다.
+      let job: JobStatus;
+      while (true) {
+        job = (await axios.get<JobStatus>(response.data.status_url)).data;
+        if (job.status === 'completed' || job.status === 'failed') break;
+        setStage(job.stage ?? null);
+        await sleep(POLL_INTERVAL_MS);
+      }
+
+      if (job.status === 'completed') {
+        setResults(job.result ?? null);
+      } else {
+        setError(`분석 실패: ${job.result?.error}`);
+      }
     } catch (err: any) {
       if (axios.isAxiosError(err) && err.response) {
-        setError(`분석 실패: ${err.response.data.error || err.message}`);
+        setError(`분석 실패: ${err.response.data.error || err.response.data.detail || err.message}`);
       } else {
         setError(`알 수 없는 오류 발생: ${err.message}`);
       }
     } finally {
       setLoading(false);
+      setStage(null);
     }
   };
 
@@ -64,7 +92,7 @@ const App: React.FC = () => {
           <div className="card">
             <h3>3. 분석 실행</h3>
             <button onClick={handleSubmit} disabled={loading}>
-              {loading ? '분석 중...' : '분석 실행'}
+              {loading ? (stage && STAGE_LABELS[stage]) || '분석 중...' : '분석 실행'}
             </button>
           </div>
         </div>
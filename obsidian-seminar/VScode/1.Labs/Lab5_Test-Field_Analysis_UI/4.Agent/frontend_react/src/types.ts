@@ -5,3 +5,16 @@ export interface AnalysisResult {
   analysis_summary?: { [key: string]: any };
   error?: string;
 }
+
+export interface JobSubmission {
+  job_id: string;
+  status: string;
+  status_url: string;
+}
+
+export interface JobStatus {
+  job_id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  stage?: string;
+  result?: AnalysisResult;
+}
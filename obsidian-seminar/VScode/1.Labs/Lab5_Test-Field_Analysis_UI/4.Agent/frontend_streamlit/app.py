@@ -1,8 +1,29 @@
+import time
+
 import streamlit as st
 import requests
 
 # 백엔드 API 주소
 BACKEND_URL = "http://127.0.0.1:8000/analyze/"
+POLL_INTERVAL_SEC = 1.0
+
+# 작업 진행 단계별 표시 문구
+STAGE_LABELS = {
+    'fit': "수명 분포 적합 중...",
+    'shape_compare': "공통 형상모수 검정 중...",
+    'acceleration_factor': "가속계수 계산 중...",
+    'report': "보고서 생성 중...",
+}
+
+
+def wait_for_job(status_url, status_placeholder):
+    """작업이 완료(또는 실패)될 때까지 작업 상태를 주기적으로 조회합니다."""
+    while True:
+        job = requests.get(status_url).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        status_placeholder.info(STAGE_LABELS.get(job.get("stage"), "작업 대기 중..."))
+        time.sleep(POLL_INTERVAL_SEC)
 
 st.set_page_config(layout="wide")
 
@@ -34,9 +55,15 @@ if run_button:
                 data = {'lifetime_column': lifetime_col, 'type_column': type_col}
                 response = requests.post(BACKEND_URL, files=files, data=data)
 
-                if response.status_code == 200:
+                job = None
+                if response.status_code == 202:
+                    status_placeholder = st.empty()
+                    job = wait_for_job(response.json()["status_url"], status_placeholder)
+                    status_placeholder.empty()
+                    results = job["result"]
+
+                if job and job["status"] == "completed":
                     st.success("분석이 성공적으로 완료되었습니다!")
-                    results = response.json()
 
                     st.header("종합 분석 보고서")
                     report_url = results.get("report_url")
@@ -61,6 +88,9 @@ if run_button:
                     with st.expander("백엔드 원본 응답 보기 (JSON)"):
                         st.json(results)
 
+                elif job:
+                    st.error(f"분석에 실패했습니다: {results.get('error')}")
+                    st.json(results)
                 else:
                     st.error(f"분석에 실패했습니다. (상태 코드: {response.status_code})")
                     st.json(response.json())
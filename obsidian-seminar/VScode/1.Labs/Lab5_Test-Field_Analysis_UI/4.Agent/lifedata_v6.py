@@ -1,6 +1,7 @@
 import reliability.Fitters as Fitters
 import reliability.Reliability_testing as Reliability_testing
 import reliability.Distributions as Distributions
+import reliability.Probability_plotting as Probability_plotting
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -8,6 +9,8 @@ import os
 import logging
 import sys
 
+from excel_cache import read_excel_cached
+
 # ==================================================================================================
 # 0. 분석 환경설정 (Configuration)
 # ==================================================================================================
@@ -19,6 +22,16 @@ class Config:
     FIELD_TYPE_VALUE = 'field'
     INTERACTIVE_MODE = False
     CONFIDENCE_INTERVAL = 0.95
+    CANDIDATE_DISTRIBUTIONS = ['Weibull_2P', 'Lognormal_2P', 'Normal_2P', 'Exponential_1P']
+    SAVE_PROBABILITY_PLOTS = True  # False이면 최적 분포 확률도를 그리지 않습니다.
+
+# 분포별 확률도 함수 (각 Fitter가 show_probability_plot=True일 때 내부에서 사용하는 함수와 동일)
+PROBABILITY_PLOT_FUNCTIONS = {
+    'Weibull_2P': Probability_plotting.Weibull_probability_plot,
+    'Lognormal_2P': Probability_plotting.Lognormal_probability_plot,
+    'Normal_2P': Probability_plotting.Normal_probability_plot,
+    'Exponential_1P': Probability_plotting.Exponential_probability_plot_Weibull_Scale,
+}
 
 # ==================================================================================================
 # 0. 사전 준비 (Setup)
@@ -58,7 +71,7 @@ def load_and_prepare_data(logger):
         if file_path.lower().endswith('.csv'):
             df = pd.read_csv(file_path)
         elif file_path.lower().endswith('.xlsx'):
-            df = pd.read_excel(file_path)
+            df = read_excel_cached(file_path)
         else:
             logger.error("지원하지 않는 파일 형식입니다. CSV 또는 XLSX 파일을 사용해주세요.")
             return None, None
@@ -88,8 +101,9 @@ def load_and_prepare_data(logger):
 
 def analyze_dataset(failures, dataset_name, logger):
     """
-    주어진 데이터셋에 대해 reliability.Fitters.Fit_Everything을 사용하여 최적 분포를 찾습니다.
-    [개선사항] 분석 대상을 4개 분포(Weibull_2P, Lognormal_2P, Normal_2P, Exponential_1P)로 한정합니다.
+    주어진 데이터셋에 대해 후보 분포(Config.CANDIDATE_DISTRIBUTIONS)를 적합하여 최적 분포를 찾습니다.
+    [개선사항] 각 후보 분포를 신뢰구간과 함께 한 번씩만 적합하고 BIC로 순위를 매긴 뒤,
+    최적 분포의 적합 결과를 그대로 재사용합니다. (최적 분포를 다시 적합하지 않음)
     """
     logger.info(f"Step 1-2: '{dataset_name}' 데이터셋 개별 분석 시작.")
     
@@ -97,42 +111,49 @@ def analyze_dataset(failures, dataset_name, logger):
         logger.error(f"'{dataset_name}' 데이터셋의 데이터가 2개 미만({len(failures)}개)이므로 분석을 진행할 수 없습니다.")
         return None
 
-    # [개선사항] 분석할 4개 분포를 제외한 나머지를 모두 exclude 리스트에 추가합니다.
-    excluded_distributions = [
-        'Weibull_3P', 'Weibull_CR', 'Weibull_Mixture', 'Weibull_DS', 
-        'Gamma_2P', 'Loglogistic_2P', 'Gamma_3P', 'Lognormal_3P', 
-        'Loglogistic_3P', 'Gumbel_2P', 'Exponential_2P', 'Beta_2P'
-    ]
-    
-    fit_results = Fitters.Fit_Everything(
-        failures=failures, sort_by='BIC', exclude=excluded_distributions,
-        show_probability_plot=False, show_histogram_plot=False, show_PP_plot=False,
-        show_best_distribution_probability_plot=False
-    )
-    
-    logger.info(f"'{dataset_name}' 데이터셋 분석 완료.")
-    best_dist_name = fit_results.best_distribution_name
-    logger.info(f"'{dataset_name}' 최적 분포 (BIC 기준): {best_dist_name}")
-    
-    # 상세 정보(신뢰구간 등)를 얻기 위해 최적 분포로 다시 피팅합니다.
-    fitter_function = getattr(Fitters, f'Fit_{best_dist_name}', None)
-    if fitter_function:
-        logger.info(f"'{best_dist_name}'에 대한 상세 분석을 위해 개별 Fitter를 재실행합니다.")
-        detailed_fit_results = fitter_function(
-            failures=failures, 
-            CI=Config.CONFIDENCE_INTERVAL,
-            show_probability_plot=True,
-            print_results=True
-        )
-        plot_path = os.path.join('results', f'{dataset_name}_best_fit_probplot.png')
-        plt.title(f'Best Fit Distribution Probability Plot\n({dataset_name} Data)')
-        plt.savefig(plot_path)
-        plt.close()
-        logger.info(f"'{dataset_name}' 최적 분포 확률도를 '{plot_path}'에 저장했습니다.")
-        return detailed_fit_results
-    else:
-        logger.error(f"'{best_dist_name}'에 해당하는 개별 Fitter를 찾을 수 없습니다.")
-        return fit_results
+    fits = {}
+    for dist_name in Config.CANDIDATE_DISTRIBUTIONS:
+        fitter_function = getattr(Fitters, f'Fit_{dist_name}')
+        try:
+            fit = fitter_function(
+                failures=failures,
+                CI=Config.CONFIDENCE_INTERVAL,
+                show_probability_plot=False,
+                print_results=False
+            )
+        except Exception as e:
+            logger.warning(f"'{dataset_name}' {dist_name} 분포 적합 실패: {e}")
+            continue
+        if np.isfinite(fit.BIC):
+            fits[dist_name] = fit
+
+    if not fits:
+        logger.error(f"'{dataset_name}' 데이터셋에 적합 가능한 분포가 없습니다.")
+        return None
+
+    ranking = pd.DataFrame(
+        [[name, fit.BIC, fit.AICc, fit.loglik] for name, fit in fits.items()],
+        columns=['Distribution', 'BIC', 'AICc', 'Log-likelihood']
+    ).sort_values(by='BIC')
+    logger.info(f"'{dataset_name}' 데이터셋 분석 완료.\n{ranking.to_string(index=False)}")
+
+    best_dist_name = ranking['Distribution'].iloc[0]
+    best_fit = fits[best_dist_name]
+    logger.info(f"'{dataset_name}' 최적 분포 (BIC 기준): {best_dist_name}\n{best_fit.results.to_string(index=False)}")
+
+    if Config.SAVE_PROBABILITY_PLOTS:
+        save_probability_plot(best_fit, failures, dataset_name, logger)
+    return best_fit
+
+def save_probability_plot(fit, failures, dataset_name, logger):
+    """이미 적합된 분포 결과(fit)로 확률도를 그려 저장합니다. (재적합하지 않음)"""
+    plot_function = PROBABILITY_PLOT_FUNCTIONS[fit.distribution.name2]
+    plot_function(failures=failures, __fitted_dist_params=fit, CI=Config.CONFIDENCE_INTERVAL)
+    plot_path = os.path.join('results', f'{dataset_name}_best_fit_probplot.png')
+    plt.title(f'Best Fit Distribution Probability Plot\n({dataset_name} Data)')
+    plt.savefig(plot_path)
+    plt.close()
+    logger.info(f"'{dataset_name}' 최적 분포 확률도를 '{plot_path}'에 저장했습니다.")
 
 # ==================================================================================================
 # 2. 공통 형상모수 가정 검정 (Step 2: Common Shape Parameter Test)
@@ -40,19 +40,25 @@
 import os
 import logging
 import platform
-from typing import List, Dict, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Union
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import font_manager
+
+from excel_cache import read_excel_cached
+# 분포 레지스트리로 'weibull' 같은 표기를 reliability 분포 이름으로 통일합니다.
+from dist_registry import canonical_name
 # reliability 패키지 설치가 필요합니다: pip install reliability
-from reliability.Fitters import (
+from reliability import Fitters as reliability_fitters
+# 개별 분포 적합은 reliability 피터와 같은 결과를 내는 NumPy MLE 엔진을 사용합니다.
+from mle_fitters import (
     Fit_Weibull_2P,
     Fit_Lognormal_2P,
     Fit_Normal_2P,
     Fit_Exponential_1P,
-    Fit_Everything,
 )
 
 # --- 전역 설정 (Global Configuration) ---
@@ -137,7 +143,7 @@ def preprocess_and_summarize_data(
         if file_path.lower().endswith('.csv'):
             df = pd.read_csv(file_path)
         elif file_path.lower().endswith('.xlsx'):
-            df = pd.read_excel(file_path)
+            df = read_excel_cached(file_path)
         else:
             raise ValueError("지원하지 않는 파일 형식입니다. .csv 또는 .xlsx 파일을 사용해주세요.")
         
@@ -212,53 +218,138 @@ def preprocess_and_summarize_data(
 
 # --- 2단계: 최적 수명분포 탐색 ---
 
+def _fit_single_distribution(dist_name: str, failures: list, right_censored: list, show_probability_plot: bool):
+    """
+    분포 하나를 피팅합니다. DISTRIBUTION_MAP에 있는 분포는 mle_fitters 피터를, 그 외 분포는 reliability의 Fit_<분포> 피터를 사용합니다.
+    show_probability_plot=True이면 이미 적합한 모수로 현재 figure에 확률도를 그립니다. (분포를 다시 적합하지 않습니다)
+    """
+    fitter_class = DISTRIBUTION_MAP.get(dist_name) or getattr(reliability_fitters, f"Fit_{dist_name}")
+    return fitter_class(
+        failures=failures,
+        right_censored=right_censored,
+        print_results=False,
+        show_probability_plot=show_probability_plot
+    )
+
+
+def _results_row(dist_name: str, fitter_obj) -> Dict[str, Any]:
+    """피터 객체를 Fit_Everything의 results와 같은 형식(분포, 모수 추정값, Log-likelihood, AICc, BIC, AD)의 행으로 만듭니다."""
+    row = {'Distribution': dist_name}
+    row.update(zip(fitter_obj.results['Parameter'], fitter_obj.results['Point Estimate']))
+    row.update({'Log-likelihood': fitter_obj.loglik, 'AICc': fitter_obj.AICc, 'BIC': fitter_obj.BIC, 'AD': fitter_obj.AD})
+    return row
+
+
+def _fit_group_distributions(group_name: str,
+                             failures: list,
+                             right_censored: list,
+                             distributions_to_fit: List[str],
+                             save_plots: bool = False) -> Dict[str, Any]:
+    """
+    한 그룹에 대해 지정된 분포를 하나씩 피팅하고, BIC 기준 최적 분포의 피터 객체를 그대로 반환합니다. (분포마다 적합은 한 번)
+
+    프로세스 풀의 작업자에서 실행되므로 반환값은 결과 표 DataFrame, 최적 분포 이름, 최적 분포 피터 객체뿐입니다.
+    save_plots=True일 때만 분포마다 새 figure에 확률도를 그려 RESULTS_DIR에 '{그룹}_{분포}_probability_plot.png'로 저장합니다.
+    """
+    rows = []
+    best_dist_name, best_fitter_obj = None, None
+    for dist_name in distributions_to_fit:
+        fig = plt.figure() if save_plots else None
+        try:
+            fitter_obj = _fit_single_distribution(dist_name, failures, right_censored, show_probability_plot=save_plots)
+        except Exception as e:
+            logging.warning(f"그룹 '{group_name}'에 {dist_name} 분포를 피팅할 수 없습니다: {e}")
+            continue
+        else:
+            if fig is not None:
+                fig.savefig(os.path.join(RESULTS_DIR, f"{group_name}_{dist_name}_probability_plot.png"))
+                # 피터가 보관한 Axes는 pickle할 수 없으므로 작업자 반환값에서 뺍니다.
+                fitter_obj.__dict__.pop('probability_plot', None)
+        finally:
+            if fig is not None:
+                plt.close(fig)
+
+        rows.append(_results_row(dist_name, fitter_obj))
+        if best_fitter_obj is None or fitter_obj.BIC < best_fitter_obj.BIC:
+            best_dist_name, best_fitter_obj = dist_name, fitter_obj
+
+    results_df = pd.DataFrame(rows)
+    if not results_df.empty:
+        results_df = results_df.sort_values(by='BIC').reset_index(drop=True)
+
+    return {
+        'best_dist': best_dist_name,
+        'results_df': results_df,
+        'fitter_object': best_fitter_obj
+    }
+
+
 def find_best_distribution(grouped_data: Dict[str, Dict[str, list]],
-                           distributions_to_fit: List[str]) -> Dict[str, Dict[str, Any]]:
+                           distributions_to_fit: List[str],
+                           max_workers: Optional[int] = 1,
+                           save_plots: bool = True) -> Dict[str, Dict[str, Any]]:
     """
     각 데이터 그룹에 대해 여러 분포를 피팅하고 최적 분포를 찾습니다.
-    최적 분포 결정 후, 해당 분포로 다시 피팅하여 상세 객체를 저장합니다.
+    distributions_to_fit에 지정된 분포만 한 번씩 피팅하며, BIC 기준 최적 분포의 피터 객체를 상세 객체로 저장합니다.
+
+    그룹별 피팅은 서로 독립적이므로 max_workers가 1보다 크면(또는 None이면) 프로세스 풀에서 병렬로 실행합니다.
+    save_plots=True일 때만 작업자가 분포별 확률도를 각자의 figure에 그려 저장합니다.
 
     Args:
         grouped_data (Dict): 전처리된 데이터 딕셔너리.
         distributions_to_fit (List[str]): 분석할 분포 이름 목록.
+        max_workers (Optional[int]): 프로세스 풀 작업자 수. 1이면 순차 실행, None이면 CPU 코어 수만큼 사용합니다.
+        save_plots (bool): 분포 비교 그림을 RESULTS_DIR에 저장할지 여부.
 
     Returns:
         Dict[str, Dict[str, Any]]: 각 그룹별 분석 결과 딕셔너리.
     """
     logging.info("2단계: 최적 수명분포 탐색 시작.")
-    
-    analysis_results = {}
 
-    for group_name, data in grouped_data.items():
-        logging.info(f"그룹 '{group_name}'에 대한 최적 분포 탐색 중...")
-        print(f"\n--- [2단계] 그룹 '{group_name}' 최적 분포 탐색 결과 ---")
+    requested_dists = []
+    for dist_name in distributions_to_fit:
+        try:
+            canonical = canonical_name(dist_name)
+        except ValueError as e:
+            logging.warning(f"{e} - 분석 대상에서 제외합니다.")
+            continue
+        if canonical not in requested_dists:
+            requested_dists.append(canonical)
+    distributions_to_fit = requested_dists
 
+    groups_to_fit = []
+    for group_name, data in grouped_data.items():
         if len(data['failures']) < 2:
             logging.warning(f"그룹 '{group_name}'의 고장 데이터가 2개 미만({len(data['failures'])}개)이므로 분석을 건너뜁니다.")
+            print(f"\n--- [2단계] 그룹 '{group_name}' 최적 분포 탐색 결과 ---")
             print(f"그룹 '{group_name}'는 고장 데이터가 부족하여 분석할 수 없습니다.")
             continue
+        groups_to_fit.append(group_name)
+
+    fit_args = [
+        (group_name, grouped_data[group_name]['failures'], grouped_data[group_name]['right_censored'],
+         distributions_to_fit, save_plots)
+        for group_name in groups_to_fit
+    ]
+    if len(groups_to_fit) > 1 and max_workers != 1:
+        logging.info(f"그룹 {len(groups_to_fit)}개를 프로세스 풀에서 병렬로 피팅합니다.")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            summaries = list(executor.map(_fit_group_distributions, *zip(*fit_args)))
+    else:
+        summaries = [_fit_group_distributions(*args) for args in fit_args]
 
-        fitter_obj_all = Fit_Everything(
-            failures=data['failures'],
-            right_censored=data['right_censored'],
-            print_results=False,
-            show_probability_plot=True,
-            show_histogram_plot=True,
-            show_PP_plot=True,
-            show_best_distribution_probability_plot=True
-        )
+    analysis_results = {}
+    for group_name, summary in zip(groups_to_fit, summaries):
+        logging.info(f"그룹 '{group_name}'에 대한 최적 분포 탐색 중...")
+        print(f"\n--- [2단계] 그룹 '{group_name}' 최적 분포 탐색 결과 ---")
 
-        results_df = fitter_obj_all.results
-        filtered_results = results_df[results_df['Distribution'].isin(distributions_to_fit)]
-        
+        filtered_results = summary['results_df']
         print("\n[사용자 지정 분포에 대한 적합도 결과]")
         print(filtered_results.to_string())
-        logging.info(f"그룹 '{group_name}'의 Fit_Everything 필터링 결과:\n{filtered_results.to_string()}")
+        logging.info(f"그룹 '{group_name}'의 분포 적합도 결과:\n{filtered_results.to_string()}")
 
-        if not filtered_results.empty:
-            best_dist_row = filtered_results.sort_values(by='BIC').iloc[0]
-            best_dist_name = best_dist_row['Distribution']
-        else:
+        best_dist_name = summary['best_dist']
+        if best_dist_name is None:
             logging.warning(f"그룹 '{group_name}'에서 지정된 분포를 피팅할 수 없었습니다. 기본값으로 Weibull_2P를 사용합니다.")
             best_dist_name = "Weibull_2P"
 
@@ -267,38 +358,12 @@ def find_best_distribution(grouped_data: Dict[str, Dict[str, list]],
         print(f"지정된 분포 목록 내에서 BIC 기준 최적 분포는 **{best_dist_name}** 입니다.")
         logging.info(f"그룹 '{group_name}'의 최적 분포(BIC 기준): {best_dist_name}")
 
-        try:
-            if hasattr(fitter_obj_all, 'probability_plot') and hasattr(fitter_obj_all.probability_plot, 'figure'):
-                fitter_obj_all.probability_plot.figure.savefig(os.path.join(RESULTS_DIR, f"{group_name}_all_probability_plots.png"))
-            if hasattr(fitter_obj_all, 'histogram_plot') and hasattr(fitter_obj_all.histogram_plot, 'figure'):
-                fitter_obj_all.histogram_plot.figure.savefig(os.path.join(RESULTS_DIR, f"{group_name}_histogram_plot.png"))
-            if hasattr(fitter_obj_all, 'PP_plot') and hasattr(fitter_obj_all.PP_plot, 'figure'):
-                fitter_obj_all.PP_plot.figure.savefig(os.path.join(RESULTS_DIR, f"{group_name}_pp_plots.png"))
-            if hasattr(fitter_obj_all, 'best_distribution_probability_plot') and hasattr(fitter_obj_all.best_distribution_probability_plot, 'figure'):
-                fitter_obj_all.best_distribution_probability_plot.figure.savefig(os.path.join(RESULTS_DIR, f"{group_name}_best_dist_prob_plot.png"))
-            plt.close('all')
-            logging.info(f"그룹 '{group_name}'의 분석 그림들을 '{RESULTS_DIR}' 폴더에 저장했습니다.")
-        except Exception as e:
-            logging.error(f"그룹 '{group_name}'의 그림 저장 중 오류 발생: {e}")
-
-        fitter_class = DISTRIBUTION_MAP.get(best_dist_name)
-        if fitter_class:
-            final_fitter_obj = fitter_class(
-                failures=data['failures'],
-                right_censored=data['right_censored'],
-                print_results=False,
-                show_probability_plot=True
-            )
-            plt.close(final_fitter_obj.probability_plot.figure)
-        else:
-            final_fitter_obj = None
-
         analysis_results[group_name] = {
             'best_dist': best_dist_name,
             'results_df': filtered_results,
-            'fitter_object': final_fitter_obj
+            'fitter_object': summary['fitter_object']
         }
-    
+
     logging.info("2단계: 최적 수명분포 탐색 완료.")
     return analysis_results
 
@@ -369,12 +434,13 @@ def analyze_single_distribution(grouped_data: Dict[str, Dict[str, list]],
         print("B-수명은 모집단의 특정 비율(B%)이 고장 나는 시간을 의미합니다. 예를 들어, B10 수명은 10%의 제품이 고장날 것으로 예상되는 시간입니다.")
 
     if failure_prob_times:
-        cdf_results = []
-        for t in failure_prob_times:
-            lower, point, upper = fitter_obj.distribution.SF(CI_x=t, CI_type='reliability', show_plot=False)
-            cdf_results.append([t, 1 - upper, 1 - point, 1 - lower])
-        
-        cdf_df = pd.DataFrame(cdf_results, columns=['시간', '누적고장확률 (하한)', '누적고장확률 (점추정)', '누적고장확률 (상한)'])
+        # 모든 시간에서의 누적 고장 확률과 신뢰구간을 배열로 한 번에 계산합니다.
+        times = np.asarray(failure_prob_times, dtype=float)
+        lower, point, upper = fitter_obj.CDF(times, bounds=True)
+        cdf_df = pd.DataFrame({
+            '시간': times, '누적고장확률 (하한)': lower,
+            '누적고장확률 (점추정)': point, '누적고장확률 (상한)': upper,
+        })
         print("\n[특정 시간에서의 누적 고장 확률 (95% 신뢰구간)]")
         print(cdf_df.to_string(index=False))
         logging.info(f"누적 고장 확률 결과:\n{cdf_df.to_string()}")
@@ -491,7 +557,8 @@ if __name__ == "__main__":
 
         best_fit_results = find_best_distribution(
             grouped_data=grouped_life_data,
-            distributions_to_fit=DISTRIBUTIONS
+            distributions_to_fit=DISTRIBUTIONS,
+            max_workers=None
         )
 
         input("\n2단계 완료. 계속하려면 Enter를 누르세요...")
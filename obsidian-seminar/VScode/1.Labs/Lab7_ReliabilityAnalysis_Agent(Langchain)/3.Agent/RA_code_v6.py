@@ -2,16 +2,22 @@
 import os
 import logging
 import platform
-from typing import List, Dict, Any, Union, Tuple
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Union, Tuple
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import font_manager
-from reliability.Fitters import (
+
+from excel_cache import read_excel_cached
+# reliability 피터와 같은 결과(모수, 신뢰구간, BIC 등)를 내는 NumPy MLE 엔진
+from mle_fitters import (
     Fit_Weibull_2P, Fit_Lognormal_2P, Fit_Normal_2P,
-    Fit_Exponential_1P
+    Fit_Exponential_1P, fit_groups
 )
+from dist_registry import canonical_name
+from fit_cache import FitCache
 
 # --- 전역 설정 ---
 RESULTS_DIR = "results"
@@ -20,15 +26,63 @@ DISTRIBUTION_MAP = {
     "Weibull_2P": Fit_Weibull_2P, "Lognormal_2P": Fit_Lognormal_2P,
     "Normal_2P": Fit_Normal_2P, "Exponential_1P": Fit_Exponential_1P,
 }
-FRIENDLY_DIST_MAP = {
-    "weibull": "Weibull_2P", "weibull_2p": "Weibull_2P",
-    "lognormal": "Lognormal_2P", "lognormal_2p": "Lognormal_2P",
-    "normal": "Normal_2P", "normal_2p": "Normal_2P",
-    "exponential": "Exponential_1P", "exponential_1p": "Exponential_1P",
-    "Weibull_2P": "Weibull_2P", "Lognormal_2P": "Lognormal_2P",
-    "Normal_2P": "Normal_2P", "Exponential_1P": "Exponential_1P",
+
+# 분포별 모수 (속성 이름, 표시 이름)
+PARAMETER_NAMES = {
+    "Weibull_2P": [("alpha", "Alpha"), ("beta", "Beta")],
+    "Lognormal_2P": [("mu", "Mu"), ("sigma", "Sigma")],
+    "Normal_2P": [("mu", "Mu"), ("sigma", "Sigma")],
+    "Exponential_1P": [("Lambda", "Lambda")],
 }
 
+# --- 분석 결과 객체 ---
+# 도구(tools.py)는 출력된 문자열을 다시 읽지 않고 아래 결과 객체를 그대로 사용합니다.
+@dataclass
+class BestDistributionResult:
+    """2단계 결과: 그룹별 적합 결과, BIC 표, 저장된 그림 경로"""
+    fits: Dict[Any, Dict[str, Any]]
+    bic_table: pd.DataFrame
+    plot_paths: List[str] = field(default_factory=list)
+
+    def best_distributions(self) -> Dict[Any, str]:
+        """그룹별 BIC 최소 분포 이름"""
+        if self.bic_table.empty: return {}
+        best_rows = self.bic_table.loc[self.bic_table.groupby('Group')['BIC'].idxmin()]
+        return dict(zip(best_rows['Group'], best_rows['Distribution']))
+
+@dataclass
+class DistributionAnalysisResult:
+    """3단계 결과: 모수 추정치와 신뢰구간, B-수명, 고장 확률, 확률도 경로, fitter 객체"""
+    group: Any
+    distribution: str
+    fitter: Any
+    parameters: pd.DataFrame
+    b_lives: pd.DataFrame
+    failure_probabilities: pd.DataFrame
+    plot_path: str
+
+    def to_frame(self) -> pd.DataFrame:
+        """모수, B-수명, 고장 확률 표를 열 방향으로 이어 붙인 요약 표"""
+        columns = {'Parameter': self.parameters['Parameter'], 'Value': self.parameters['Value']}
+        for table in (self.b_lives, self.failure_probabilities):
+            columns.update({col: table[col] for col in table.columns})
+        return pd.DataFrame({k: pd.Series(v.to_numpy()) for k, v in columns.items()})
+
+@dataclass
+class HomogeneityResult:
+    """4단계 결과: 그룹별 모수와 신뢰구간 표, 비교 그림 경로"""
+    parameter: str
+    table: pd.DataFrame
+    plot_path: str
+
+def _official_dist_name(dist_name: str):
+    """'weibull', 'Weibull_2P' 등 분포 이름을 분포 레지스트리로 통일합니다. 이 모듈에서 적합할 수 없는 분포면 None."""
+    try:
+        dist_official = canonical_name(dist_name)
+    except ValueError:
+        return None
+    return dist_official if dist_official in DISTRIBUTION_MAP else None
+
 # --- 헬퍼 함수 ---
 def setup_environment():
     if not os.path.exists(RESULTS_DIR): os.makedirs(RESULTS_DIR)
@@ -48,133 +102,148 @@ def setup_environment():
         logging.warning("한글 폰트 설정을 찾지 못했습니다.")
 
 # --- 1단계: 데이터 전처리 및 요약 ---
-def preprocess_and_summarize_data(
-    file_path: str, column_map: Dict[str, str], status_indicators: Dict[str, Union[str, int]], **kwargs
-) -> Tuple[Dict[str, Dict[str, list]], pd.DataFrame]:
-    df = pd.read_excel(file_path) if file_path.endswith('.xlsx') else pd.read_csv(file_path)
+def group_lifetime_data(
+    df: pd.DataFrame, column_map: Dict[str, str], status_indicators: Dict[str, Union[str, int]]
+) -> Tuple[Dict[Any, Dict[str, np.ndarray]], pd.DataFrame]:
+    """이미 읽은 DataFrame을 그룹별 고장/관측중단 시간 배열과 요약 표로 나눕니다."""
     df_renamed = df.rename(columns={v: k for k, v in column_map.items()})
     failure_indicator = str(status_indicators['failure'])
-    df_renamed['status_bool'] = df_renamed['status'].astype(str).apply(lambda x: x == failure_indicator)
-    
+    df_renamed['status_bool'] = df_renamed['status'].astype(str) == failure_indicator
+
     summary_list, grouped_data = [], {}
     for group, data in df_renamed.groupby('stress'):
-        failures = data[data['status_bool']]['time'].tolist()
-        right_censored = data[~data['status_bool']]['time'].tolist()
+        failed, times = data['status_bool'].to_numpy(), data['time'].to_numpy(dtype=float)
+        failures, right_censored = times[failed], times[~failed]
         grouped_data[group] = {'failures': failures, 'right_censored': right_censored}
         summary_list.append({'Group': group, 'Total Samples': len(data), 'Failures': len(failures), 'Censored': len(right_censored)})
-    
+
     summary_df = pd.DataFrame(summary_list)
-    print("--- 데이터 요약 ---\
-" + summary_df.to_string(index=False))
+    logging.info("--- 데이터 요약 ---\n" + summary_df.to_string(index=False))
     return grouped_data, summary_df
 
+def preprocess_and_summarize_data(
+    file_path: str, column_map: Dict[str, str], status_indicators: Dict[str, Union[str, int]], **kwargs
+) -> Tuple[Dict[Any, Dict[str, np.ndarray]], pd.DataFrame]:
+    df = read_excel_cached(file_path) if file_path.endswith('.xlsx') else pd.read_csv(file_path)
+    return group_lifetime_data(df, column_map, status_indicators)
+
 # --- 2단계: 최적 수명분포 탐색 ---
 def find_best_distribution(
-    grouped_data: Dict[str, Dict[str, list]], distributions_to_fit: List[str]
-) -> Tuple[Dict[str, Any], pd.DataFrame]:
-    analysis_results, bic_scores = {}, []
-    fig, ax = plt.subplots(figsize=(10, 7))
+    grouped_data: Dict[str, Dict[str, list]], distributions_to_fit: List[str],
+    fit_cache: Optional[FitCache] = None, CI: float = 0.95
+) -> BestDistributionResult:
+    bic_scores, plot_paths = [], []
+    dists_official = []
+    for dist_friendly in distributions_to_fit:
+        dist_official = _official_dist_name(dist_friendly)
+        if dist_official:
+            if dist_official not in dists_official: dists_official.append(dist_official)
+        else:
+            logging.warning(f"Distribution '{dist_friendly}' not found.")
 
-    for group_name, data in grouped_data.items():
-        analysis_results[group_name] = {}
-        for dist_friendly in distributions_to_fit:
-            dist_official = FRIENDLY_DIST_MAP.get(dist_friendly.lower().strip())
-            if dist_official and dist_official in DISTRIBUTION_MAP:
-                fitter = DISTRIBUTION_MAP[dist_official](**data)
-                analysis_results[group_name][dist_official] = fitter
-                bic_scores.append({'Group': group_name, 'Distribution': dist_official, 'BIC': fitter.BIC})
-                # The CDF function plots on the currently active axes, so we don't pass ax directly.
-                fitter.distribution.CDF(label=f'{group_name} - {dist_official}')
-            else:
-                logging.warning(f"Distribution '{dist_friendly}' not found.")
+    # 모든 그룹을 분포마다 한 번의 벡터화 계산으로 적합합니다. (그룹 × 분포 개별 적합 대신)
+    # fit_cache가 주어지면 이미 적합한 (그룹, 분포)는 다시 적합하지 않습니다.
+    if fit_cache is not None:
+        analysis_results = fit_cache.get_fits(grouped_data, grouped_data.keys(), dists_official, CI=CI)
+    else:
+        analysis_results = fit_groups(grouped_data, dists_official, CI=CI)
+    fig, ax = plt.subplots(figsize=(10, 7))
+    for group_name, fits in analysis_results.items():
+        for dist_official, fitter in fits.items():
+            bic_scores.append({'Group': group_name, 'Distribution': dist_official, 'BIC': fitter.BIC})
+            # The CDF function plots on the currently active axes, so we don't pass ax directly.
+            fitter.distribution.CDF(label=f'{group_name} - {dist_official}')
     
     ax.set_title('전체 그룹 수명분포 확률도'); ax.set_xlabel('Time'); ax.set_ylabel('Probability of Failure')
     ax.legend(); ax.grid(True)
-    fig.savefig(os.path.join(RESULTS_DIR, "probability_plot_all_groups.png")); plt.close(fig)
+    plot_paths.append(os.path.join(RESULTS_DIR, "probability_plot_all_groups.png"))
+    fig.savefig(plot_paths[-1]); plt.close(fig)
 
-    if not bic_scores: return analysis_results, pd.DataFrame()
+    if not bic_scores: return BestDistributionResult(analysis_results, pd.DataFrame(), plot_paths)
     bic_df = pd.DataFrame(bic_scores)
-    print("\n--- 분포별 BIC (작을수록 좋음) ---\
-" + bic_df.to_string(index=False))
+    logging.info("--- 분포별 BIC (작을수록 좋음) ---\n" + bic_df.to_string(index=False))
     
     try:
         fig, ax = plt.subplots(figsize=(10, 6))
         bic_df.pivot(index='Group', columns='Distribution', values='BIC').plot(kind='bar', ax=ax)
         ax.set_title('그룹별 분포 적합도 (BIC)'); ax.set_ylabel('BIC Score'); ax.tick_params(axis='x', rotation=0)
         fig.savefig(os.path.join(RESULTS_DIR, "BIC_comparison.png")); plt.close(fig)
+        plot_paths.append(os.path.join(RESULTS_DIR, "BIC_comparison.png"))
     except Exception as e:
         logging.warning(f"Could not create BIC pivot plot: {e}")
-    return analysis_results, bic_df
+    return BestDistributionResult(analysis_results, bic_df, plot_paths)
 
 # --- 3단계: 단일 분포 상세 분석 ---
 def analyze_single_distribution(
     grouped_data: Dict, group_name: str, distribution_name: str,
-    b_lives: List = None, failure_prob_times: List = None
-) -> object: # Return type is now the fitter object
+    b_lives: List = None, failure_prob_times: List = None,
+    fit_cache: Optional[FitCache] = None, CI: float = 0.95
+) -> DistributionAnalysisResult:
     found_key = group_name if group_name in grouped_data else int(group_name) if str(group_name).isdigit() and int(group_name) in grouped_data else None
     if found_key is None:
         raise ValueError(f"그룹 '{group_name}'을 찾을 수 없습니다. 사용 가능: {list(grouped_data.keys())}")
 
-    dist_official = FRIENDLY_DIST_MAP.get(distribution_name.lower().strip())
+    dist_official = _official_dist_name(distribution_name)
     if not dist_official:
         raise ValueError(f"분포 '{distribution_name}'을 지원하지 않습니다.")
 
-    plt.close('all')
-    fitter = DISTRIBUTION_MAP[dist_official](**grouped_data[found_key], show_plot=True, print_results=False)
+    if fit_cache is not None:
+        fitter = fit_cache.get_fits(grouped_data, [found_key], [dist_official], CI=CI)[found_key].get(dist_official)
+        if fitter is None:
+            raise ValueError(f"그룹 '{found_key}'의 데이터로 '{dist_official}' 분포를 적합할 수 없습니다.")
+    else:
+        fitter = DISTRIBUTION_MAP[dist_official](**grouped_data[found_key], CI=CI, print_results=False)
 
-    ax = getattr(fitter, "probability_plot", plt.gca())
+    plt.close('all')
+    ax = fitter.plot_probability()
     ax.set_title(f'{found_key} - {dist_official} Probability Plot')
     ax.grid(True)
     fig = ax.get_figure()
     fig.set_size_inches(10, 7)
-    fig.savefig(os.path.join(RESULTS_DIR, f"probability_plot_{found_key}_{dist_official}.png"))
+    plot_path = os.path.join(RESULTS_DIR, f"probability_plot_{found_key}_{dist_official}.png")
+    fig.savefig(plot_path)
     plt.close(fig)
 
-    # --- DYNAMIC PARAMETER AND B-LIFE HANDLING ---
-    results = {}
-    params, values = [], []
-
-    # 분포 종류에 따라 올바른 모수를 동적으로 가져옵니다.
-    if dist_official == "Weibull_2P":
-        params.extend(['Alpha', 'Beta'])
-        values.extend([fitter.alpha, fitter.beta])
-    elif dist_official in ["Lognormal_2P", "Normal_2P"]:
-        params.extend(['Mu', 'Sigma'])
-        values.extend([fitter.mu, fitter.sigma])
-    elif dist_official == "Exponential_1P":
-        params.append('Lambda')
-        values.append(fitter.Lambda)
-    
-    results['Parameter'] = params
-    results['Value'] = values
-
-    if b_lives:
-        # b_life 대신 quantile 메서드를 사용하고, B-수명(B10)을 확률(0.1)로 변환합니다.
-        b_life_values = [fitter.distribution.quantile(b/100) for b in b_lives]
-        results['B-Life'] = [f'B{b}' for b in b_lives]
-        results['B-Life Value'] = b_life_values
-        
-    if failure_prob_times:
-        probs = [fitter.distribution.CDF(t, show_plot=False) for t in failure_prob_times]
-        results['Time'] = failure_prob_times
-        results['Failure Probability'] = probs
+    # 분포 종류에 따라 모수 추정치와 신뢰구간을 가져옵니다.
+    parameters = pd.DataFrame([
+        {'Parameter': label, 'Value': getattr(fitter, attr),
+         'Lower CI': getattr(fitter, f"{attr}_lower"), 'Upper CI': getattr(fitter, f"{attr}_upper")}
+        for attr, label in PARAMETER_NAMES[dist_official]
+    ])
 
-    results_df = pd.DataFrame({k: pd.Series(v) for k, v in results.items()})
-    print(f"\n--- {found_key} 그룹 {dist_official} 분석 결과 ---\
-" + results_df.to_string(index=False))
-    return fitter # Return the fitter object itself
+    # B-수명(B10)을 확률(0.1)로 바꿔 모든 지점의 분위수와 신뢰구간을 한 번에 계산합니다.
+    b_lives = np.asarray(b_lives or [], dtype=float)
+    b_lower, b_point, b_upper = fitter.quantile(b_lives / 100, bounds=True)
+    b_life_df = pd.DataFrame({
+        'B-Life': [f'B{b:g}' for b in b_lives],
+        'B-Life Value': b_point, 'B-Life Lower CI': b_lower, 'B-Life Upper CI': b_upper,
+    })
 
+    failure_prob_times = np.asarray(failure_prob_times or [], dtype=float)
+    cdf_lower, cdf_point, cdf_upper = fitter.CDF(failure_prob_times, bounds=True)
+    cdf_df = pd.DataFrame({
+        'Time': failure_prob_times,
+        'Failure Probability': cdf_point, 'Failure Probability Lower CI': cdf_lower,
+        'Failure Probability Upper CI': cdf_upper,
+    })
 
+    result = DistributionAnalysisResult(
+        group=found_key, distribution=dist_official, fitter=fitter, parameters=parameters,
+        b_lives=b_life_df, failure_probabilities=cdf_df, plot_path=plot_path
+    )
+    logging.info(f"--- {found_key} 그룹 {dist_official} 분석 결과 ---\n" + result.to_frame().to_string(index=False))
+    return result
 
 # --- 4단계: 모수 동일성 검토 ---
 def check_parameter_homogeneity(
     analysis_results: Dict, parameter_to_check: str
-) -> pd.DataFrame:
-
+) -> HomogeneityResult:
     param_values = []
+    CI = 0.95
     for group, dists in analysis_results.items():
         first_dist_name = next(iter(dists))
         fitter = dists[first_dist_name]
+        CI = getattr(fitter, 'CI', CI)
         
         # --- More robustly check for parameter and its confidence interval ---
         if hasattr(fitter, parameter_to_check):
@@ -185,14 +254,14 @@ def check_parameter_homogeneity(
     
     if not param_values: raise ValueError(f"모수 '{parameter_to_check}' 또는 해당 신뢰구간을 찾을 수 없습니다.")
     param_df = pd.DataFrame(param_values)
-    print(f"\n--- 그룹별 {parameter_to_check} 모수 비교 ---\
-" + param_df.to_string(index=False))
+    logging.info(f"--- 그룹별 {parameter_to_check} 모수 비교 ---\n" + param_df.to_string(index=False))
 
     fig, ax = plt.subplots(figsize=(10, 6))
     for _, row in param_df.iterrows():
         ax.errorbar(x=[row['Group']], y=[row['Value']], yerr=[[row['Value'] - row['Lower CI']], [row['Upper CI'] - row['Value']]], fmt='o', capsize=5, label=row['Group'])
-    ax.set_title(f'{parameter_to_check} 모수 동일성 검토 (95% 신뢰구간)'); ax.set_ylabel(f'{parameter_to_check} 값')
+    ax.set_title(f'{parameter_to_check} 모수 동일성 검토 ({CI * 100:g}% 신뢰구간)'); ax.set_ylabel(f'{parameter_to_check} 값')
     ax.grid(True, which='both', linestyle='--', linewidth=0.5)
-    fig.savefig(os.path.join(RESULTS_DIR, f"contour_plot_{parameter_to_check}.png")); plt.close(fig)
-    
-    return param_df
+    plot_path = os.path.join(RESULTS_DIR, f"contour_plot_{parameter_to_check}_CI{CI * 100:g}.png")
+    fig.savefig(plot_path); plt.close(fig)
+
+    return HomogeneityResult(parameter_to_check, param_df, plot_path)
@@ -12,6 +12,7 @@ from tools import (
     detailed_distribution_analyzer_tool,
     parameter_homogeneity_checker_tool,
 )
+from intent_router import IntentRouter
 
 def get_gemini_api_key():
     # ... (function remains the same)
@@ -21,22 +22,27 @@ def get_gemini_api_key():
         return os.environ["GEMINI_API_KEY"]
     return None
 
-def create_agent_executor():
+def create_agent_executor(llm=None):
     """
-    LangChain 에이전트 실행기(AgentExecutor)를 생성하고 반환합니다.
+    LangChain 에이전트 실행기(AgentExecutor)를 생성하고, 앞에 의도 라우터(IntentRouter)를 붙여 반환합니다.
+    정형화된 요청은 라우터가 도구를 바로 실행하고, 나머지 요청만 에이전트가 처리합니다.
+
+    Args:
+        llm: 사용할 LLM. 생략하면 Gemini를 사용합니다. (오프라인 시험에서는 가짜 LLM을 전달합니다)
     """
-    api_key = get_gemini_api_key()
-    if not api_key:
-        st.error("Gemini API 키를 찾을 수 없습니다.")
-        st.info("Please add your Gemini API key to the .streamlit/secrets.toml file.")
-        st.stop()
-
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash", 
-        google_api_key=api_key,
-        temperature=0.1,
-        convert_system_message_to_human=True
-    )
+    if llm is None:
+        api_key = get_gemini_api_key()
+        if not api_key:
+            st.error("Gemini API 키를 찾을 수 없습니다.")
+            st.info("Please add your Gemini API key to the .streamlit/secrets.toml file.")
+            st.stop()
+
+        llm = ChatGoogleGenerativeAI(
+            model="gemini-1.5-flash", 
+            google_api_key=api_key,
+            temperature=0.1,
+            convert_system_message_to_human=True
+        )
 
     tools = [
         data_summarizer_tool,
@@ -103,4 +109,8 @@ New input: {input}
         return_intermediate_steps=True
     )
 
-    return agent_executor
+    return IntentRouter(
+        agent_executor, tools={t.name: t for t in tools},
+        get_group_names=lambda: list((st.session_state.get('grouped_data') or {}).keys()),
+        memory=memory
+    )
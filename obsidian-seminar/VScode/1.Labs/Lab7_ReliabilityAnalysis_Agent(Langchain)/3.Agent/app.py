@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import os
 from agent import create_agent_executor
+from upload_store import file_sha256, save_upload, load_dataframe
 
 # --- 1. App Configuration ---
 st.set_page_config(
@@ -35,12 +36,6 @@ def parse_and_display_tool_output(tool_output):
     if "dataframe" in tool_output and tool_output["dataframe"]:
         st.dataframe(pd.DataFrame(tool_output["dataframe"]))
 
-    if "summary_text" in tool_output:
-        st.markdown(f"**요약:**\n```\n{tool_output['summary_text']}\n```")
-    
-    if "results_text" in tool_output:
-        st.markdown(f"**분석 결과:**\n```\n{tool_output['results_text']}\n```")
-
     if "plot_path" in tool_output and os.path.exists(tool_output["plot_path"]):
         st.image(tool_output["plot_path"])
 
@@ -49,6 +44,26 @@ def parse_and_display_tool_output(tool_output):
             if os.path.exists(path):
                 st.image(path)
 
+def prepare_upload(uploaded_file):
+    """
+    업로드 파일이 바뀌었을 때만 해시 계산, temp/ 저장, 파일 읽기를 수행하고 컬럼 목록과 미리보기를 세션에 보관합니다.
+    채팅 메시지마다 일어나는 재실행에서는 아무 작업도 하지 않습니다.
+    """
+    upload_id = getattr(uploaded_file, "file_id", None)
+    if upload_id is not None and st.session_state.get("upload_id") == upload_id:
+        return
+
+    content = uploaded_file.getvalue()
+    file_hash = file_sha256(content)
+    if st.session_state.get("uploaded_file_hash") != file_hash:
+        file_path = save_upload(content, uploaded_file.name, file_hash)
+        df = load_dataframe(file_hash, file_path)
+        st.session_state.update(
+            uploaded_file_hash=file_hash, uploaded_file_path=file_path,
+            data_columns=df.columns.tolist(), data_preview=df.head(),
+        )
+    st.session_state.upload_id = upload_id
+
 # --- 3. UI - File Upload & Column Mapping ---
 uploaded_file = st.file_uploader(
     "수명 데이터 파일(.csv, .xlsx)을 업로드하세요.",
@@ -57,26 +72,16 @@ uploaded_file = st.file_uploader(
 )
 
 if uploaded_file is not None:
-    temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-    
-    file_path = os.path.join(temp_dir, uploaded_file.name)
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-    
-    st.session_state.uploaded_file_path = file_path
-    
     st.success(f"파일 '{uploaded_file.name}'이 성공적으로 업로드되었습니다.")
 
     with st.expander("⚙️ 분석 설정 (Configuration)", expanded=not st.session_state.is_configured):
         try:
-            df = pd.read_csv(file_path) if file_path.endswith('.csv') else pd.read_excel(file_path)
-            st.dataframe(df.head())
+            prepare_upload(uploaded_file)
+            st.dataframe(st.session_state.data_preview)
 
             with st.form("column_mapping_form"):
                 st.subheader("1. 데이터 컬럼 설정")
-                columns = df.columns.tolist()
+                columns = st.session_state.data_columns
                 time_col = st.selectbox("수명/고장 시간", columns, index=min(0, len(columns)-1))
                 status_col = st.selectbox("고장/관측중단 상태", columns, index=min(1, len(columns)-1))
                 stress_col = st.selectbox("스트레스/그룹", columns, index=min(2, len(columns)-1))
@@ -0,0 +1,99 @@
+"""
+Excel(.xlsx) 변환 캐시 로더
+
+pd.read_excel은 같은 파일을 읽을 때마다 워크북 XML 전체를 다시 파싱하므로 매우 느립니다.
+read_excel_cached는 처음 읽을 때 시트를 Parquet 사이드카 파일로 변환해 두고,
+이후에는 사이드카에서 필요한 컬럼만 읽습니다.
+
+- 사이드카는 파일 내용의 SHA-256 해시(+ 읽기 옵션)로 구분하므로, 파일이 바뀌면 자동으로 새로 변환합니다.
+- 같은 프로세스에서는 (경로, 수정 시각, 크기)가 같으면 해시를 다시 계산하지 않습니다.
+- pyarrow가 설치되어 있지 않거나 변환에 실패하면 pd.read_excel 결과를 그대로 사용합니다.
+"""
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = '.excel_cache'
+_CHUNK_SIZE = 1024 * 1024
+_PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# (절대 경로, 수정 시각, 크기) -> 파일 내용 해시
+_hash_memo = {}
+
+
+def _file_sha256(path: Path) -> str:
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def read_excel_cached(source, columns=None, cache_dir=None, **read_excel_kwargs) -> pd.DataFrame:
+    """
+    Excel 파일을 Parquet 사이드카 캐시를 거쳐 읽습니다.
+
+    Args:
+        source: Excel 파일 경로, 또는 업로드된 파일의 내용(bytes 또는 read()를 지원하는 파일 객체)
+        columns: 읽을 컬럼 목록 (None이면 전체 컬럼). 사이드카에서는 이 컬럼만 읽습니다.
+        cache_dir: 사이드카를 저장할 디렉토리. 기본값은 경로 입력이면 파일과 같은 폴더의 `.excel_cache/`,
+                   내용 입력이면 현재 작업 디렉토리의 `.excel_cache/`입니다.
+        **read_excel_kwargs: pd.read_excel에 전달할 옵션 (예: sheet_name)
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        file_hash = _file_sha256(path)
+        default_dir = path.parent / CACHE_DIR_NAME
+        excel_source = path
+    else:
+        content = source if isinstance(source, bytes) else source.read()
+        file_hash = hashlib.sha256(content).hexdigest()
+        default_dir = Path(CACHE_DIR_NAME)
+        excel_source = io.BytesIO(content)
+
+    if not _PARQUET_AVAILABLE:
+        return pd.read_excel(excel_source, usecols=columns, **read_excel_kwargs)
+
+    options = repr(sorted(read_excel_kwargs.items()))
+    key = hashlib.sha256(f'{file_hash}:{options}'.encode('utf-8')).hexdigest()
+    sidecar = Path(cache_dir or default_dir) / f'{key}.parquet'
+
+    if sidecar.exists():
+        try:
+            if columns is not None:
+                import pyarrow.parquet as pq
+                missing = [col for col in columns if col not in pq.read_schema(sidecar).names]
+                if missing:
+                    raise KeyError(f"{missing} not in columns")
+            return pd.read_parquet(sidecar, columns=columns)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Excel 캐시를 읽지 못해 원본을 다시 읽습니다: {sidecar} - {e}")
+
+    df = pd.read_excel(excel_source, **read_excel_kwargs)
+    tmp_path = sidecar.with_name(f'.tmp-{uuid.uuid4().hex}.parquet')
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        # 컬럼 이름이 문자열이 아니면 Parquet으로 저장할 수 없으므로 문자열로 맞춥니다.
+        df.columns = [str(col) for col in df.columns]
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, sidecar)
+        logger.info(f"Excel 파일을 Parquet 캐시로 변환했습니다: {sidecar}")
+    except Exception as e:
+        # 한 컬럼에 숫자와 문자가 섞인 경우 등 Parquet으로 변환할 수 없는 시트는 캐시하지 않습니다.
+        logger.warning(f"Excel 캐시 저장 실패 (원본 데이터를 사용합니다): {e}")
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return df[columns] if columns is not None else df
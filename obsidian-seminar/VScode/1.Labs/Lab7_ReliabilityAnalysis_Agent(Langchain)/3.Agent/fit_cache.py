@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+적합 결과(fitter) 캐시
+
+에이전트 대화에서는 같은 데이터에 대해 최적 분포 탐색, 상세 분석, 모수 동일성 검토가 반복해서 호출됩니다.
+FitCache는 (데이터셋 해시, 그룹, 분포, 신뢰수준)별 적합 결과를 보관하여,
+한 세션에서 같은 (그룹, 분포)는 한 번만 적합하고 B-수명, 고장 확률 등은 캐시된 fitter로 계산하도록 합니다.
+"""
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional
+
+import numpy as np
+
+from mle_fitters import fit_groups
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def dataset_hash(grouped_data: Dict[Hashable, Dict[str, list]]) -> str:
+    """그룹별 고장/관측중단 데이터의 SHA-256 해시를 계산합니다. (그룹 순서와 무관)"""
+    digest = hashlib.sha256()
+    for group in sorted(grouped_data, key=str):
+        digest.update(str(group).encode('utf-8'))
+        for key in ('failures', 'right_censored'):
+            values = np.asarray(grouped_data[group].get(key, []), dtype=np.float64)
+            digest.update(key.encode('utf-8'))
+            digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class FitCache:
+    """
+    (데이터셋 해시, 그룹, 분포, 신뢰수준) -> 적합 결과 LRU 캐시
+
+    캐시에 없는 (그룹, 분포)만 mle_fitters.fit_groups로 분포마다 한 번에 적합합니다.
+    hits/misses는 캐시에서 찾은 / 새로 적합한 (그룹, 분포) 개수입니다.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._fits = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fits)
+
+    def clear(self):
+        self._fits.clear()
+
+    def get_fits(self, grouped_data: Dict[Hashable, Dict[str, list]], group_names: Iterable[Hashable],
+                 distributions: Iterable[str], CI: float = 0.95,
+                 data_hash: Optional[str] = None) -> Dict[Hashable, Dict[str, object]]:
+        """
+        지정한 그룹과 분포의 적합 결과를 반환합니다. 캐시에 없는 것만 새로 적합합니다.
+
+        Args:
+            grouped_data: {그룹 이름: {'failures': [...], 'right_censored': [...]}}
+            group_names: 적합 결과가 필요한 그룹 이름 목록
+            distributions: 분포 이름 목록 (mle_fitters가 지원하는 분포)
+            CI: 신뢰수준
+            data_hash: grouped_data의 dataset_hash. 생략하면 새로 계산합니다.
+
+        Returns:
+            {그룹 이름: {분포 이름: 적합 결과}}. 적합할 수 없는 (그룹, 분포)는 제외됩니다.
+        """
+        data_hash = data_hash or dataset_hash(grouped_data)
+        group_names = list(group_names)
+        results = {group: {} for group in group_names}
+
+        for dist_name in distributions:
+            missing = []
+            for group in group_names:
+                key = (data_hash, group, dist_name, CI)
+                if key in self._fits:
+                    self._fits.move_to_end(key)
+                    results[group][dist_name] = self._fits[key]
+                    self.hits += 1
+                else:
+                    missing.append(group)
+            if not missing:
+                continue
+
+            self.misses += len(missing)
+            fitted = fit_groups({group: grouped_data[group] for group in missing}, [dist_name], CI=CI)
+            for group in missing:
+                fit = fitted[group].get(dist_name)
+                if fit is None:
+                    continue
+                self._fits[(data_hash, group, dist_name, CI)] = fit
+                results[group][dist_name] = fit
+
+        while len(self._fits) > self.max_entries:
+            self._fits.popitem(last=False)
+        logging.info(f"적합 캐시: 적중 {self.hits}건, 새로 적합 {self.misses}건 (보관 {len(self._fits)}건)")
+        return results
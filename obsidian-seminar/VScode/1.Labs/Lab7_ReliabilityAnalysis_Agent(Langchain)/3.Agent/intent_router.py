@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+의도 라우터 (Intent Router)
+
+"데이터 요약해줘", "Weibull로 B10 구해줘"처럼 정형화된 요청도 ReAct 에이전트를 거치면
+도구가 실행되기 전에 LLM을 여러 번 호출하게 됩니다.
+IntentRouter는 AgentExecutor 앞에서 요청을 정규식으로 해석하여
+- 데이터 요약 / 최적 분포 탐색 / 분포 지정 B-수명·고장 확률 / 모수 동일성 검토 요청은 도구를 바로 실행하고,
+- 해석하지 못한 요청(설명, 이유 등 자유 질문)만 에이전트에게 넘깁니다.
+
+LLM, Streamlit에 의존하지 않으므로 도구와 에이전트를 가짜 객체로 바꿔 오프라인으로 시험할 수 있습니다.
+"""
+import logging
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SUMMARY, BEST, DETAIL, HOMOGENEITY = 'summary', 'best_distribution', 'detail', 'homogeneity'
+
+# 요청에 신뢰수준이 없을 때 사용하는 값 (도구의 기본값과 같습니다)
+DEFAULT_CI = 0.95
+
+# 의도별 실행 순서 (앞 단계 결과를 뒤 단계가 사용합니다)
+INTENT_ORDER = [SUMMARY, BEST, DETAIL, HOMOGENEITY]
+
+INTENT_TOOLS = {
+    SUMMARY: 'data_summarizer_tool',
+    BEST: 'best_distribution_finder_tool',
+    DETAIL: 'detailed_distribution_analyzer_tool',
+    HOMOGENEITY: 'parameter_homogeneity_checker_tool',
+}
+
+_INTENT_PATTERNS = {
+    SUMMARY: re.compile(r'요약|샘플\s*수|summar', re.IGNORECASE),
+    BEST: re.compile(r'최적|가장\s*잘\s*맞|분포\s*비교|best', re.IGNORECASE),
+    HOMOGENEITY: re.compile(r'동일성|homogeneity', re.IGNORECASE),
+}
+
+# 설명, 이유 등 자유 질문은 에이전트가 답합니다.
+_OPEN_ENDED = re.compile(r'왜|설명|의미|해석|어떻게|차이|\b(?:explain|why|how|what)\b', re.IGNORECASE)
+
+# 로그정규를 정규보다 먼저 찾아야 합니다.
+_DISTRIBUTION_PATTERNS = [
+    ('Lognormal_2P', re.compile(r'lognormal|로그\s*정규|로그\s*노멀', re.IGNORECASE)),
+    ('Exponential_1P', re.compile(r'exponential|지수', re.IGNORECASE)),
+    ('Normal_2P', re.compile(r'normal|정규|노멀', re.IGNORECASE)),
+    ('Weibull_2P', re.compile(r'weibull|와이블|웨이불', re.IGNORECASE)),
+]
+
+_B_LIFE = re.compile(r'(?<![A-Za-z])B\s?(\d+(?:\.\d+)?)(?![\d.])', re.IGNORECASE)
+_FAILURE_PROB = re.compile(r'고장\s*확률|불신뢰도|failure\s*prob', re.IGNORECASE)
+_TIME = re.compile(r'(\d+(?:\.\d+)?)\s*(?:시간|hours?\b|hrs?\b|h\b)', re.IGNORECASE)
+_CONFIDENCE = re.compile(r'(\d+(?:\.\d+)?)\s*%\s*(?:신뢰|confidence|CI\b)', re.IGNORECASE)
+
+
+@dataclass
+class Intent:
+    """요청에서 읽어낸 의도와 인자"""
+    kinds: List[str]
+    distributions: List[str] = field(default_factory=list)
+    b_lives: List[float] = field(default_factory=list)
+    failure_prob_times: List[float] = field(default_factory=list)
+    groups: List[str] = field(default_factory=list)
+    CI: float = DEFAULT_CI
+
+
+@dataclass
+class ToolCall:
+    """실행할 도구 이름과 인자"""
+    tool: str
+    args: Dict[str, Any]
+
+
+@dataclass
+class RoutedAction:
+    """에이전트의 intermediate_steps 항목과 같은 형태로 기록하는 실행 단계"""
+    tool: str
+    tool_input: Dict[str, Any]
+    log: str = 'intent_router'
+
+
+def _find_distributions(text: str) -> List[str]:
+    """요청에 나온 분포 이름을 등장 순서대로 반환합니다."""
+    found = []
+    for dist_name, pattern in _DISTRIBUTION_PATTERNS:
+        for match in pattern.finditer(text):
+            found.append((match.start(), dist_name))
+        # 'lognormal'의 'normal'이 다시 잡히지 않도록 찾은 부분을 지웁니다.
+        text = pattern.sub(lambda m: ' ' * len(m.group()), text)
+    ordered = []
+    for _, dist_name in sorted(found):
+        if dist_name not in ordered:
+            ordered.append(dist_name)
+    return ordered
+
+
+def _find_groups(text: str, group_names: Sequence[Any]) -> List[str]:
+    """요청에 이름이 나온 그룹 (B-수명, 시간, 신뢰수준 숫자는 제외하고 찾습니다)"""
+    text = _CONFIDENCE.sub(' ', _TIME.sub(' ', _B_LIFE.sub(' ', text)))
+    groups = []
+    for group in group_names:
+        name = str(group)
+        if re.search(rf'(?<![\w.]){re.escape(name)}(?![\d.])', text):
+            groups.append(name)
+    return groups
+
+
+def parse_intent(text: str, group_names: Sequence[Any] = ()) -> Optional[Intent]:
+    """
+    요청을 도구 실행 의도로 해석합니다. 자유 질문이거나 필요한 인자가 없으면 None을 반환합니다.
+
+    Args:
+        text: 사용자 요청
+        group_names: 현재 데이터의 그룹 이름 (요청에서 그룹을 찾을 때 사용)
+    """
+    if not text or _OPEN_ENDED.search(text):
+        return None
+
+    distributions = _find_distributions(text)
+    b_lives = [float(b) for b in _B_LIFE.findall(text)]
+    times = [float(t) for t in _TIME.findall(text)] if _FAILURE_PROB.search(text) else []
+    confidence = _CONFIDENCE.search(text)
+    CI = float(confidence.group(1)) / 100 if confidence else DEFAULT_CI
+    if not 0 < CI < 1:
+        return None
+
+    kinds = [kind for kind, pattern in _INTENT_PATTERNS.items() if pattern.search(text)]
+    if b_lives or times:
+        kinds.append(DETAIL)
+    if not kinds:
+        return None
+    # 상세 분석과 모수 동일성 검토는 분포를 하나로 지정해야 합니다.
+    if (DETAIL in kinds or HOMOGENEITY in kinds) and len(distributions) != 1:
+        return None
+
+    return Intent(
+        kinds=[kind for kind in INTENT_ORDER if kind in kinds], distributions=distributions,
+        b_lives=b_lives, failure_prob_times=times, groups=_find_groups(text, group_names), CI=CI
+    )
+
+
+def build_tool_calls(intent: Intent, kind: str, group_names: Sequence[Any]) -> List[ToolCall]:
+    """의도 하나를 도구 호출 목록으로 바꿉니다. 그룹을 지정하지 않은 상세 분석은 모든 그룹에 대해 실행합니다."""
+    tool_name = INTENT_TOOLS[kind]
+    if kind == SUMMARY:
+        return [ToolCall(tool_name, {})]
+    if kind == BEST:
+        return [ToolCall(tool_name, {'distributions_to_fit': intent.distributions})]
+    if kind == HOMOGENEITY:
+        return [ToolCall(tool_name, {'distribution_name': intent.distributions[0], 'CI': intent.CI})]
+    return [
+        ToolCall(tool_name, {
+            'group_name': str(group), 'distribution_name': intent.distributions[0],
+            'b_lives': intent.b_lives, 'failure_prob_times': intent.failure_prob_times, 'CI': intent.CI,
+        })
+        for group in (intent.groups or group_names)
+    ]
+
+
+def _present(value: Any) -> bool:
+    """표를 열 방향으로 이어 붙이며 생긴 빈 칸(NaN)이 아닌지 확인합니다."""
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+
+def _format_number(value: Any) -> str:
+    return f'{value:.4g}' if isinstance(value, float) else str(value)
+
+
+def _ci_label(call: ToolCall) -> str:
+    """도구 호출의 신뢰수준(CI 인자)으로 만든 신뢰구간 표시 (예: '90% 신뢰구간')"""
+    return f"{float(call.args.get('CI', DEFAULT_CI)) * 100:g}% 신뢰구간"
+
+
+def describe_observation(call: ToolCall, observation: Dict[str, Any]) -> str:
+    """도구 결과를 LLM 없이 한두 줄의 답변으로 요약합니다. (표와 그림은 app.py가 intermediate_steps로 표시합니다)"""
+    records = observation.get('dataframe') or []
+    if call.tool == INTENT_TOOLS[SUMMARY]:
+        failures = sum(row.get('Failures', 0) for row in records)
+        censored = sum(row.get('Censored', 0) for row in records)
+        return f"데이터 요약: 그룹 {len(records)}개, 고장 {failures}건, 관측중단 {censored}건입니다."
+    if call.tool == INTENT_TOOLS[BEST]:
+        best = ', '.join(f'{group}: {dist}' for group, dist in observation.get('best_distributions', {}).items())
+        return f"그룹별 최적 분포 (BIC 최소): {best}"
+    if call.tool == INTENT_TOOLS[HOMOGENEITY]:
+        rows = ', '.join(
+            f"{row['Group']}: {_format_number(row['Value'])} ({_format_number(row['Lower CI'])} ~ {_format_number(row['Upper CI'])})"
+            for row in records
+        )
+        parameter = records[0]['Parameter'] if records else ''
+        return f"그룹별 {parameter} 추정치 ({_ci_label(call)}): {rows}. 신뢰구간이 서로 겹치면 모수가 같다고 볼 수 있습니다."
+
+    lines = [f"그룹 {call.args['group_name']} - {call.args['distribution_name']} ({_ci_label(call)})"]
+    for row in records:
+        if _present(row.get('B-Life')):
+            lines.append(
+                f"  {row['B-Life']} = {_format_number(row['B-Life Value'])} "
+                f"({_format_number(row['B-Life Lower CI'])} ~ {_format_number(row['B-Life Upper CI'])})"
+            )
+    for row in records:
+        if _present(row.get('Time')):
+            lines.append(
+                f"  {_format_number(row['Time'])}시간 고장 확률 = {_format_number(row['Failure Probability'])} "
+                f"({_format_number(row['Failure Probability Lower CI'])} ~ {_format_number(row['Failure Probability Upper CI'])})"
+            )
+    return '\n'.join(lines)
+
+
+class IntentRouter:
+    """
+    AgentExecutor와 같은 invoke({"input": ...}) 인터페이스를 제공하는 라우터
+
+    Args:
+        agent_executor: 해석하지 못한 요청을 처리할 에이전트 (invoke를 지원하는 객체)
+        tools: 도구 이름 -> 도구 객체 (invoke(dict)를 지원하는 객체)
+        get_group_names: 현재 세션의 그룹 이름 목록을 반환하는 함수 (데이터 요약 전이면 빈 목록)
+        memory: 라우터가 처리한 대화도 기록할 대화 메모리 (save_context를 지원하는 객체, 선택)
+    """
+    def __init__(self, agent_executor, tools: Dict[str, Any],
+                 get_group_names: Callable[[], Sequence[Any]], memory=None):
+        self.agent_executor = agent_executor
+        self.tools = tools
+        self.get_group_names = get_group_names
+        self.memory = memory
+        self.routed = Counter()
+        self.fallbacks = 0
+
+    def _run(self, call: ToolCall, steps: list) -> Optional[Dict[str, Any]]:
+        observation = self.tools[call.tool].invoke(call.args)
+        steps.append((RoutedAction(call.tool, call.args), observation))
+        return observation
+
+    def _fallback(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.fallbacks += 1
+        return self.agent_executor.invoke(inputs)
+
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        text = inputs.get('input', '')
+        intent = parse_intent(text, self.get_group_names())
+        if intent is None:
+            return self._fallback(inputs)
+
+        start = time.perf_counter()
+        steps, answers = [], []
+        kinds = list(intent.kinds)
+        # 데이터 요약 전이면 먼저 요약하여 그룹 데이터를 만듭니다.
+        if SUMMARY not in kinds and not self.get_group_names():
+            kinds.insert(0, SUMMARY)
+
+        for kind in kinds:
+            group_names = self.get_group_names()
+            if kind == DETAIL and not intent.groups:
+                intent.groups = _find_groups(text, group_names)
+            for call in build_tool_calls(intent, kind, group_names):
+                observation = self._run(call, steps)
+                if not isinstance(observation, dict) or 'error' in observation:
+                    # 도구가 처리하지 못한 요청은 에이전트가 사용자에게 되묻거나 다른 방법을 찾습니다.
+                    logging.info(f"의도 라우터: {call.tool} 실패, 에이전트로 넘깁니다.")
+                    return self._fallback(inputs)
+                answers.append(describe_observation(call, observation))
+
+        output = '\n\n'.join(answers)
+        if self.memory is not None:
+            self.memory.save_context({'input': text}, {'output': output})
+        self.routed.update(intent.kinds)
+        logging.info(
+            f"의도 라우터: {intent.kinds} 요청을 LLM 없이 처리했습니다 "
+            f"({time.perf_counter() - start:.2f}초, 처리 {sum(self.routed.values())}건, 에이전트 {self.fallbacks}건)"
+        )
+        return {'input': text, 'output': output, 'intermediate_steps': steps}
@@ -0,0 +1,174 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from intent_router import (
+    BEST, DETAIL, HOMOGENEITY, SUMMARY, INTENT_TOOLS, ToolCall, build_tool_calls, describe_observation, parse_intent
+)
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "ALT_Chip_temperature.xlsx"
+GROUP_NAMES = [100, 150, 200]
+
+# 에이전트로 넘어간 요청에 스텁 LLM이 돌려주는 답변
+STUB_ANSWER = "스텁 에이전트 답변"
+
+
+class TestParseIntent:
+    """parse_intent() / build_tool_calls() 테스트 (한국어, 영어 예시 요청)."""
+
+    @pytest.mark.parametrize("text", ["데이터 요약해줘", "그룹별 샘플 수 알려줘", "Summarize the data"])
+    def test_summary(self, text):
+        intent = parse_intent(text, GROUP_NAMES)
+        assert intent.kinds == [SUMMARY]
+        assert build_tool_calls(intent, SUMMARY, GROUP_NAMES) == [ToolCall(INTENT_TOOLS[SUMMARY], {})]
+
+    @pytest.mark.parametrize("text", [
+        "와이블과 로그정규 중 최적 분포 찾아줘",
+        "Find the best distribution among Weibull and Lognormal",
+    ])
+    def test_best_distribution(self, text):
+        intent = parse_intent(text, GROUP_NAMES)
+        assert intent.kinds == [BEST]
+        calls = build_tool_calls(intent, BEST, GROUP_NAMES)
+        assert calls == [ToolCall(INTENT_TOOLS[BEST], {'distributions_to_fit': ['Weibull_2P', 'Lognormal_2P']})]
+
+    @pytest.mark.parametrize("text", [
+        "150 그룹 와이블 B10, B1 구해줘",
+        "Weibull B10 and B1 for group 150",
+    ])
+    def test_b_life_for_one_group(self, text):
+        intent = parse_intent(text, GROUP_NAMES)
+        assert intent.kinds == [DETAIL]
+        assert build_tool_calls(intent, DETAIL, GROUP_NAMES) == [ToolCall(INTENT_TOOLS[DETAIL], {
+            'group_name': '150', 'distribution_name': 'Weibull_2P',
+            'b_lives': [10.0, 1.0], 'failure_prob_times': [], 'CI': 0.95,
+        })]
+
+    def test_failure_probability_for_all_groups(self):
+        """그룹을 지정하지 않으면 모든 그룹에 대해 상세 분석을 실행한다."""
+        intent = parse_intent("로그정규 분포로 1000시간 고장 확률 구해줘", GROUP_NAMES)
+        calls = build_tool_calls(intent, DETAIL, GROUP_NAMES)
+        assert [call.args['group_name'] for call in calls] == ['100', '150', '200']
+        assert all(call.args['failure_prob_times'] == [1000.0] for call in calls)
+        assert all(call.args['distribution_name'] == 'Lognormal_2P' for call in calls)
+
+    @pytest.mark.parametrize("text, CI", [
+        ("와이블 분포로 형상모수 동일성 검토해줘", 0.95),
+        ("와이블 분포로 90% 신뢰구간 형상모수 동일성 검토해줘", 0.9),
+        ("Check Weibull parameter homogeneity with 80% confidence", 0.8),
+    ])
+    def test_homogeneity_confidence_level(self, text, CI):
+        intent = parse_intent(text, GROUP_NAMES)
+        assert intent.kinds == [HOMOGENEITY]
+        assert build_tool_calls(intent, HOMOGENEITY, GROUP_NAMES) == [
+            ToolCall(INTENT_TOOLS[HOMOGENEITY], {'distribution_name': 'Weibull_2P', 'CI': CI})
+        ]
+
+    def test_confidence_level_is_not_a_group(self):
+        """신뢰수준 숫자(예: 90%)는 그룹 이름으로 해석하지 않는다."""
+        intent = parse_intent("Weibull B10 for group 100 with 90% confidence", [90, 100])
+        assert intent.groups == ['100']
+        assert intent.CI == pytest.approx(0.9)
+
+    @pytest.mark.parametrize("text", [
+        "와이블 분포가 왜 가장 잘 맞는지 설명해줘",
+        "Explain what B10 life means",
+        "안녕하세요",
+        "B10 구해줘",                       # 분포 미지정
+        "와이블과 정규 분포로 동일성 검토해줘",  # 분포가 둘
+    ])
+    def test_unmatched_requests(self, text):
+        assert parse_intent(text, GROUP_NAMES) is None
+
+
+class TestDescribeObservation:
+    """describe_observation() 테스트."""
+
+    def test_homogeneity_label_uses_call_confidence_level(self):
+        records = [{'Group': 100, 'Parameter': 'beta', 'Value': 2.0, 'Lower CI': 1.5, 'Upper CI': 2.5}]
+        call = ToolCall(INTENT_TOOLS[HOMOGENEITY], {'distribution_name': 'Weibull_2P', 'CI': 0.9})
+        assert "90% 신뢰구간" in describe_observation(call, {'dataframe': records})
+        call = ToolCall(INTENT_TOOLS[HOMOGENEITY], {'distribution_name': 'Weibull_2P'})
+        assert "95% 신뢰구간" in describe_observation(call, {'dataframe': records})
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """작업 폴더를 임시 폴더로 옮기고(결과 그림, Excel 사이드카 저장 위치) 세션 상태를 비운다."""
+    st = pytest.importorskip("streamlit")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results").mkdir()
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+@pytest.fixture
+def uploaded_session(session, tmp_path):
+    """ALT_Chip_temperature.xlsx를 업로드하고 컬럼 설정을 마친 세션 상태를 만든다."""
+    from upload_store import file_sha256
+
+    data_path = tmp_path / DATA_PATH.name
+    shutil.copy(DATA_PATH, data_path)
+    session.update(
+        uploaded_file_path=str(data_path), uploaded_file_hash=file_sha256(data_path.read_bytes()),
+        column_map={'time': 'time', 'status': 'censor', 'stress': 'temp'},
+        status_indicators={'failure': 0, 'censored': 1},
+    )
+    return session
+
+
+@pytest.fixture
+def router(session):
+    """스텁 LLM으로 만든 에이전트 실행기 (의도 라우터)."""
+    pytest.importorskip("langchain")
+    fake_models = pytest.importorskip("langchain_core.language_models.fake_chat_models")
+    from agent import create_agent_executor
+
+    llm = fake_models.FakeListChatModel(
+        responses=[f"Thought: Do I need to use a tool? No\nFinal Answer: {STUB_ANSWER}"]
+    )
+    return create_agent_executor(llm=llm)
+
+
+class TestRouterWithAgent:
+    """create_agent_executor(llm=스텁 LLM)로 만든 라우터의 처리 / 에이전트 위임 테스트."""
+
+    @pytest.mark.parametrize("text", ["와이블 분포가 왜 가장 잘 맞는지 설명해줘", "Explain what B10 life means"])
+    def test_unmatched_request_goes_to_agent(self, router, text):
+        result = router.invoke({"input": text})
+        assert result["output"] == STUB_ANSWER
+        assert router.fallbacks == 1
+        assert sum(router.routed.values()) == 0
+
+    def test_failing_tool_goes_to_agent(self, router):
+        """파일을 업로드하기 전에는 도구가 오류를 반환하므로 에이전트가 처리한다."""
+        result = router.invoke({"input": "데이터 요약해줘"})
+        assert result["output"] == STUB_ANSWER
+        assert router.fallbacks == 1
+
+    def test_unknown_group_goes_to_agent(self, uploaded_session, router):
+        """데이터에 없는 그룹이라 상세 분석 도구가 실패하면 에이전트가 처리한다."""
+        router.get_group_names = lambda: ['999']
+        result = router.invoke({"input": "와이블 999 그룹 B10 구해줘"})
+        assert result["output"] == STUB_ANSWER
+        assert router.fallbacks == 1
+
+    @pytest.mark.parametrize("text", ["데이터 요약해줘", "Summarize the data"])
+    def test_summary_is_routed(self, uploaded_session, router, text):
+        result = router.invoke({"input": text})
+        assert result["output"].startswith("데이터 요약: 그룹 3개")
+        assert router.fallbacks == 0
+        assert [action.tool for action, _ in result["intermediate_steps"]] == [INTENT_TOOLS[SUMMARY]]
+
+    def test_homogeneity_is_routed_with_confidence_level(self, uploaded_session, router):
+        """데이터 요약 전이면 요약을 먼저 실행하고, 요청한 신뢰수준으로 동일성 검토 결과를 표시한다."""
+        result = router.invoke({"input": "와이블 분포로 90% 신뢰구간 형상모수 동일성 검토해줘"})
+        assert router.fallbacks == 0
+        assert [action.tool for action, _ in result["intermediate_steps"]] == [
+            INTENT_TOOLS[SUMMARY], INTENT_TOOLS[HOMOGENEITY]
+        ]
+        assert "beta 추정치 (90% 신뢰구간)" in result["output"]
+        fits = uploaded_session['detailed_analysis_results']
+        assert all(group_fits['Weibull_2P'].CI == 0.9 for group_fits in fits.values())
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+도구 호출 메모이제이션
+
+ReAct 에이전트는 한 번의 답변 안에서도 data_summarizer_tool, best_distribution_finder_tool 등을
+같은 입력으로 다시 호출하는 경우가 많습니다.
+ToolCallMemo는 (도구 이름, 정규화한 인자, 데이터셋 키)별로 관측 결과(observation)를 보관하여,
+같은 세션에서 반복된 호출은 도구를 다시 실행하지 않고 이전 결과를 바로 돌려줍니다.
+도구가 세션 상태(st.session_state)에 쓰는 값도 관측 결과와 함께 보관했다가, 재사용할 때 다시 써 둡니다.
+(다른 도구가 같은 키를 덮어쓴 뒤에 재사용해도 세션 상태가 이 호출의 결과와 일치합니다)
+도구별 적중/실행 횟수를 기록하므로 얼마나 자주 재사용되는지 확인할 수 있습니다.
+"""
+import copy
+import json
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, MutableMapping, Optional, Sequence
+
+DEFAULT_MAX_ENTRIES = 128
+
+# 재사용한 관측 결과에 덧붙여, 에이전트가 같은 호출을 되풀이하지 않도록 알려주는 문구
+REUSED_NOTE = "이 세션에서 같은 입력으로 이미 실행한 도구입니다. 이전 결과를 그대로 반환합니다. 같은 호출을 반복하지 마세요."
+
+
+def _normalize(value: Any) -> Any:
+    """LLM이 보낸 인자를 비교할 수 있는 형태로 바꿉니다. (JSON 문자열 해석, 공백 제거, dict 키 정렬, None 인자 제외)"""
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in ('{', '['):
+            try:
+                return _normalize(json.loads(text.replace("'", '"')))
+            except json.JSONDecodeError:
+                pass
+        return text
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0])) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def normalize_args(kwargs: Dict[str, Any]) -> str:
+    """도구 인자를 정규화한 JSON 문자열 (캐시 키)"""
+    return json.dumps(_normalize(kwargs), ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ToolCallMemo:
+    """
+    (도구 이름, 정규화한 인자, 데이터셋 키) -> 관측 결과 LRU 캐시
+
+    hits/calls는 도구 이름별 재사용 / 실제 실행 횟수입니다.
+    오류를 담은 결과({"error": ...})는 선행 단계가 끝난 뒤 다시 시도할 수 있도록 보관하지 않습니다.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._observations = OrderedDict()
+        self.hits = Counter()
+        self.calls = Counter()
+
+    def __len__(self):
+        return len(self._observations)
+
+    def clear(self):
+        self._observations.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """도구별 {'hits': 재사용 횟수, 'calls': 실제 실행 횟수}"""
+        return {name: {'hits': self.hits[name], 'calls': self.calls[name]}
+                for name in sorted(set(self.hits) | set(self.calls))}
+
+    def call(self, tool_name: str, kwargs: Dict[str, Any], data_key: Hashable, func: Callable[..., Any],
+             state: Optional[MutableMapping] = None, state_keys: Sequence[str] = ()) -> Any:
+        """
+        같은 (도구, 인자, 데이터셋) 호출의 결과가 있으면 재사용하고, 없으면 func(**kwargs)를 실행해 보관합니다.
+
+        state_keys는 도구가 state(세션 상태)에 쓰는 키입니다. 실행 직후의 값을 관측 결과와 함께 보관하고,
+        재사용할 때 state에 다시 써 둡니다.
+        """
+        key = (tool_name, normalize_args(kwargs), data_key)
+        if key in self._observations:
+            self._observations.move_to_end(key)
+            self.hits[tool_name] += 1
+            logging.info(f"도구 호출 재사용: {tool_name} (적중 {self.hits[tool_name]}회, 실행 {self.calls[tool_name]}회)")
+            observation, state_values = self._observations[key]
+            if state is not None:
+                state.update(state_values)
+            observation = copy.copy(observation)
+            if isinstance(observation, dict):
+                observation['note'] = REUSED_NOTE
+            return observation
+
+        self.calls[tool_name] += 1
+        observation = func(**kwargs)
+        if not (isinstance(observation, dict) and 'error' in observation):
+            state_values = {name: state[name] for name in state_keys if name in state} if state is not None else {}
+            self._observations[key] = (observation, state_values)
+            while len(self._observations) > self.max_entries:
+                self._observations.popitem(last=False)
+        return observation
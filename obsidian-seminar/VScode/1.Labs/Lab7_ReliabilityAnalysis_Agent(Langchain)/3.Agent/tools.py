@@ -1,22 +1,61 @@
 # tools.py
-import io
-import os
+import functools
+import inspect
 import json
 import re
-import contextlib
 from typing import Dict, Any, List, Union
 
 import streamlit as st
 from langchain.tools import tool
-import pandas as pd
 
 from RA_code_v6 import (
-    preprocess_and_summarize_data, find_best_distribution,
-    analyze_single_distribution, check_parameter_homogeneity, setup_environment
+    find_best_distribution, analyze_single_distribution, check_parameter_homogeneity, setup_environment
 )
+from fit_cache import FitCache
+from tool_memo import ToolCallMemo
+from upload_store import load_grouped_data
 
 setup_environment()
 
+def get_fit_cache() -> FitCache:
+    """세션별 적합 결과 캐시를 반환합니다. 모든 도구가 같은 캐시를 사용하므로 같은 (그룹, 분포)는 한 번만 적합합니다."""
+    if 'fit_cache' not in st.session_state:
+        st.session_state['fit_cache'] = FitCache()
+    return st.session_state['fit_cache']
+
+def get_tool_memo() -> ToolCallMemo:
+    """세션별 도구 호출 메모를 반환합니다."""
+    if 'tool_memo' not in st.session_state:
+        st.session_state['tool_memo'] = ToolCallMemo()
+    return st.session_state['tool_memo']
+
+def current_dataset_key():
+    """현재 분석 대상 데이터셋을 구분하는 키: (업로드 파일 해시, 컬럼 설정, 상태 지시자)"""
+    return (
+        st.session_state.get('uploaded_file_hash'),
+        tuple((st.session_state.get('column_map') or {}).items()),
+        tuple((st.session_state.get('status_indicators') or {}).items()),
+    )
+
+def memoize_tool_call(*session_keys: str):
+    """
+    같은 세션에서 (도구, 정규화한 인자, 데이터셋)이 같은 호출은 도구를 다시 실행하지 않고 이전 관측 결과를 반환합니다.
+    session_keys는 도구가 st.session_state에 쓰는 키로, 재사용할 때도 이 호출이 썼던 값으로 다시 써 둡니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return get_tool_memo().call(
+                func.__name__, dict(bound.arguments), current_dataset_key(), func,
+                state=st.session_state, state_keys=session_keys
+            )
+        return wrapper
+    return decorator
+
 # --- Argument Parsing Helper Functions ---
 
 def parse_string_input(input_data: Union[str, dict]) -> str:
@@ -58,6 +97,15 @@ def parse_blives_input(input_data: Union[List, str, None]) -> List[float]:
         
     return []
 
+def parse_ci_input(input_data: Union[float, str, None]) -> float:
+    """신뢰수준을 0~1 사이의 값으로 바꿉니다. ('90%', 90, 0.9 모두 0.9)"""
+    if input_data is None or input_data == "": return 0.95
+    value = float(str(input_data).strip().rstrip('%'))
+    if value > 1: value /= 100
+    if not 0 < value < 1:
+        raise ValueError(f"신뢰수준은 0과 1 사이의 값이어야 합니다: {input_data}")
+    return value
+
 def parse_list_input(input_data: Union[List, str, None]) -> List:
     if input_data is None: return []
     if isinstance(input_data, list): return input_data
@@ -74,39 +122,27 @@ def parse_list_input(input_data: Union[List, str, None]) -> List:
 # --- Tools ---
 
 @tool
+@memoize_tool_call('grouped_data')
 def data_summarizer_tool() -> Dict[str, Any]:
     """사용자가 데이터 요약, 전처리, 또는 그룹별 샘플 수 확인을 요청할 때 사용합니다."""
     st.write("🧰 **Tool Executing:** `data_summarizer_tool`")
-    required_keys = ['uploaded_file_path', 'column_map', 'status_indicators']
+    required_keys = ['uploaded_file_path', 'uploaded_file_hash', 'column_map', 'status_indicators']
     if not all(key in st.session_state and st.session_state[key] for key in required_keys):
         return {"error": "파일 업로드 및 컬럼 설정이 완료되지 않았습니다."}
     try:
-        output_buffer = io.StringIO()
-        with contextlib.redirect_stdout(output_buffer):
-            grouped_data_from_func, summary_df = preprocess_and_summarize_data(
-                file_path=st.session_state['uploaded_file_path'],
-                column_map=st.session_state['column_map'],
-                status_indicators=st.session_state['status_indicators']
-            )
-        
-        # --- 데이터 형식 보정 로직 --- #
-        # preprocess_and_summarize_data가 반환하는 값의 형식이 pandas Series일 수 있으므로,
-        # 모든 도구가 안정적으로 사용할 수 있는 순수 Python list로 변환합니다.
-        cleaned_grouped_data = {}
-        for group, data in grouped_data_from_func.items():
-            cleaned_grouped_data[group] = {
-                'failures': list(data['failures']),
-                'right_censored': list(data['right_censored'])
-            }
-
-        st.session_state['grouped_data'] = cleaned_grouped_data
-        # --- 보정 로직 끝 --- #
-
-        return {"dataframe": summary_df.to_dict('records'), "summary_text": output_buffer.getvalue()}
+        # 그룹별 고장/관측중단 시간 배열은 (파일 해시, 설정)별로 st.cache_data에 한 번만 만들어 둡니다.
+        grouped_data, summary_df = load_grouped_data(
+            st.session_state['uploaded_file_hash'], st.session_state['uploaded_file_path'],
+            tuple(st.session_state['column_map'].items()),
+            tuple(st.session_state['status_indicators'].items())
+        )
+        st.session_state['grouped_data'] = grouped_data
+        return {"dataframe": summary_df.to_dict('records')}
     except Exception as e:
         return {"error": f"데이터 요약 중 오류 발생: {e}"}
 
 @tool
+@memoize_tool_call('detailed_analysis_results')
 def best_distribution_finder_tool(distributions_to_fit: Union[List[str], str]) -> Dict[str, Any]:
     """사용자가 주어진 데이터셋에 대해서 최적 수명분포, 가장 잘 맞는 분포, 또는 여러 분포 비교를 요청할 때 사용합니다."""
     st.write(f"🧰 **Tool Executing:** `best_distribution_finder_tool`")
@@ -119,23 +155,28 @@ def best_distribution_finder_tool(distributions_to_fit: Union[List[str], str]) -
     if 'grouped_data' not in st.session_state:
         return {"error": "데이터가 먼저 요약되어야 합니다."}
     try:
-        output_buffer = io.StringIO()
-        with contextlib.redirect_stdout(output_buffer):
-            analysis_results, bic_df = find_best_distribution(st.session_state['grouped_data'], distributions)
-        st.session_state['detailed_analysis_results'] = analysis_results
-        plot_paths = [os.path.join("results", f) for f in ["probability_plot_all_groups.png", "BIC_comparison.png"]]
-        return {"dataframe": bic_df.to_dict('records'), "results_text": output_buffer.getvalue(), "plot_paths": plot_paths}
+        result = find_best_distribution(
+            st.session_state['grouped_data'], distributions, fit_cache=get_fit_cache()
+        )
+        st.session_state['detailed_analysis_results'] = result.fits
+        return {
+            "dataframe": result.bic_table.to_dict('records'),
+            "best_distributions": {str(group): dist for group, dist in result.best_distributions().items()},
+            "plot_paths": result.plot_paths
+        }
     except Exception as e:
         return {"error": f"최적 분포 탐색 중 오류 발생: {e}"}
 
 @tool
+@memoize_tool_call()
 def detailed_distribution_analyzer_tool(
     group_name: Union[str, dict] = None, 
     distribution_name: str = None, 
     b_lives: Union[List, str] = None, 
-    failure_prob_times: Union[List, str] = None
+    failure_prob_times: Union[List, str] = None,
+    CI: Union[float, str] = 0.95
 ) -> Dict[str, Any]:
-    """사용자가 특정 그룹과 분포에 대해 상세 분석, B-수명(B10 등), 또는 고장 확률 계산을 요청할 때 사용합니다. 'group_name'과 'distribution_name'은 필수입니다. 사용자가 그룹 이름을 지정하지 않으면, 다시 질문해야 합니다."""
+    """사용자가 특정 그룹과 분포에 대해 상세 분석, B-수명(B10 등), 또는 고장 확률 계산을 요청할 때 사용합니다. 'group_name'과 'distribution_name'은 필수입니다. 사용자가 그룹 이름을 지정하지 않으면, 다시 질문해야 합니다. 'CI'는 신뢰수준(기본값 0.95)입니다."""
     st.write(f"🧰 **Tool Executing:** `detailed_distribution_analyzer_tool`")
     
     args = {}
@@ -153,65 +194,40 @@ def detailed_distribution_analyzer_tool(
     try:
         b_lives_list = parse_blives_input(args.get('b_lives', b_lives))
         failure_prob_times_list = [float(x) for x in parse_list_input(args.get('failure_prob_times', failure_prob_times))]
+        confidence = parse_ci_input(args.get('CI', CI))
     except Exception as e:
-        return {"error": f"B-수명 또는 고장 확률 시간 리스트 파싱 중 오류: {e}"}
+        return {"error": f"B-수명, 고장 확률 시간 리스트 또는 신뢰수준 파싱 중 오류: {e}"}
 
     if 'grouped_data' not in st.session_state:
         return {"error": "데이터가 먼저 요약되어야 합니다."}
         
     try:
-        output_buffer = io.StringIO()
-        with contextlib.redirect_stdout(output_buffer):
-            # 1. analyze_single_distribution으로부터 fitter 객체를 직접 받음
-            fitter_obj = analyze_single_distribution(
-                st.session_state['grouped_data'], str(final_group_name), final_dist_name, 
-                b_lives_list, failure_prob_times_list
-            )
-        
-        # 2. fitter 객체의 .results 속성을 사용하여 DataFrame을 생성
-        # 이 부분은 RA_code_v6.py의 analyze_single_distribution이 fitter를 반환한 후
-        # print하던 로직을 tool로 옮겨온 것과 같습니다.
-        results = {}
-        params, values = [], []
-        if final_dist_name == "Weibull_2P":
-            params.extend(['Alpha', 'Beta'])
-            values.extend([fitter_obj.alpha, fitter_obj.beta])
-        elif final_dist_name in ["Lognormal_2P", "Normal_2P"]:
-            params.extend(['Mu', 'Sigma'])
-            values.extend([fitter_obj.mu, fitter_obj.sigma])
-        elif final_dist_name == "Exponential_1P":
-            params.append('Lambda')
-            values.append(fitter_obj.Lambda)
-        results['Parameter'] = params
-        results['Value'] = values
-
-        if b_lives_list:
-            b_life_values = [fitter_obj.distribution.quantile(b/100) for b in b_lives_list]
-            results['B-Life'] = [f'B{b}' for b in b_lives_list]
-            results['B-Life Value'] = b_life_values
-            
-        if failure_prob_times_list:
-            probs = [fitter_obj.distribution.CDF(t, show_plot=False) for t in failure_prob_times_list]
-            results['Time'] = failure_prob_times_list
-            results['Failure Probability'] = probs
-
-        results_df = pd.DataFrame({k: pd.Series(v) for k, v in results.items()})
-
-        plot_path = os.path.join("results", f"probability_plot_{final_group_name}_{final_dist_name}.png")
-        return {"dataframe": results_df.to_dict('records'), "results_text": output_buffer.getvalue(), "plot_path": plot_path}
+        # analyze_single_distribution이 모수, B-수명, 고장 확률 표를 담은 결과 객체를 반환합니다.
+        result = analyze_single_distribution(
+            st.session_state['grouped_data'], str(final_group_name), final_dist_name,
+            b_lives_list, failure_prob_times_list, fit_cache=get_fit_cache(), CI=confidence
+        )
+        return {
+            "dataframe": result.to_frame().to_dict('records'),
+            "parameters": result.parameters.to_dict('records'),
+            "plot_path": result.plot_path
+        }
     except Exception as e:
         return {"error": f"상세 분포 분석 중 오류 발생: {e}"}
 
 @tool
-def parameter_homogeneity_checker_tool(distribution_name: Union[str, dict]) -> Dict[str, Any]:
+@memoize_tool_call('detailed_analysis_results')
+def parameter_homogeneity_checker_tool(distribution_name: Union[str, dict], CI: Union[float, str] = 0.95) -> Dict[str, Any]:
     """사용자가 특정 분포(Weibull, Lognormal, Normal)를 지정하여 그룹 간 형상모수의 동일성 검토를 요청할 때 사용합니다.
-    내부적으로 각 그룹에 대해 해당 분포로 상세 분석을 수행한 후, 그 결과를 바탕으로 모수 동일성을 검토합니다."""
+    내부적으로 각 그룹에 대해 해당 분포로 상세 분석을 수행한 후, 그 결과를 바탕으로 모수 동일성을 검토합니다.
+    'CI'는 형상모수 신뢰구간의 신뢰수준(기본값 0.95)입니다."""
     st.write(f"🧰 **Tool Executing:** `parameter_homogeneity_checker_tool`")
 
     try:
         dist_name_str = parse_string_input(distribution_name).lower()
+        confidence = parse_ci_input(CI)
     except Exception as e:
-        return {"error": f"분포 이름 파싱 중 오류: {e}"}
+        return {"error": f"분포 이름 또는 신뢰수준 파싱 중 오류: {e}"}
 
     # 1. 분포 이름에 따라 검정할 파라미터와 fitter 이름을 결정
     if 'weibull' in dist_name_str:
@@ -233,22 +249,13 @@ def parameter_homogeneity_checker_tool(distribution_name: Union[str, dict]) -> D
 
     grouped_data = st.session_state['grouped_data']
     
-    # 2. 각 그룹에 대해 개별 상세 분석을 수행하여 detailed_analysis_results 객체 생성
-    st.write(f"⏳ 각 그룹에 대해 '{selected_dist}' 분포로 상세 분석을 수행합니다...")
-    detailed_analysis_results = {}
+    # 2. 각 그룹의 적합 결과를 세션 적합 캐시에서 가져와 detailed_analysis_results 객체 생성
+    #    (이미 최적 분포 탐색이나 상세 분석에서 적합한 그룹은 다시 적합하지 않습니다)
+    st.write(f"⏳ 각 그룹에 대해 '{selected_dist}' 분포 적합 결과를 준비합니다...")
     try:
-        for group_name in grouped_data.keys():
-            with io.StringIO() as buf, contextlib.redirect_stdout(buf):
-                fitter_result = analyze_single_distribution(
-                    grouped_data=grouped_data,
-                    group_name=group_name,
-                    distribution_name=selected_dist,
-                    b_lives=[],
-                    failure_prob_times=[]
-                )
-            # check_parameter_homogeneity가 기대하는 이중 딕셔너리 구조로 저장
-            detailed_analysis_results[group_name] = {selected_dist: fitter_result}
-            #detailed_analysis_results[group_name] = fitter_result
+        fits = get_fit_cache().get_fits(grouped_data, grouped_data.keys(), [selected_dist], CI=confidence)
+        # check_parameter_homogeneity가 기대하는 이중 딕셔너리 구조로 저장
+        detailed_analysis_results = {group_name: group_fits for group_name, group_fits in fits.items() if group_fits}
 
         st.session_state['detailed_analysis_results'] = detailed_analysis_results
         st.write("✅ 모든 그룹의 상세 분석 완료.")
@@ -292,18 +299,10 @@ def parameter_homogeneity_checker_tool(distribution_name: Union[str, dict]) -> D
     # 3. 생성된 결과를 바탕으로 모수 동일성 검정 실행
     st.write(f"🔬 최종 '{parameter_to_check}' 모수 동일성 검정을 실행합니다...")
     try:
-        output_buffer = io.StringIO()
-        with contextlib.redirect_stdout(output_buffer):
-            results_df = check_parameter_homogeneity(
-                analysis_results=detailed_analysis_results,
-                parameter_to_check=parameter_to_check
-            )
-        
-        plot_path = os.path.join("results", f"contour_plot_{parameter_to_check}.png")
-        return {
-            "dataframe": results_df.to_dict('records'), 
-            "results_text": output_buffer.getvalue(), 
-            "plot_path": plot_path
-        }
+        result = check_parameter_homogeneity(
+            analysis_results=detailed_analysis_results,
+            parameter_to_check=parameter_to_check
+        )
+        return {"dataframe": result.table.to_dict('records'), "plot_path": result.plot_path}
     except Exception as e:
         return {"error": f"모수 동일성 검토 중 오류 발생: {e}"}
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+업로드 데이터 저장소
+
+Streamlit은 채팅 메시지를 보낼 때마다 app.py 전체를 다시 실행합니다.
+업로드 파일을 매번 temp/에 다시 쓰고 다시 읽지 않도록, 모든 처리를 파일 내용의 SHA-256 해시 기준으로 한 번만 수행합니다.
+
+- save_upload: 업로드 파일을 temp/<해시>_<파일 이름>으로 저장합니다. 같은 내용의 파일이 이미 있으면 쓰지 않습니다.
+- load_dataframe: (해시, 경로)별로 파일을 한 번만 읽어 st.cache_data에 보관합니다.
+- load_grouped_data: (해시, 컬럼 설정, 상태 지시자)별 그룹 데이터(NumPy 배열)와 요약 표를 st.cache_data에 보관합니다.
+"""
+import hashlib
+import os
+from typing import Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from excel_cache import read_excel_cached
+from RA_code_v6 import group_lifetime_data
+
+TEMP_DIR = "temp"
+
+
+def file_sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def save_upload(content: bytes, file_name: str, file_hash: str, temp_dir: str = TEMP_DIR) -> str:
+    """업로드 파일을 해시가 붙은 이름으로 저장하고 경로를 반환합니다. 이미 저장된 파일이면 다시 쓰지 않습니다."""
+    file_path = os.path.join(temp_dir, f"{file_hash[:16]}_{os.path.basename(file_name)}")
+    if not os.path.exists(file_path):
+        os.makedirs(temp_dir, exist_ok=True)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    return file_path
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_dataframe(file_hash: str, file_path: str) -> pd.DataFrame:
+    """파일 내용 해시별로 한 번만 읽습니다. (file_hash는 캐시 키로만 사용합니다)"""
+    return read_excel_cached(file_path) if file_path.endswith('.xlsx') else pd.read_csv(file_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_grouped_data(
+    file_hash: str, file_path: str,
+    column_map: Tuple[Tuple[str, str], ...], status_indicators: Tuple[Tuple[str, str], ...]
+) -> Tuple[Dict[Hashable, Dict[str, np.ndarray]], pd.DataFrame]:
+    """
+    (파일 해시, 컬럼 설정, 상태 지시자)별 그룹 데이터와 요약 표를 반환합니다.
+    column_map, status_indicators는 캐시 키로 쓸 수 있도록 dict.items()의 튜플로 전달합니다.
+    """
+    return group_lifetime_data(load_dataframe(file_hash, file_path), dict(column_map), dict(status_indicators))
@@ -0,0 +1,47 @@
+"""
+세션별 분석 컨텍스트
+
+app_v2.py의 도구, 에이전트, 워크플로우는 st.cache_resource로 프로세스당 한 번만 만들어 모든 세션이 공유합니다.
+따라서 도구가 st.session_state를 클로저로 잡아둘 수 없으므로, 채팅 요청을 처리하는 동안
+현재 세션의 AnalysisContext를 ContextVar에 설정하고 도구는 current_context()로 읽습니다.
+
+Streamlit은 재실행할 때마다 app_v2.py를 새로 실행하므로, 캐시된 도구와 같은 ContextVar를 쓰도록
+컨텍스트는 별도 모듈(한 번만 import됨)에 둡니다.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+
+@dataclass
+class AnalysisContext:
+    """한 세션의 분석 데이터와 설정"""
+    failures: np.ndarray
+    right_censored: np.ndarray
+    p_values: List[float] = field(default_factory=list)
+    t_values: List[float] = field(default_factory=list)
+    cl: float = 0.95
+
+
+_analysis_context: ContextVar[AnalysisContext] = ContextVar("analysis_context")
+
+
+def current_context() -> AnalysisContext:
+    """현재 요청을 보낸 세션의 분석 컨텍스트"""
+    try:
+        return _analysis_context.get()
+    except LookupError:
+        raise ValueError("분석할 데이터가 설정되지 않았습니다. 데이터 파일을 먼저 업로드해주세요.")
+
+
+@contextmanager
+def use_context(context: AnalysisContext):
+    """with 블록 안에서 실행되는 도구가 context를 읽도록 설정합니다."""
+    token = _analysis_context.set(context)
+    try:
+        yield context
+    finally:
+        _analysis_context.reset(token)
@@ -1,15 +1,9 @@
 import streamlit as st
 import pandas as pd
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 import numpy as np
 import reliability
-from reliability.Fitters import (
-    Fit_Weibull_2P,
-    Fit_Lognormal_2P,
-    Fit_Exponential_1P,
-    Fit_Normal_2P,
-    Fit_Gamma_2P
-)
+from reliability.Fitters import Fit_Gamma_2P
 from reliability.Probability_plotting import (
     Weibull_probability_plot,
     Lognormal_probability_plot,
@@ -20,14 +14,29 @@ from reliability.Probability_plotting import (
 import matplotlib.pyplot as plt
 import io
 import os
+import threading
 from functools import partial
 
+from excel_cache import read_excel_cached
+# Gamma_2P를 제외한 후보 분포는 reliability 피터와 같은 결과를 내는 NumPy MLE 엔진으로 적합합니다.
+from mle_fitters import Fit_Weibull_2P, Fit_Lognormal_2P, Fit_Exponential_1P, Fit_Normal_2P
+from dist_registry import canonical_name
+from fitted_model import BicResult, FittedModel, PARAMETER_NAMES, bic_results_frame
+from plot_store import prune_plots, save_plot
+from analysis_context import AnalysisContext, current_context, use_context
+from graph_checkpoint import (
+    analysis_thread_id, dataset_key, node_cache_policy, open_checkpointer, open_node_cache, prune_checkpoints
+)
+
 # --- LangChain 및 LangGraph 관련 임포트 ---
 from langchain.agents import Tool, AgentExecutor, create_tool_calling_agent
+from langchain.tools import tool
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
-from typing_extensions import TypedDict
+from typing_extensions import Annotated, TypedDict
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 
 # --- 0. 환경 설정 및 API 키 확인 ---
 # .env 파일이 있다면 로드 (예: 로컬 개발 환경)
@@ -46,28 +55,28 @@ if 'GOOGLE_API_KEY' not in os.environ:
         st.stop()
 
 # --- 1. 데이터 전처리 함수 ---
-def load_and_preprocess_data(uploaded_file) -> Tuple[List[float], List[float]]:
+def load_and_preprocess_data(uploaded_file) -> Tuple[np.ndarray, np.ndarray]:
     """
-    업로드된 파일을 읽고 전처리하여 failures와 right_censored 리스트를 생성합니다.
+    업로드된 파일을 읽고 전처리하여 failures와 right_censored 배열(float64)을 생성합니다.
     """
     try:
         if uploaded_file.name.endswith('.csv'):
             df = pd.read_csv(uploaded_file)
         else:
-            df = pd.read_excel(uploaded_file)
+            df = read_excel_cached(uploaded_file.getvalue())
     except Exception as e:
         raise ValueError(f"파일을 읽는 중 오류가 발생했습니다: {e}")
 
     if 'time' not in df.columns or 'censor' not in df.columns:
         raise ValueError("데이터에 'time'과 'censor' 컬럼이 모두 포함되어야 합니다.")
 
-    failures = df[df['censor'] == 0]['time'].tolist()
-    right_censored = df[df['censor'] == 1]['time'].tolist()
+    failures = df.loc[df['censor'] == 0, 'time'].to_numpy(dtype=float)
+    right_censored = df.loc[df['censor'] == 1, 'time'].to_numpy(dtype=float)
     return failures, right_censored
 
 # --- 2. 핵심 분석 도구 함수 ---
 # 함수 이름 변경 (func -> func_name)하여 @tool로 정의된 도구와 구분
-def summarize_data_func(failures: list, right_censored: list) -> dict:
+def summarize_data_func(failures: np.ndarray, right_censored: np.ndarray) -> dict:
     """
     데이터의 기본 통계 정보를 요약합니다.
     """
@@ -75,119 +84,104 @@ def summarize_data_func(failures: list, right_censored: list) -> dict:
     num_right_censored = len(right_censored)
     total_samples = num_failures + num_right_censored
     censoring_rate = (num_right_censored / total_samples) * 100 if total_samples > 0 else 0
-    all_data = failures + right_censored
+    all_data = np.concatenate([np.asarray(failures, dtype=float), np.asarray(right_censored, dtype=float)])
+    has_data = all_data.size > 0
     stats = {
         "총 샘플 수": total_samples, "고장 수": num_failures,
         "우측관측중단 수": num_right_censored, "중도절단 비율 (%)": f"{censoring_rate:.2f}",
-        "평균": np.mean(all_data) if all_data else 0, "표준편차": np.std(all_data) if all_data else 0,
-        "최소값": np.min(all_data) if all_data else 0, "최대값": np.max(all_data) if all_data else 0,
+        "평균": np.mean(all_data) if has_data else 0, "표준편차": np.std(all_data) if has_data else 0,
+        "최소값": np.min(all_data) if has_data else 0, "최대값": np.max(all_data) if has_data else 0,
     }
     return stats
 
-def find_best_distribution_func(failures: list, right_censored: list) -> dict:
+# 후보 분포별 피터
+CANDIDATE_DISTRIBUTIONS = {
+    "Weibull_2P": Fit_Weibull_2P, "Lognormal_2P": Fit_Lognormal_2P,
+    "Exponential_1P": Fit_Exponential_1P, "Normal_2P": Fit_Normal_2P, "Gamma_2P": Fit_Gamma_2P,
+}
+
+def fit_candidate_model(failures: np.ndarray, right_censored: np.ndarray, dist_name: str) -> Optional[FittedModel]:
+    """
+    후보 분포 하나를 적합하고 모수, 표준오차, 공분산, 로그우도만 담은 FittedModel을 반환합니다.
+    적합에 실패하면 None을 반환합니다.
+    """
+    try:
+        fitter = CANDIDATE_DISTRIBUTIONS[dist_name](
+            failures=failures, right_censored=right_censored, print_results=False, show_probability_plot=False
+        )
+        return FittedModel.from_fitter(dist_name, fitter)
+    except Exception:
+        # 특정 분포 피팅에 실패하더라도 계속 진행
+        return None
+
+def merge_bic_results(left: List[BicResult], right: List[BicResult]) -> List[BicResult]:
+    """후보 분포별 결과 행을 하나로 모으고 BIC 오름차순으로 정렬합니다. (GraphState의 bic_results 리듀서)"""
+    return sorted([*(left or []), *(right or [])], key=lambda result: result.BIC)
+
+def merge_dict_updates(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """노드마다 반환한 항목을 이름별로 모읍니다. (GraphState의 fitted_models, analysis_results 리듀서)"""
+    return {**(left or {}), **(right or {})}
+
+def find_best_distribution_func(failures: np.ndarray, right_censored: np.ndarray) -> dict:
     """
     주어진 데이터에 대해 여러 분포를 피팅하고 BIC가 가장 낮은 최적 분포를 찾습니다.
     각 후보 분포의 상세 추정 결과(파라미터, BIC, AICc 등)를 함께 반환합니다.
     """
-    distributions = {
-        "Weibull_2P": Fit_Weibull_2P, "Lognormal_2P": Fit_Lognormal_2P,
-        "Exponential_1P": Fit_Exponential_1P, "Normal_2P": Fit_Normal_2P, "Gamma_2P": Fit_Gamma_2P,
-    }
-    param_names_map = {
-        "Weibull_2P": ["Alpha", "Beta"], "Lognormal_2P": ["Mu", "Sigma"],
-        "Exponential_1P": ["Lambda"], "Normal_2P": ["Mu", "Sigma"],
-        "Gamma_2P": ["Alpha", "Beta"],
-    }
-    
-    results_list = []
-    if not failures and not right_censored:
+    if len(failures) == 0 and len(right_censored) == 0:
         return {"best_distribution_name": "No data", "bic_results": pd.DataFrame()}
 
-    for name, fitter_class in distributions.items():
-        try:
-            fitter = fitter_class(failures=failures, right_censored=right_censored)
-            
-            # 파라미터 값을 문자열로 포맷팅
-            params_list = []
-            for param_name in param_names_map[name]:
-                p_name_lower = param_name.lower()
-                attr_name = 'lambda_' if p_name_lower == 'lambda' else p_name_lower
-                param_value = getattr(fitter, attr_name)
-                params_list.append(f"{param_name}={param_value:.4f}")
-            params_str = ", ".join(params_list)
-
-            results_list.append({
-                "Distribution": name,
-                "BIC": fitter.BIC,
-                "AICc": fitter.AICc,
-                "Log-likelihood": fitter.loglik,
-                "Parameters": params_str
-            })
-        except Exception:
-            # 특정 분포 피팅에 실패하더라도 계속 진행
-            results_list.append({
-                "Distribution": name, "BIC": np.inf, "AICc": np.inf,
-                "Log-likelihood": np.nan, "Parameters": "Fit Failed"
-            })
-
-    results_df = pd.DataFrame(results_list)
-    results_df = results_df.sort_values(by="BIC").reset_index(drop=True)
+    results_df = bic_results_frame([
+        BicResult.from_model(name, fit_candidate_model(failures, right_censored, name)) for name in CANDIDATE_DISTRIBUTIONS
+    ])
     
     best_dist_name = results_df.iloc[0]["Distribution"]
     
     # bic_results 키를 유지하되, 상세 결과가 담긴 데이터프레임을 전달
     return {"best_distribution_name": best_dist_name, "bic_results": results_df}
 
-def analyze_distribution_func(failures: list, right_censored: list, dist_name: str, p_values: list, t_values: list, cl: float) -> Dict[str, Any]:
+def resolve_fitted_model(failures: np.ndarray, right_censored: np.ndarray, dist_name: str,
+                         fitted_model: Optional[FittedModel] = None) -> FittedModel:
     """
-    지정된 분포에 대해 상세 분석을 수행하고 결과를 반환합니다.
+    분석할 분포의 적합 모델을 반환합니다.
+    같은 분포의 fitted_model이 주어지면 그대로 쓰고, 없을 때만 분포를 적합합니다.
     """
     # 타입 안정성 확보: dist_name이 문자열이 아닐 경우 오류 발생
     if not isinstance(dist_name, str):
         raise TypeError(f"Distribution name must be a string, but got {type(dist_name)}")
 
-    fitter_map = {
-        "Weibull_2P": Fit_Weibull_2P, "Lognormal_2P": Fit_Lognormal_2P,
-        "Exponential_1P": Fit_Exponential_1P, "Normal_2P": Fit_Normal_2P, "Gamma_2P": Fit_Gamma_2P,
-    }
-    
-    dist_name_mapping = {
-        "weibull": "Weibull_2P", "lognormal": "Lognormal_2P", "exponential": "Exponential_1P",
-        "normal": "Normal_2P", "gamma": "Gamma_2P", "weibull_2p": "Weibull_2P",
-        "lognormal_2p": "Lognormal_2P", "exponential_1p": "Exponential_1P",
-        "normal_2p": "Normal_2P", "gamma_2p": "Gamma_2P",
-    }
-    
-    final_dist_name = dist_name_mapping.get(dist_name.lower(), dist_name)
+    # 'weibull', 'weibull_2p' 등 다양한 표기를 분포 레지스트리로 통일합니다.
+    try:
+        final_dist_name = canonical_name(dist_name)
+    except ValueError:
+        final_dist_name = dist_name
 
-    if final_dist_name not in fitter_map:
+    if final_dist_name not in CANDIDATE_DISTRIBUTIONS:
         raise ValueError(f"지원하지 않는 분포입니다: {dist_name}")
 
-    # 각 분포의 파라미터 이름을 명시적으로 정의하여 안정성 확보
-    param_names_map = {
-        "Weibull_2P": ["Alpha", "Beta"],
-        "Lognormal_2P": ["Mu", "Sigma"],
-        "Exponential_1P": ["Lambda"],
-        "Normal_2P": ["Mu", "Sigma"],
-        "Gamma_2P": ["Alpha", "Beta"],
-    }
+    if fitted_model is None or fitted_model.dist_name != final_dist_name:
+        fitted_model = fit_candidate_model(failures, right_censored, final_dist_name)
+        if fitted_model is None:
+            raise ValueError(f"{final_dist_name} 분포를 적합할 수 없습니다.")
+    return fitted_model
 
-    fitter = fitter_map[final_dist_name](failures=failures, right_censored=right_censored)
-    
+def parameter_table(fitter, dist_name: str) -> pd.DataFrame:
+    """추정 파라미터와 신뢰구간 표"""
     params_data = []
     # 불안정한 fitter.distribution.parameters 대신 명시적으로 정의된 파라미터 이름 리스트 사용
-    for param_name in param_names_map[final_dist_name]:
-        p_name_lower = param_name.lower()
-        # 'lambda' 예약어 충돌 방지
-        attr_name = 'lambda_' if p_name_lower == 'lambda' else p_name_lower
-        
+    for attr_name, param_name in PARAMETER_NAMES[dist_name]:
         point_estimate = getattr(fitter, attr_name)
         lower_ci = getattr(fitter, f"{attr_name}_lower")
         upper_ci = getattr(fitter, f"{attr_name}_upper")
         params_data.append([param_name, point_estimate, lower_ci, upper_ci])
     
-    param_df = pd.DataFrame(params_data, columns=['Parameter', 'Point Estimate', 'Lower CI', 'Upper CI'])
+    return pd.DataFrame(params_data, columns=['Parameter', 'Point Estimate', 'Lower CI', 'Upper CI'])
 
+# reliability의 확률지 함수와 show_plot=True인 CDF는 pyplot의 현재 Axes(plt.gca())에 그립니다.
+# 그래프의 분석 노드는 스레드에서 동시에 실행되므로, 현재 Axes를 지정하고 그리는 구간을 잠금으로 보호합니다.
+_PYPLOT_LOCK = threading.Lock()
+
+def probability_plot(fitter, dist_name: str, failures: np.ndarray, right_censored: np.ndarray) -> str:
+    """데이터 포인트와 적합된 분포의 CDF를 그린 확률지. PNG 바이트 대신 저장한 이미지 파일 경로를 반환합니다."""
     # 각 분포에 맞는 확률지 도시 함수를 명시적으로 매핑합니다.
     plot_func_map = {
         "Weibull_2P": Weibull_probability_plot,
@@ -197,74 +191,136 @@ def analyze_distribution_func(failures: list, right_censored: list, dist_name: s
         "Gamma_2P": Gamma_probability_plot,
     }
 
-    fig, ax = plt.subplots()
-    # 1. 분포에 맞는 확률지 함수를 호출하여 데이터 포인트를 플로팅합니다.
-    plot_func = plot_func_map[final_dist_name]
-    plot_func(failures=failures, right_censored=right_censored)
-    
-    # 2. 적합된 분포의 CDF(누적분포함수) 라인을 같은 플롯에 추가로 그립니다.
-    fitter.distribution.CDF(show_plot=True, label=f'Fitted {final_dist_name}')
-    ax.set_title(f'{final_dist_name} Probability Plot')
-    ax.legend()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    buf.seek(0)
-    plot_image = buf.getvalue()
-    plt.close(fig)
-
-    # CDF 결과가 튜플이 아닐 경우를 대비한 방어 코드
-    def get_b_life(p):
-        result = fitter.distribution.CDF(CI_type='time', CI_y=p/100, CI=cl)
-        return (result, result, result) if isinstance(result, float) else result
-
-    def get_cdf_val(t):
-        result = fitter.distribution.CDF(CI_type='reliability', CI_x=t, CI=cl)
-        return (result, result, result) if isinstance(result, float) else result
-
-    b_life_data = [[p, *get_b_life(p)] for p in p_values]
-    b_life_df = pd.DataFrame(b_life_data, columns=['p', 'Lower', 'Point', 'Upper'])
-    
-    cdf_data = [[t, *get_cdf_val(t)] for t in t_values]
-    cdf_df = pd.DataFrame(cdf_data, columns=['t', 'Lower', 'Point', 'Upper'])
-    
+    plot_func = plot_func_map[dist_name]
+    with _PYPLOT_LOCK:
+        fig, ax = plt.subplots()
+        try:
+            # 1. 분포에 맞는 확률지 함수를 호출하여 데이터 포인트를 이 그림의 Axes에 플로팅합니다.
+            #    이미 적합한 모수를 넘겨 확률지 함수가 분포를 다시 적합하지 않도록 합니다.
+            plt.sca(ax)
+            plot_func(failures=failures, right_censored=right_censored, **{'__fitted_dist_params': fitter})
+
+            # 2. 적합된 분포의 CDF(누적분포함수) 라인을 같은 Axes에 추가로 그립니다.
+            plt.sca(ax)
+            fitter.distribution.CDF(show_plot=True, label=f'Fitted {dist_name}')
+            ax.set_title(f'{dist_name} Probability Plot')
+            ax.legend()
+
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png")
+        finally:
+            plt.close(fig)
+    return save_plot(buf.getvalue())
+
+def b_life_table(fitter, p_values: list, cl: float) -> pd.DataFrame:
+    """B-Life (p% 고장 시간)의 점추정치와 신뢰구간 표"""
+    p_values = np.asarray(p_values, dtype=float)
+    if hasattr(fitter, 'quantile'):
+        # mle_fitters 피터: 모든 p의 점추정치와 신뢰구간을 배열로 한 번에 계산합니다.
+        lower, point, upper = fitter.quantile(p_values / 100, bounds=True, CI=cl)
+    else:
+        # reliability 피터(Gamma_2P): 지점마다 계산합니다. (CDF 결과가 튜플이 아닐 경우를 대비한 방어 코드)
+        def get_b_life(p):
+            result = fitter.distribution.CDF(CI_type='time', CI_y=float(p) / 100, CI=cl, show_plot=False)
+            return (result, result, result) if isinstance(result, float) else result
+
+        lower, point, upper = np.array([get_b_life(p) for p in p_values]).reshape(-1, 3).T
+    return pd.DataFrame({'p': p_values, 'Lower': lower, 'Point': point, 'Upper': upper})
+
+def cdf_table(fitter, t_values: list, cl: float) -> pd.DataFrame:
+    """시간 t까지의 누적고장확률의 점추정치와 신뢰구간 표"""
+    t_values = np.asarray(t_values, dtype=float)
+    if hasattr(fitter, 'quantile'):
+        lower, point, upper = fitter.CDF(t_values, bounds=True, CI=cl)
+    else:
+        def get_cdf_val(t):
+            result = fitter.distribution.CDF(CI_type='reliability', CI_x=float(t), CI=cl, show_plot=False)
+            return (result, result, result) if isinstance(result, float) else result
+
+        lower, point, upper = np.array([get_cdf_val(t) for t in t_values]).reshape(-1, 3).T
+    return pd.DataFrame({'t': t_values, 'Lower': lower, 'Point': point, 'Upper': upper})
+
+def analyze_distribution_func(failures: np.ndarray, right_censored: np.ndarray, dist_name: str, p_values: list, t_values: list, cl: float,
+                              fitted_model: Optional[FittedModel] = None) -> Dict[str, Any]:
+    """
+    지정된 분포에 대해 상세 분석을 수행하고 결과를 반환합니다.
+    같은 분포의 fitted_model이 주어지면 다시 적합하지 않고 그 모수와 공분산으로 모든 표와 확률지를 만듭니다.
+    """
+    fitted_model = resolve_fitted_model(failures, right_censored, dist_name, fitted_model)
+    # 신뢰구간은 모두 사용자가 지정한 신뢰수준(cl) 기준으로 계산합니다.
+    fitter = fitted_model.restore(failures, right_censored, CI=cl)
     return {
-        "parameter_table": param_df, "probability_plot": plot_image,
-        "b_life_table": b_life_df, "cdf_table": cdf_df,
+        "parameter_table": parameter_table(fitter, fitted_model.dist_name),
+        "probability_plot": probability_plot(fitter, fitted_model.dist_name, failures, right_censored),
+        "b_life_table": b_life_table(fitter, p_values, cl),
+        "cdf_table": cdf_table(fitter, t_values, cl),
     }
 
 # --- 3. LangGraph 워크플로우 정의 ---
+# 노드는 바뀐 항목만 반환합니다. bic_results와 fitted_models는 후보 분포 가지마다 반환한 값을,
+# analysis_results는 분석 노드(파라미터·확률지, B-Life, 누적고장확률)마다 반환한 표를 리듀서로 모읍니다.
+# fitted_models에는 적합 결과 객체 대신 모수, 공분산, 로그우도만 담은 FittedModel을 보관하여
+# 최적 분포 분석 단계가 분포를 다시 적합하지 않도록 합니다.
+# data_key는 데이터셋 해시로, 체크포인트 스레드와 노드 캐시 키에 사용합니다. (graph_checkpoint.py)
+# 노드 사이에 전달되고 체크포인트로 저장되는 상태를 작게 유지하도록 데이터는 NumPy 배열, BIC 결과는 BicResult 목록,
+# 확률지는 이미지 파일 경로(plot_store.py)로 보관합니다.
 class GraphState(TypedDict):
-    failures: List[float]; right_censored: List[float]; p_values: List[float]
+    data_key: str; failures: np.ndarray; right_censored: np.ndarray; p_values: List[float]
     t_values: List[float]; cl: float; summary_stats: Dict[str, Any]
-    bic_results: pd.DataFrame; best_dist_name: str
-    analysis_results: Dict[str, Any]; final_report: str
+    bic_results: Annotated[List[BicResult], merge_bic_results]
+    fitted_models: Annotated[Dict[str, FittedModel], merge_dict_updates]; best_dist_name: str
+    analysis_results: Annotated[Dict[str, Any], merge_dict_updates]; final_report: str
+
+class CandidateState(TypedDict):
+    """후보 분포 적합 가지(fit_candidate 노드)에 전달되는 상태"""
+    data_key: str; failures: np.ndarray; right_censored: np.ndarray; dist_name: str
 
 def summarize_data_node(state: GraphState):
-    state['summary_stats'] = summarize_data_func(state['failures'], state['right_censored'])
-    return state
-def find_best_distribution_node(state: GraphState):
-    results = find_best_distribution_func(state['failures'], state['right_censored'])
-    state['best_dist_name'] = results['best_distribution_name']
-    state['bic_results'] = results['bic_results']
-    return state
+    return {'summary_stats': summarize_data_func(state['failures'], state['right_censored'])}
+def fan_out_candidates(state: GraphState):
+    # 후보 분포마다 fit_candidate 가지를 하나씩 만들어 동시에 실행합니다. (fan-out)
+    return [
+        Send("fit_candidate", {
+            "data_key": state["data_key"], "failures": state["failures"],
+            "right_censored": state["right_censored"], "dist_name": name,
+        })
+        for name in CANDIDATE_DISTRIBUTIONS
+    ]
+def fit_candidate_node(state: CandidateState):
+    model = fit_candidate_model(state['failures'], state['right_censored'], state['dist_name'])
+    update = {'bic_results': [BicResult.from_model(state['dist_name'], model)]}
+    if model is not None:
+        update['fitted_models'] = {state['dist_name']: model}
+    return update
+def select_best_distribution_node(state: GraphState):
+    # 모든 가지의 결과가 bic_results로 모인 뒤 실행됩니다. (fan-in)
+    bic_results = state['bic_results']
+    return {'best_dist_name': bic_results[0].distribution if bic_results else "No data"}
+def _best_fitter(state: GraphState):
+    # fit_candidate 노드에서 적합한 최적 분포의 모델을 다시 적합하지 않고 사용합니다. 신뢰구간은 state의 cl 기준입니다.
+    fitted_model = resolve_fitted_model(
+        state["failures"], state["right_censored"], state["best_dist_name"],
+        state.get("fitted_models", {}).get(state["best_dist_name"]),
+    )
+    return fitted_model.dist_name, fitted_model.restore(state["failures"], state["right_censored"], CI=state["cl"])
+# 분석 노드는 입력이 다르므로 나누어 두고 동시에 실행합니다. (p 값만 바뀌면 B-Life 노드만, t 값만 바뀌면 누적고장확률 노드만 다시 계산)
 def analyze_best_distribution_node(state: GraphState):
-    # `analyze_distribution_func`에 필요한 인자를 명시적으로 매핑하여 전달
-    analysis_args = {
-        "failures": state["failures"],
-        "right_censored": state["right_censored"],
-        "dist_name": state["best_dist_name"],  # state의 'best_dist_name'을 'dist_name'으로 전달
-        "p_values": state["p_values"],
-        "t_values": state["t_values"],
-        "cl": state["cl"],
-    }
-    state['analysis_results'] = analyze_distribution_func(**analysis_args)
-    return state
+    dist_name, fitter = _best_fitter(state)
+    return {'analysis_results': {
+        "parameter_table": parameter_table(fitter, dist_name),
+        "probability_plot": probability_plot(fitter, dist_name, state["failures"], state["right_censored"]),
+    }}
+def compute_b_life_node(state: GraphState):
+    _, fitter = _best_fitter(state)
+    return {'analysis_results': {"b_life_table": b_life_table(fitter, state["p_values"], state["cl"])}}
+def compute_cdf_node(state: GraphState):
+    _, fitter = _best_fitter(state)
+    return {'analysis_results': {"cdf_table": cdf_table(fitter, state["t_values"], state["cl"])}}
 def generate_report_node(state: GraphState):
     summary_df = pd.DataFrame(list(state['summary_stats'].items()), columns=['항목', '값'])
 
     # .get()을 사용하여 키가 없는 경우에도 안전하게 접근하고, 기본값으로 빈 DataFrame을 제공
-    bic_results_df = state.get('bic_results', pd.DataFrame())
+    bic_results_df = bic_results_frame(state.get('bic_results', []))
     analysis_results = state.get('analysis_results', {})
     param_table_df = analysis_results.get('parameter_table', pd.DataFrame())
     b_life_table_df = analysis_results.get('b_life_table', pd.DataFrame())
@@ -306,35 +362,72 @@ B{p_values[0]} 수명은 약 {b_life_table_df['Point'].iloc[0]:.2f} 시간으로
 {cdf_table_md}\n
 **5. 결론 요약**\n
 {conclusion_summary}"""
-    state['final_report'] = report
-    return state
-
-workflow = StateGraph(GraphState)
-workflow.add_node("summarize_data", summarize_data_node)
-workflow.add_node("find_best_distribution", find_best_distribution_node)
-workflow.add_node("analyze_best_distribution", analyze_best_distribution_node)
-workflow.add_node("generate_report", generate_report_node)
-workflow.set_entry_point("summarize_data")
-workflow.add_edge("summarize_data", "find_best_distribution")
-workflow.add_edge("find_best_distribution", "analyze_best_distribution")
-workflow.add_edge("analyze_best_distribution", "generate_report")
-workflow.add_edge("generate_report", END)
-app_graph = workflow.compile()
+    return {'final_report': report}
+
+@st.cache_resource
+def build_app_graph():
+    """
+    워크플로우를 프로세스당 한 번만 컴파일합니다. (Streamlit 재실행마다 다시 만들지 않습니다)
+    실행 상태는 SQLite 체크포인트에, 노드 결과는 노드별 입력을 키로 하는 SQLite 캐시에 보관합니다.
+    """
+    workflow = StateGraph(GraphState)
+    workflow.add_node("summarize_data", summarize_data_node, cache_policy=node_cache_policy(["data_key"]))
+    workflow.add_node("fit_candidate", fit_candidate_node, cache_policy=node_cache_policy(["data_key", "dist_name"]))
+    workflow.add_node("select_best_distribution", select_best_distribution_node)
+    workflow.add_node("analyze_best_distribution", analyze_best_distribution_node,
+                      cache_policy=node_cache_policy(["data_key", "best_dist_name", "cl"]))
+    workflow.add_node("compute_b_life", compute_b_life_node,
+                      cache_policy=node_cache_policy(["data_key", "best_dist_name", "p_values", "cl"]))
+    workflow.add_node("compute_cdf", compute_cdf_node,
+                      cache_policy=node_cache_policy(["data_key", "best_dist_name", "t_values", "cl"]))
+    workflow.add_node("generate_report", generate_report_node)
+    workflow.set_entry_point("summarize_data")
+    workflow.add_conditional_edges("summarize_data", fan_out_candidates, ["fit_candidate"])
+    workflow.add_edge("fit_candidate", "select_best_distribution")
+    for node in ["analyze_best_distribution", "compute_b_life", "compute_cdf"]:
+        workflow.add_edge("select_best_distribution", node)
+    workflow.add_edge(["analyze_best_distribution", "compute_b_life", "compute_cdf"], "generate_report")
+    workflow.add_edge("generate_report", END)
+    return workflow.compile(checkpointer=open_checkpointer(), cache=open_node_cache())
 
 # --- 4. LangChain 에이전트 및 도구 정의 ---
-def run_full_analysis_func(failures: list, right_censored: list, p_values: list, t_values: list, cl: float) -> dict:
+def run_full_analysis_func(failures: np.ndarray, right_censored: np.ndarray, p_values: list, t_values: list, cl: float) -> dict:
     """
-    전체 신뢰성 분석 워크플로우를 실행하고 최종 보고서와 확률지 이미지를 반환합니다.
+    전체 신뢰성 분석 워크플로우를 실행하고 최종 보고서와 확률지 이미지 경로를 반환합니다.
+    (데이터셋 해시, 분석 설정)별 체크포인트 스레드에 완료된 결과가 있으면 다시 실행하지 않고,
+    중간에 중단된 실행이 있으면 이어서 실행합니다. 새로 실행한 뒤에는 오래된 체크포인트 스레드와 확률지 이미지를 정리합니다.
     """
-    initial_state = {"failures": failures, "right_censored": right_censored, "p_values": p_values, "t_values": t_values, "cl": cl}
-    final_state = app_graph.invoke(initial_state)
+    app_graph = build_app_graph()
+    data_key = dataset_key(failures, right_censored)
+    config = {"configurable": {"thread_id": analysis_thread_id(data_key, p_values, t_values, cl)}}
+    snapshot = app_graph.get_state(config)
+    if snapshot.next:
+        final_state = app_graph.invoke(None, config)
+    elif snapshot.values.get('final_report'):
+        final_state = snapshot.values
+    else:
+        initial_state = {
+            "data_key": data_key, "failures": np.asarray(failures, dtype=float),
+            "right_censored": np.asarray(right_censored, dtype=float),
+            "p_values": p_values, "t_values": t_values, "cl": cl,
+        }
+        final_state = app_graph.invoke(initial_state, config)
+        prune_checkpoints(app_graph.checkpointer)
+        prune_plots()
+
+    plot_path = final_state['analysis_results']['probability_plot']
+    if not os.path.exists(plot_path):
+        # 체크포인트나 노드 캐시에 저장된 확률지 파일이 지워졌으면 (temp/plots 정리 등) 적합 결과로 다시 그려 저장하고,
+        # 지워진 경로를 담은 노드 캐시 항목을 비운 뒤 스레드의 상태도 새 경로로 바꿉니다.
+        app_graph.clear_cache(["analyze_best_distribution"])
+        dist_name, fitter = _best_fitter(final_state)
+        plot_path = probability_plot(fitter, dist_name, final_state["failures"], final_state["right_censored"])
+        app_graph.update_state(config, {"analysis_results": {"probability_plot": plot_path}}, as_node="generate_report")
     return {
         "report": final_state['final_report'],
-        "plot": final_state['analysis_results']['probability_plot']
+        "plot": plot_path
     }
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-
 # 시스템 프롬프트를 수정하여 에이전트에게 컨텍스트 제공
 system_message = """You are an expert AI assistant for reliability engineering analysis.
 Your primary goal is to help users analyze lifetime data using the provided tools.
@@ -361,6 +454,51 @@ prompt_template = ChatPromptTemplate.from_messages([
     ("placeholder", "{agent_scratchpad}"),
 ])
 
+# --- @tool 데코레이터를 사용하여 도구를 정의 ---
+# 이 방식은 함수의 시그니처와 Docstring을 자동으로 파싱하여
+# LangChain 에이전트가 도구의 사용법을 명확하게 이해하도록 만듭니다.
+# 도구는 모든 세션이 공유하므로 데이터는 현재 세션의 분석 컨텍스트(analysis_context.py)에서 읽습니다.
+@tool
+def summarize_data() -> dict:
+    """업로드된 수명 데이터의 기본 통계 정보를 요약합니다. 고장 수, 관측중단 수, 평균 수명 등을 계산할 때 사용합니다."""
+    ctx = current_context()
+    return summarize_data_func(failures=ctx.failures, right_censored=ctx.right_censored)
+
+@tool
+def find_best_distribution() -> dict:
+    """데이터에 가장 적합한 확률 분포를 찾습니다. 여러 후보 분포(Weibull, Lognormal 등)를 피팅하고 BIC 기준으로 최적 분포를 결정합니다."""
+    ctx = current_context()
+    return find_best_distribution_func(failures=ctx.failures, right_censored=ctx.right_censored)
+
+@tool
+def analyze_distribution(dist_name: str) -> Dict[str, Any]:
+    """
+    특정 확률 분포에 대한 상세 분석을 수행합니다. 
+    파라미터 추정, 신뢰구간 계산, 확률지(probability plot) 생성, B-Life 및 누적고장확률(CDF)을 계산할 때 사용합니다.
+    """
+    ctx = current_context()
+    return analyze_distribution_func(
+        failures=ctx.failures, right_censored=ctx.right_censored, dist_name=dist_name,
+        p_values=ctx.p_values, t_values=ctx.t_values, cl=ctx.cl
+    )
+
+@tool
+def run_full_analysis() -> dict:
+    """전체 자동 분석을 수행하고 최종 보고서를 생성합니다. 사용자가 '자동 분석', '전체 분석 실행' 등 포괄적인 분석을 요청할 때 사용합니다."""
+    ctx = current_context()
+    return run_full_analysis_func(
+        failures=ctx.failures, right_censored=ctx.right_censored,
+        p_values=ctx.p_values, t_values=ctx.t_values, cl=ctx.cl
+    )
+
+@st.cache_resource
+def build_agent_executor() -> AgentExecutor:
+    """LLM, 도구, 에이전트를 프로세스당 한 번만 만듭니다. (채팅 메시지마다 다시 만들지 않습니다)"""
+    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
+    tools_with_data = [summarize_data, find_best_distribution, analyze_distribution, run_full_analysis]
+    agent = create_tool_calling_agent(llm, tools_with_data, prompt_template)
+    return AgentExecutor(agent=agent, tools=tools_with_data, verbose=True)
+
 # --- 5. Streamlit UI 구성 ---
 st.title("대화형 신뢰성 분석 AI 에이전트")
 
@@ -411,68 +549,15 @@ if prompt := st.chat_input("무엇을 도와드릴까요?"):
             st.error("B-Life와 CDF 시간 값은 쉼표로 구분된 숫자 형식이어야 합니다.")
             st.stop()
 
-        # --- @tool 데코레이터를 사용하여 도구를 정의 ---
-        # 이 방식은 함수의 시그니처와 Docstring을 자동으로 파싱하여
-        # LangChain 에이전트가 도구의 사용법을 명확하게 이해하도록 만듭니다.
-        # 이를 통해 이전의 모든 인자 관련 오류를 근본적으로 해결합니다.
-        from langchain.tools import tool
-
-        @tool
-        def summarize_data() -> dict:
-            """업로드된 수명 데이터의 기본 통계 정보를 요약합니다. 고장 수, 관측중단 수, 평균 수명 등을 계산할 때 사용합니다."""
-            return summarize_data_func(
-                failures=st.session_state.failures, 
-                right_censored=st.session_state.right_censored
-            )
-
-        @tool
-        def find_best_distribution() -> dict:
-            """데이터에 가장 적합한 확률 분포를 찾습니다. 여러 후보 분포(Weibull, Lognormal 등)를 피팅하고 BIC 기준으로 최적 분포를 결정합니다."""
-            return find_best_distribution_func(
-                failures=st.session_state.failures, 
-                right_censored=st.session_state.right_censored
-            )
-
-        @tool
-        def analyze_distribution(dist_name: str) -> Dict[str, Any]:
-            """
-            특정 확률 분포에 대한 상세 분석을 수행합니다. 
-            파라미터 추정, 신뢰구간 계산, 확률지(probability plot) 생성, B-Life 및 누적고장확률(CDF)을 계산할 때 사용합니다.
-            """
-            return analyze_distribution_func(
-                failures=st.session_state.failures,
-                right_censored=st.session_state.right_censored,
-                dist_name=dist_name,
-                p_values=p_values,
-                t_values=t_values,
-                cl=confidence_level
-            )
-
-        @tool
-        def run_full_analysis() -> dict:
-            """전체 자동 분석을 수행하고 최종 보고서를 생성합니다. 사용자가 '자동 분석', '전체 분석 실행' 등 포괄적인 분석을 요청할 때 사용합니다."""
-            return run_full_analysis_func(
-                failures=st.session_state.failures,
-                right_censored=st.session_state.right_censored,
-                p_values=p_values,
-                t_values=t_values,
-                cl=confidence_level
-            )
-
-        tools_with_data = [
-            summarize_data,
-            find_best_distribution,
-            analyze_distribution,
-            run_full_analysis,
-        ]
-        
-        agent = create_tool_calling_agent(llm, tools_with_data, prompt_template)
-        agent_executor = AgentExecutor(agent=agent, tools=tools_with_data, verbose=True)
-        
+        # 이 세션의 데이터와 설정을 도구가 읽을 컨텍스트로 설정합니다.
+        st.session_state.analysis_context = AnalysisContext(
+            failures=st.session_state.failures, right_censored=st.session_state.right_censored,
+            p_values=p_values, t_values=t_values, cl=confidence_level
+        )
+        agent_executor = build_agent_executor()
+
         # LangChain에 전달할 chat_history를 AIMessage/HumanMessage 형식으로 변환
         # UI용으로 저장된 dict 객체를 모델이 이해할 수 있는 문자열로 변환
-        from langchain_core.messages import HumanMessage, AIMessage
-
         formatted_history = []
         for msg in st.session_state.messages[:-1]:
             content = msg["content"]
@@ -492,34 +577,35 @@ if prompt := st.chat_input("무엇을 도와드릴까요?"):
             response_container = st.empty()
             final_response_object = None
 
-            for chunk in agent_executor.stream({"input": prompt, "chat_history": formatted_history}):
-                if "actions" in chunk:
-                    response_container.markdown(f"Tool Call: `{chunk['actions'][0].tool}`")
-                elif "steps" in chunk:
-                    result = chunk["steps"][0].observation
-                    final_response_object = result # 최종 결과 저장
-                    # 중간 결과 렌더링
-                    if isinstance(result, dict):
-                        if "best_distribution_name" in result:
-                            st.markdown("#### 최적 분포 탐색 결과"); st.dataframe(result["bic_results"])
-                            st.info(f"**최적 분포:** {result['best_distribution_name']}")
-                        elif "parameter_table" in result:
-                            st.markdown("#### 분포 분석 결과"); st.dataframe(result["parameter_table"])
-                            st.image(result["probability_plot"], caption="확률지")
-                            st.markdown("##### B-Life"); st.dataframe(result["b_life_table"])
-                            st.markdown("##### 누적고장확률 (CDF)"); st.dataframe(result["cdf_table"])
-                        elif "report" in result and "plot" in result: # 자동 분석 결과
-                            st.markdown(result["report"])
-                            st.image(result["plot"], caption="확률지")
-                        else:
-                            st.markdown("#### 데이터 요약"); st.dataframe(pd.DataFrame(list(result.items()), columns=['항목', '값']))
-                elif "output" in chunk:
-                    final_response_object = chunk["output"]
-                    response_container.markdown(final_response_object)
+            with use_context(st.session_state.analysis_context):
+                for chunk in agent_executor.stream({"input": prompt, "chat_history": formatted_history}):
+                    if "actions" in chunk:
+                        response_container.markdown(f"Tool Call: `{chunk['actions'][0].tool}`")
+                    elif "steps" in chunk:
+                        result = chunk["steps"][0].observation
+                        final_response_object = result # 최종 결과 저장
+                        # 중간 결과 렌더링
+                        if isinstance(result, dict):
+                            if "best_distribution_name" in result:
+                                st.markdown("#### 최적 분포 탐색 결과"); st.dataframe(result["bic_results"])
+                                st.info(f"**최적 분포:** {result['best_distribution_name']}")
+                            elif "parameter_table" in result:
+                                st.markdown("#### 분포 분석 결과"); st.dataframe(result["parameter_table"])
+                                st.image(result["probability_plot"], caption="확률지")
+                                st.markdown("##### B-Life"); st.dataframe(result["b_life_table"])
+                                st.markdown("##### 누적고장확률 (CDF)"); st.dataframe(result["cdf_table"])
+                            elif "report" in result and "plot" in result: # 자동 분석 결과
+                                st.markdown(result["report"])
+                                st.image(result["plot"], caption="확률지")
+                            else:
+                                st.markdown("#### 데이터 요약"); st.dataframe(pd.DataFrame(list(result.items()), columns=['항목', '값']))
+                    elif "output" in chunk:
+                        final_response_object = chunk["output"]
+                        response_container.markdown(final_response_object)
             
             st.session_state.messages.append({"role": "assistant", "content": final_response_object})
 
         except Exception as e:
             error_message = f"분석 중 오류가 발생했습니다: {e}"
             st.error(error_message)
-            st.session_state.messages.append({"role": "assistant", "content": error_message})
\ No newline at end of file
+            st.session_state.messages.append({"role": "assistant", "content": error_message})
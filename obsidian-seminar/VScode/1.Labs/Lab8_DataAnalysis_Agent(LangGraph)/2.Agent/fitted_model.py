@@ -0,0 +1,106 @@
+"""
+적합된 분포 모델 핸들
+
+후보 분포를 적합한 결과는 모수, 표준오차, 공분산, 로그우도만 담은 FittedModel로 그래프 상태에 보관합니다.
+최적 분포 분석 단계는 분포를 다시 적합하지 않고 restore()로 되돌린 적합 결과 객체에서
+모수 표, B-Life와 누적고장확률의 신뢰구간, 확률지를 계산합니다.
+BIC 결과 표의 행도 DataFrame 대신 작은 데이터클래스(BicResult)로 그래프 상태에 보관합니다.
+"""
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from mle_fitters import FITTERS, restore_fit
+
+# 분포별 (속성 이름, 표시 이름) 모수 목록
+PARAMETER_NAMES = {
+    "Weibull_2P": [("alpha", "Alpha"), ("beta", "Beta")], "Lognormal_2P": [("mu", "Mu"), ("sigma", "Sigma")],
+    "Exponential_1P": [("Lambda", "Lambda")], "Normal_2P": [("mu", "Mu"), ("sigma", "Sigma")],
+    "Gamma_2P": [("alpha", "Alpha"), ("beta", "Beta")],
+}
+
+# 핸들에 보관하는 추정값 (reliability 피터와 같은 속성 이름)
+# Gamma_2P는 reliability 분포 객체와 확률지에 필요한 mu 모수화의 값도 함께 보관합니다.
+ESTIMATE_NAMES = {
+    "Weibull_2P": ("alpha", "beta", "alpha_SE", "beta_SE", "Cov_alpha_beta"),
+    "Lognormal_2P": ("mu", "sigma", "mu_SE", "sigma_SE", "Cov_mu_sigma"),
+    "Normal_2P": ("mu", "sigma", "mu_SE", "sigma_SE", "Cov_mu_sigma"),
+    "Exponential_1P": ("Lambda", "Lambda_SE"),
+    "Gamma_2P": ("alpha", "beta", "mu", "alpha_SE", "beta_SE", "mu_SE", "Cov_alpha_beta", "Cov_mu_beta"),
+}
+
+
+@dataclass(frozen=True)
+class FittedModel:
+    """한 후보 분포의 적합 결과 (모수, 표준오차, 공분산, 로그우도, AICc, BIC)"""
+    dist_name: str
+    estimates: Dict[str, float]
+    loglik: float
+    AICc: Any
+    BIC: float
+
+    @classmethod
+    def from_fitter(cls, dist_name: str, fitter) -> "FittedModel":
+        return cls(
+            dist_name=dist_name,
+            estimates={name: float(getattr(fitter, name)) for name in ESTIMATE_NAMES[dist_name]},
+            loglik=float(fitter.loglik), AICc=fitter.AICc, BIC=float(fitter.BIC),
+        )
+
+    def parameter_string(self) -> str:
+        return ", ".join(f"{label}={self.estimates[attr]:.4f}" for attr, label in PARAMETER_NAMES[self.dist_name])
+
+    def restore(self, failures, right_censored, CI: float = 0.95):
+        """
+        다시 적합하지 않고 적합 결과 객체를 만듭니다. 모수 신뢰구간은 CI 기준으로 계산합니다.
+
+        mle_fitters 분포는 quantile / CDF를 가진 적합 결과 객체를, Gamma_2P는 reliability 피터와 같은 속성과
+        분포 객체(distribution)를 가진 객체를 반환합니다. 두 경우 모두 확률지 함수의 __fitted_dist_params로 쓸 수 있습니다.
+        """
+        if self.dist_name in FITTERS:
+            return restore_fit(self.dist_name, {**self.estimates, 'loglik': self.loglik}, failures, right_censored, CI=CI)
+
+        from reliability.Distributions import Gamma_Distribution
+        Z = -ndtri((1 - CI) / 2)
+        bounds = {}
+        for name in ("alpha", "beta"):
+            value, SE = self.estimates[name], self.estimates[f"{name}_SE"]
+            bounds[f"{name}_lower"] = value * np.exp(-Z * SE / value)
+            bounds[f"{name}_upper"] = value * np.exp(Z * SE / value)
+        return SimpleNamespace(
+            gamma=0, CI=CI, loglik=self.loglik, AICc=self.AICc, BIC=self.BIC, **self.estimates, **bounds,
+            distribution=Gamma_Distribution(**self.estimates, CI=CI, CI_type='time'),
+        )
+
+
+@dataclass(frozen=True)
+class BicResult:
+    """BIC 결과 표의 한 행. 적합에 실패한 분포는 BIC를 무한대로 두어 최적 분포로 선택되지 않게 합니다."""
+    distribution: str
+    BIC: float
+    AICc: Any
+    loglik: float
+    parameters: str
+
+    @classmethod
+    def from_model(cls, dist_name: str, model: Optional[FittedModel]) -> "BicResult":
+        if model is None:
+            return cls(dist_name, np.inf, np.inf, np.nan, "Fit Failed")
+        return cls(dist_name, model.BIC, model.AICc, model.loglik, model.parameter_string())
+
+    def as_row(self) -> Dict[str, Any]:
+        return {
+            "Distribution": self.distribution, "BIC": self.BIC, "AICc": self.AICc,
+            "Log-likelihood": self.loglik, "Parameters": self.parameters,
+        }
+
+
+def bic_results_frame(results: List[BicResult]) -> pd.DataFrame:
+    """BIC 결과 행 목록을 화면과 보고서에 표시할 표로 만듭니다. (BIC 오름차순)"""
+    if not results:
+        return pd.DataFrame()
+    return pd.DataFrame([result.as_row() for result in sorted(results, key=lambda result: result.BIC)])
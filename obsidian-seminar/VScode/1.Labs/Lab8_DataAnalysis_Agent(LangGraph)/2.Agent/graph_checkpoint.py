@@ -0,0 +1,90 @@
+"""
+워크플로우 체크포인트와 노드 캐시 (SQLite)
+
+run_full_analysis는 사이드바에서 p, t 값만 바꿔도 전체 워크플로우를 다시 실행했습니다.
+이 모듈은 워크플로우 실행 결과를 로컬 SQLite 파일 하나에 두 가지 방식으로 보관합니다.
+
+- 체크포인트: (데이터셋 해시, 분석 설정)마다 스레드(thread_id)를 하나 두고 노드가 끝날 때마다 상태를 저장합니다.
+  같은 데이터와 설정으로 다시 요청하면 저장된 최종 상태를 바로 돌려주고, 중간에 중단된 실행은 이어서 실행합니다.
+- 노드 캐시: 노드마다 실제로 읽는 입력 항목만으로 캐시 키를 만듭니다. 설정이 바뀌어 새 스레드로 실행하더라도
+  입력이 바뀌지 않은 노드(데이터 요약, 후보 분포 적합 등)는 다시 계산하지 않고 캐시된 결과를 씁니다.
+  예를 들어 t 값만 바꾸면 누적고장확률 표와 보고서만 다시 계산합니다.
+
+파일이 계속 커지지 않도록 노드 캐시 항목은 NODE_CACHE_TTL_SECONDS가 지나면 만료되고(캐시를 열 때 정리),
+체크포인트는 최근에 실행한 MAX_ANALYSIS_THREADS개 스레드만 남깁니다. (prune_checkpoints)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Sequence
+
+import numpy as np
+from langgraph.cache.sqlite import SqliteCache
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.types import CachePolicy
+
+GRAPH_DB_PATH = os.path.join("temp", "lab8_graph.sqlite")
+NODE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+MAX_ANALYSIS_THREADS = 20
+
+# 상태의 데이터클래스(FittedModel, BicResult)와 NumPy 배열은 msgpack으로 저장하고,
+# 분석 결과 표(pandas DataFrame)처럼 msgpack으로 직렬화할 수 없는 값만 pickle로 저장합니다. (로컬 파일 전용)
+_serde = JsonPlusSerializer(
+    pickle_fallback=True,
+    allowed_msgpack_modules=[("fitted_model", "FittedModel"), ("fitted_model", "BicResult")],
+)
+
+
+def dataset_key(failures, right_censored) -> str:
+    """고장 / 관측중단 데이터의 SHA-256 해시 (체크포인트 스레드와 노드 캐시 키에 사용)"""
+    digest = hashlib.sha256()
+    for values in (failures, right_censored):
+        data = np.asarray(values, dtype=float)
+        digest.update(str(data.size).encode())
+        digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def _settings_json(**settings) -> str:
+    return json.dumps(settings, sort_keys=True, default=lambda value: np.asarray(value).tolist())
+
+
+def analysis_thread_id(data_key: str, p_values, t_values, cl: float) -> str:
+    """(데이터셋 해시, 분석 설정)별 체크포인트 스레드 ID"""
+    settings = _settings_json(p_values=list(map(float, p_values)), t_values=list(map(float, t_values)), cl=float(cl))
+    return f"{data_key[:16]}-{hashlib.sha256(settings.encode()).hexdigest()[:16]}"
+
+
+def node_cache_policy(fields: Sequence[str], ttl: int = NODE_CACHE_TTL_SECONDS) -> CachePolicy:
+    """상태의 fields 항목만으로 캐시 키를 만드는 노드 캐시 정책 (다른 항목이 바뀌어도 노드를 다시 실행하지 않음, ttl초 후 만료)"""
+    def key_func(state) -> str:
+        return _settings_json(**{field: state.get(field) for field in fields})
+    return CachePolicy(key_func=key_func, ttl=ttl)
+
+
+def open_checkpointer(path: str = GRAPH_DB_PATH) -> SqliteSaver:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False), serde=_serde)
+
+
+def prune_checkpoints(checkpointer: SqliteSaver, keep: int = MAX_ANALYSIS_THREADS) -> int:
+    """마지막 체크포인트가 오래된 스레드부터 지워 keep개의 스레드만 남깁니다. 지운 스레드 수를 반환합니다."""
+    with checkpointer.cursor(transaction=False) as cur:
+        cur.execute("SELECT thread_id FROM checkpoints GROUP BY thread_id ORDER BY MAX(checkpoint_id) DESC")
+        stale = [thread_id for (thread_id,) in cur.fetchall()[keep:]]
+    for thread_id in stale:
+        checkpointer.delete_thread(thread_id)
+    return len(stale)
+
+
+def open_node_cache(path: str = GRAPH_DB_PATH) -> SqliteCache:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    cache = SqliteCache(path=path, serde=_serde)
+    # SqliteCache는 만료된 항목을 같은 키로 다시 읽을 때만 지우므로, 열 때 만료된 항목을 한 번에 정리합니다.
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("DELETE FROM cache WHERE expiry IS NOT NULL AND expiry < ?", (time.time(),))
+    return cache
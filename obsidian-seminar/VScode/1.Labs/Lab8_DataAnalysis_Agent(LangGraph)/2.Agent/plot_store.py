@@ -0,0 +1,58 @@
+"""
+확률지 이미지 저장소
+
+그래프 상태, 체크포인트, 도구 결과에는 PNG 바이트 대신 이미지 파일 경로만 보관합니다.
+이미지는 내용의 SHA-256 해시를 이름으로 temp/plots/에 한 번만 저장하므로, 같은 그림은 다시 쓰지 않습니다.
+st.image는 파일 경로를 그대로 받아 표시합니다.
+
+폴더가 계속 커지지 않도록 최근에 저장하거나 다시 사용한 MAX_PLOTS개 이미지만 남깁니다. (prune_plots)
+지워진 이미지를 가리키는 체크포인트 결과는 run_full_analysis가 확률지를 다시 그려 복구합니다.
+"""
+import hashlib
+import os
+import tempfile
+
+PLOT_DIR = os.path.join("temp", "plots")
+MAX_PLOTS = 50
+
+
+def save_plot(png: bytes, plot_dir: str = PLOT_DIR) -> str:
+    """PNG 이미지를 내용 해시 이름으로 저장하고 경로를 반환합니다. 이미 저장된 이미지면 다시 쓰지 않습니다."""
+    file_path = os.path.join(plot_dir, f"{hashlib.sha256(png).hexdigest()[:16]}.png")
+    if os.path.exists(file_path):
+        # 다시 사용한 이미지는 prune_plots에서 최근 이미지로 취급하도록 수정 시각을 갱신합니다.
+        os.utime(file_path)
+        return file_path
+
+    os.makedirs(plot_dir, exist_ok=True)
+    # 같은 이미지를 동시에 저장하더라도 서로의 임시 파일을 덮어쓰지 않도록 고유한 임시 파일에 쓴 뒤 이름을 바꿉니다.
+    with tempfile.NamedTemporaryFile(dir=plot_dir, suffix=".tmp", delete=False) as f:
+        f.write(png)
+    try:
+        os.replace(f.name, file_path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+    return file_path
+
+
+def prune_plots(plot_dir: str = PLOT_DIR, keep: int = MAX_PLOTS) -> int:
+    """수정 시각이 오래된 이미지부터 지워 keep개의 이미지만 남깁니다. 지운 이미지 수를 반환합니다."""
+    if not os.path.isdir(plot_dir):
+        return 0
+    plots = []
+    for entry in os.scandir(plot_dir):
+        if entry.is_file() and entry.name.endswith(".png"):
+            try:
+                plots.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    plots.sort(reverse=True)
+    removed = 0
+    for _, path in plots[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            continue
+    return removed